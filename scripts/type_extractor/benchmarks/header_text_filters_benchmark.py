@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmarks removal of annotations with brackets on synthetic headers.
+
+Every generated header contains the given number of declarations with deeply
+nested SAL annotations, e.g. _When_(a, _When_(b, _Out_writes_(n))). The size of
+the header doubles in each round, so the time should double as well.
+
+Run from the type extractor directory:
+
+    python3 -m benchmarks.header_text_filters_benchmark
+"""
+
+import argparse
+import time
+
+from type_extractor.header_text_filters import filter_annotations_with_brackets
+from type_extractor.header_text_filters import use_filters
+
+
+def parse_args():
+    """Parses script arguments and returns them."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        '-n', '--annotations', dest='annotations', type=int, default=1000,
+        help='number of annotated declarations in the first round'
+    )
+    parser.add_argument(
+        '-d', '--depth', dest='depth', type=int, default=20,
+        help='nesting depth of annotations'
+    )
+    parser.add_argument(
+        '-r', '--rounds', dest='rounds', type=int, default=4,
+        help='number of rounds, the header size doubles in each of them'
+    )
+    return parser.parse_args()
+
+
+def nested_annotation(depth):
+    """Returns annotation nested to the given depth."""
+    annot = '_Out_writes_bytes_(cb * (sizeof(WCHAR) + 1))'
+    for i in range(depth):
+        annot = '_When_(flags & {}, {})'.format(i, annot)
+    return annot
+
+
+def synthetic_header(annotations, depth):
+    """Returns header text with the given number of annotated declarations."""
+    annot = nested_annotation(depth)
+    decl = (
+        '_Success_(return != 0)\n'
+        'BOOL WINAPI Func{0}(\n'
+        '    _In_ HANDLE h,\n'
+        '    {1}\n'
+        '    LPWSTR buffer,\n'
+        '    _Inout_ _At_(*pcb, _Pre_valid_) DWORD *pcb\n'
+        ');\n'
+    )
+    return ''.join(decl.format(i, annot) for i in range(annotations))
+
+
+def measure(func, text):
+    """Returns time in seconds spent by calling func on text."""
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def main(args):
+    print('{:>12} {:>10} {:>22} {:>12}'.format(
+        'annotations', 'size [MB]', 'with brackets [s/MB]', 'all [s/MB]'))
+    annotations = args.annotations
+    for _ in range(args.rounds):
+        text = synthetic_header(annotations, args.depth)
+        size = len(text) / 1e6
+        print('{:>12} {:>10.2f} {:>22.3f} {:>12.3f}'.format(
+            annotations, size,
+            measure(filter_annotations_with_brackets, text) / size,
+            measure(use_filters, text) / size))
+        annotations *= 2
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Converts type database between json and the compact binary format.
+
+Json file (with .json suffix) is converted to the binary format, any other
+file is expected to be in the binary format and is converted to json.
+"""
+
+import sys
+
+from type_extractor.arg_parser import get_arg_parser_for_convert_type_db
+from type_extractor.io import convert_binary_file_to_json
+from type_extractor.io import convert_json_file_to_binary
+
+
+def parse_args():
+    """Parses script arguments and returns them."""
+    parser = get_arg_parser_for_convert_type_db(__doc__)
+    return parser.parse_args()
+
+
+def main(args):
+    if args.path.endswith('.json'):
+        convert_json_file_to_binary(args.path, args.output)
+    else:
+        convert_binary_file_to_json(args.path, args.output, args.json_indent)
+
+
+if __name__ == '__main__':
+    sys.exit(main(parse_args()))
@@ -6,17 +6,37 @@ Parses function declarations, structs, unions and enums.
 The input has to be path to file.[h|H] or directory.
 """
 
+import contextlib
 import functools
 import logging
 import multiprocessing
 import os
 import re
 import sys
+import time
 
 import type_extractor.io
 from type_extractor.arg_parser import get_arg_parser_for_extract_types
+from type_extractor.cache import HeaderCache
+from type_extractor.func_info import set_declarations_scanner
+from type_extractor.io import load_json_file
+from type_extractor.io import print_json_file
+from type_extractor.io import print_types_info
 from type_extractor.io import read_text_file
+from type_extractor.json_types import PARSED_TYPES_CACHE
+from type_extractor.json_types import set_key_scheme
 from type_extractor.parse_includes import get_types_info_from_text
+from type_extractor.regex_registry import format_regex_profile
+from type_extractor.regex_registry import get_regex_profile
+from type_extractor.regex_registry import merge_regex_profiles
+from type_extractor.regex_registry import reset_regex_profile
+from type_extractor.regex_registry import set_regex_profiling
+from type_extractor.scheduling import estimate_costs
+from type_extractor.scheduling import format_timings_summary
+from type_extractor.scheduling import get_chunks
+from type_extractor.scheduling import get_file_sizes
+from type_extractor.scheduling import get_jobs_count
+from type_extractor.utils import FilesFilter
 from type_extractor.utils import get_files_with_suffix_from_path
 from type_extractor.utils import setup_logging
 
@@ -42,11 +62,29 @@ def get_output_file(header, path, out_format, dir_out):
     return os.path.join(dir_out, f_name)
 
 
-def parse_header(header_file, path, output_handler, output_dir, output_format, indent):
+def get_output_dir(relative_path, output_dir, pattern_output_dirs):
+    """Returns output directory of the first pattern matching header's relative
+    path. Default output directory is returned when no pattern matches.
+    """
+    relative_path = relative_path.replace(os.path.sep, '/')
+    for pattern, pattern_output_dir in pattern_output_dirs:
+        if pattern.search(relative_path):
+            return pattern_output_dir
+    return output_dir
+
+
+def parse_header(header_file, path, output_dir, output_formats, indent,
+                 cache=None, pattern_output_dirs=(), key_scheme='sha1',
+                 declarations_scanner='tokens'):
     """Get types information from header file and writes output in chosen
-    format to file to output directory.
+    formats to files to output directory. Header is parsed once for all the
+    formats.
 
     Path to header set to functions is relative path from script's input path.
+    Output of unchanged header is taken from cache.
+
+    Returns True when the header was parsed, False when all outputs were
+    taken from cache.
     """
     logging.info('Reading file: {}'.format(header_file))
     content = read_text_file(header_file)
@@ -55,46 +93,136 @@ def parse_header(header_file, path, output_handler, output_dir, output_format, i
     else:
         relative_path = os.path.relpath(header_file, path)
 
+    output_dir = get_output_dir(relative_path, output_dir, pattern_output_dirs)
+    outputs = []
+    for output_format in output_formats:
+        out_f = get_output_file(header_file, path, output_format, output_dir)
+        key = None
+        if cache is not None:
+            key = cache.get_key(
+                content, relative_path, output_format, indent, key_scheme, declarations_scanner)
+            if cache.load(key, out_f):
+                logging.info('Using cached {} output for: {}'.format(output_format, header_file))
+                continue
+        outputs.append((output_format, out_f, key))
+    if not outputs:
+        return False
+
+    # Text formats need functions parsed with vararg parameters, json formats
+    # get them removed.
+    parsed_format = next(
+        (f for f, _, _ in outputs if f in type_extractor.io.TEXT_PRINTERS), outputs[0][0])
     functions, types, structs, unions, enums = get_types_info_from_text(
-        relative_path, content, output_format)
-
-    out_f = get_output_file(header_file, path, output_format, output_dir)
-    with open(out_f, 'w') as output_file:
-        output_handler(
-            output_file, functions, types, structs, unions, enums, indent
-        )
+        relative_path, content, parsed_format)
+
+    with contextlib.ExitStack() as stack:
+        output_files = []
+        for output_format, out_f, _ in outputs:
+            mode = 'wb' if output_format in type_extractor.io.BINARY_OUTPUT_FORMATS else 'w'
+            output_files.append((output_format, stack.enter_context(open(out_f, mode))))
+        print_types_info(output_files, functions, types, structs, unions, enums, indent)
+    if cache is not None:
+        for _, out_f, key in outputs:
+            cache.store(key, out_f)
+    return True
+
+
+def parse_headers(headers, **kwargs):
+    """Parses chunk of (header, input path) pairs.
+
+    Returns list of absolute paths to parsed headers with their parsing times
+    and profile of regular expressions used in the chunk (empty when not
+    profiling). Headers whose outputs were taken from cache have no times, so
+    they do not replace their real parsing times.
+    """
+    reset_regex_profile()
+    timings = []
+    for header_file, path in headers:
+        start = time.perf_counter()
+        if parse_header(header_file, path, **kwargs):
+            timings.append((os.path.abspath(header_file), time.perf_counter() - start))
+    PARSED_TYPES_CACHE.log_stats()
+    return timings, get_regex_profile()
 
 
 def main(args):
     os.makedirs(args.output, exist_ok=True)
     dir_out = os.path.abspath(args.output)
 
-    output_handler = getattr(
-        type_extractor.io,
-        'print_types_info_{}'.format(args.format)
-    )
-
     indent = args.json_indent
 
-    for path in args.path:
-        with multiprocessing.Pool() as pool:
-            pool.map(
-                functools.partial(
-                    parse_header,
-                    path=path,
-                    output_handler=output_handler,
-                    output_dir=dir_out,
-                    output_format=args.format,
-                    indent=indent
-                ),
-                get_files_with_suffix_from_path(path, ('.h', '.H'))
-            )
+    files_filter = FilesFilter(
+        args.exclude, args.include, args.exclude_glob, args.include_glob)
+    pattern_output_dirs = []
+    for pattern, pattern_output_dir in args.output_by_pattern:
+        os.makedirs(pattern_output_dir, exist_ok=True)
+        pattern_output_dirs.append(
+            (re.compile(pattern), os.path.abspath(pattern_output_dir)))
+
+    cache = None
+    if args.use_cache:
+        cache = HeaderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    headers = [
+        (header, path) for path in args.path
+        for header in get_files_with_suffix_from_path(path, ('.h', '.H'), files_filter)
+    ]
+    jobs = get_jobs_count(args.jobs)
+    previous_timings = {}
+    if args.timings and os.path.isfile(args.timings):
+        previous_timings = load_json_file(args.timings)
+    costs = estimate_costs(
+        [os.path.abspath(h) for h, _ in headers],
+        get_file_sizes(h for h, _ in headers),
+        previous_timings
+    )
+    chunks = get_chunks(headers, costs, jobs, args.chunksize)
+    logging.info('Parsing {} headers in {} chunks with {} jobs'.format(
+        len(headers), len(chunks), jobs))
+
+    parse = functools.partial(
+        parse_headers,
+        output_dir=dir_out,
+        output_formats=args.formats,
+        indent=indent,
+        cache=cache,
+        pattern_output_dirs=pattern_output_dirs,
+        key_scheme=args.key_scheme,
+        declarations_scanner=args.declarations_scanner
+    )
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [parse(chunk) for chunk in chunks]
+    else:
+        # One pool for all paths, workers are not started again for every path.
+        # Chunks come from the most costly headers, so that they do not end last.
+        with multiprocessing.Pool(jobs) as pool:
+            results = list(pool.imap_unordered(parse, chunks))
+    timings = dict(t for chunk_timings, _ in results for t in chunk_timings)
+    wall_time = time.perf_counter() - start
+
+    if args.summary:
+        print(format_timings_summary(timings, wall_time, jobs))
+    if args.profile_regex:
+        profile = merge_regex_profiles(profile for _, profile in results)
+        print(format_regex_profile(profile, args.profile_regex_top))
+    if args.timings:
+        previous_timings.update(timings)
+        with open(args.timings, 'w') as timings_file:
+            print_json_file(timings_file, previous_timings, indent=1)
+
+    if cache is not None:
+        cache.evict()
 
 
 # We have to parse arguments and setup logging here because of the way the
 # multiprocessing module works on Windows.
 args = parse_args()
 setup_logging(enable=args.enable_logging)
+set_key_scheme(args.key_scheme)
+set_declarations_scanner(args.declarations_scanner)
+if args.profile_regex:
+    set_regex_profiling(True)
 
 if __name__ == '__main__':
     sys.exit(main(args))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Generates 1 JSON for C standard library and 1 for other C header files in
+/usr/include.
+
+With --incremental, JSONs for individual header files are kept together with
+a manifest of headers. Later runs extract only changed headers and merge only
+JSONs whose inputs changed.
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from type_extractor.arg_parser import get_arg_parser_for_gen_cstdlib_and_linux_jsons
+from type_extractor.cache import get_extractor_version
+from type_extractor.incremental import get_merge_signature
+from type_extractor.incremental import get_source_headers
+from type_extractor.incremental import load_manifest
+from type_extractor.incremental import save_manifest
+from type_extractor.incremental import update_header_states
+from type_extractor.utils import FilesFilter
+from type_extractor.utils import get_files_with_suffix_from_path
+from type_extractor.utils import setup_logging
+
+# C standard library headers.
+CSTDLIB_HEADERS = [
+    'assert.h',
+    'complex.h',
+    'ctype.h',
+    'errno.h',
+    'fenv.h',
+    'float.h',
+    'inttypes.h',
+    'iso646.h',
+    'limits.h',
+    'locale.h',
+    'math.h',
+    'setjmp.h',
+    'signal.h',
+    'stdalign.h',
+    'stdarg.h',
+    'stdatomic.h',
+    'stdbool.h',
+    'stddef.h',
+    'stdint.h',
+    'stdio.h',
+    'stdlib.h',
+    'stdnoreturn.h',
+    'string.h',
+    'tgmath.h',
+    'threads.h',
+    'time.h',
+    'uchar.h',
+    'wchar.h',
+    'wctype.h',
+]
+
+# Files we don't want in JSONs.
+FILES_PATTERNS_TO_FILTER_OUT = [
+    r'GL/',
+    r'Qt.*/',
+    r'SDL.*/',
+    r'X11/',
+    r'alsa/',
+    r'c\+\+/',
+    r'dbus.*/',
+    r'glib.*/',
+    r'libdrm/',
+    r'libxml2/',
+    r'llvm.*/',
+    r'mirclient/',
+    r'php[0-9.-]*/',
+    r'pulse/',
+    r'python.*/',
+    r'ruby.*/',
+    r'wayland.*/',
+    r'xcb/',
+]
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXTRACTOR = os.path.join(SCRIPT_DIR, 'extract_types.py')
+MERGER = os.path.join(SCRIPT_DIR, 'merge_jsons.py')
+
+
+def parse_args():
+    """Parses script arguments and returns them."""
+    parser = get_arg_parser_for_gen_cstdlib_and_linux_jsons(__doc__)
+    args = parser.parse_args()
+    for path in (args.cstdlib_headers, args.linux_headers):
+        if path is not None and not os.path.isdir(path):
+            parser.error('Unknown directory: {}'.format(path))
+    return args
+
+
+def run_script(script, *args):
+    """Runs the given Python script with args, fails when the script fails."""
+    subprocess.check_call([sys.executable, script] + list(args))
+
+
+def get_output_name(rel_path):
+    """Returns name of JSON file created by extract_types.py for header."""
+    f_name = re.sub(re.escape(os.path.sep), '_', rel_path).strip('_')
+    return re.sub(r'\.(h|H)$', '.json', f_name)
+
+
+def get_headers(path, files_filter=None):
+    """Returns headers from path keyed by their relative paths.
+
+    Headers (and dirs) rejected by files_filter are left out.
+    """
+    headers = {}
+    if not path:
+        return headers
+    for header in get_files_with_suffix_from_path(path, ('.h', '.H'), files_filter):
+        headers[os.path.relpath(header, path)] = header
+    return headers
+
+
+def extract_headers(headers, out_dir_of):
+    """Extracts types info from headers, moves JSONs to dirs from out_dir_of.
+
+    Headers are linked into a temporary dir with the same layout as their
+    source dir, so JSONs get the same names and header paths as when the
+    whole source dir is extracted.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        links_dir = os.path.join(tmp_dir, 'headers')
+        jsons_dir = os.path.join(tmp_dir, 'jsons')
+        for rel_path, header in headers.items():
+            link = os.path.join(links_dir, rel_path)
+            os.makedirs(os.path.dirname(link), exist_ok=True)
+            os.symlink(os.path.abspath(header), link)
+        run_script(EXTRACTOR, links_dir, '-o', jsons_dir)
+        for rel_path in headers:
+            json_name = get_output_name(rel_path)
+            shutil.move(
+                os.path.join(jsons_dir, json_name),
+                os.path.join(out_dir_of(rel_path), json_name)
+            )
+
+
+def update_jsons(manifest, source, path, headers, out_dir_of):
+    """Brings JSONs for headers from source up to date.
+
+    Extracts only headers changed since the previous run (or whose JSONs are
+    missing) and removes JSONs of headers that are gone.
+    """
+    states = get_source_headers(manifest, source, os.path.abspath(path) if path else '')
+    changed, removed = update_header_states(headers, states)
+    for rel_path in removed:
+        json_file = os.path.join(out_dir_of(rel_path), get_output_name(rel_path))
+        if os.path.isfile(json_file):
+            os.remove(json_file)
+    changed = set(changed)
+    changed.update(
+        rel_path for rel_path in headers
+        if not os.path.isfile(
+            os.path.join(out_dir_of(rel_path), get_output_name(rel_path)))
+    )
+    logging.info('{}: {} changed and {} removed headers'.format(
+        source, len(changed), len(removed)))
+    if changed:
+        extract_headers({h: headers[h] for h in changed}, out_dir_of)
+
+
+def merge_jsons(manifest, input_dirs, output, json_indent, incremental):
+    """Merges JSONs from input dirs, skips the merge in incremental mode when
+    the inputs did not change since the previous merge.
+    """
+    json_files = [
+        (input_dir, json_file) for input_dir in input_dirs
+        for json_file in get_files_with_suffix_from_path(input_dir, '.json')
+    ]
+    signature = get_merge_signature(json_files, json_indent)
+    if (incremental and os.path.isfile(output) and
+            manifest['merges'].get(output) == signature):
+        logging.info('Inputs of {} did not change, skipping merge'.format(output))
+        return
+    indent = str(json_indent) if json_indent is not None else ''
+    run_script(MERGER, *input_dirs, '-o', output, '--json-indent', indent)
+    manifest['merges'][output] = signature
+
+
+def remove_tmp_dirs_and_files(tmp_dirs, manifest_file):
+    """Removes dirs with JSONs for individual header files and the manifest."""
+    for tmp_dir in tmp_dirs:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    if os.path.isfile(manifest_file):
+        os.remove(manifest_file)
+
+
+def main(args):
+    std_lib_out_dir = os.path.join(args.output, 'gen_tmp_cstdlib')
+    std_lib_json = os.path.join(args.output, 'cstdlib.json')
+    linux_out_dir = os.path.join(args.output, 'gen_tmp_linux')
+    linux_json = os.path.join(args.output, 'linux.json')
+    cstdlib_priority_out_dir = os.path.join(args.output, 'gen_tmp_cstdlib_priority')
+    linux_priority_out_dir = os.path.join(args.output, 'gen_tmp_linux_priority')
+    manifest_file = os.path.join(args.output, 'gen_tmp_manifest.json')
+    tmp_dirs = [
+        std_lib_out_dir, linux_out_dir, cstdlib_priority_out_dir, linux_priority_out_dir
+    ]
+
+    if not args.incremental:
+        remove_tmp_dirs_and_files(tmp_dirs, manifest_file)
+    for tmp_dir in tmp_dirs:
+        os.makedirs(tmp_dir, exist_ok=True)
+    manifest = load_manifest(manifest_file, get_extractor_version())
+
+    # Standard library headers go to other directory than the rest of headers.
+    files_filter = FilesFilter(FILES_PATTERNS_TO_FILTER_OUT + args.files_filter)
+    update_jsons(
+        manifest, 'include', args.include_dir,
+        get_headers(args.include_dir, files_filter),
+        lambda h: std_lib_out_dir if os.path.basename(h) in CSTDLIB_HEADERS else linux_out_dir
+    )
+
+    # High-priority cstdlib and linux headers, if paths were given.
+    update_jsons(
+        manifest, 'cstdlib_priority', args.cstdlib_headers or '',
+        get_headers(args.cstdlib_headers), lambda h: cstdlib_priority_out_dir
+    )
+    update_jsons(
+        manifest, 'linux_priority', args.linux_headers or '',
+        get_headers(args.linux_headers), lambda h: linux_priority_out_dir
+    )
+
+    # Priority headers must be first.
+    merge_jsons(
+        manifest, [cstdlib_priority_out_dir, std_lib_out_dir], std_lib_json,
+        args.json_indent, args.incremental
+    )
+    merge_jsons(
+        manifest, [linux_priority_out_dir, linux_out_dir], linux_json,
+        args.json_indent, args.incremental
+    )
+    save_manifest(manifest_file, manifest)
+
+    if args.cleanup and not args.incremental:
+        remove_tmp_dirs_and_files(tmp_dirs, manifest_file)
+
+
+args = parse_args()
+setup_logging(enable=args.enable_logging)
+
+if __name__ == '__main__':
+    sys.exit(main(args))
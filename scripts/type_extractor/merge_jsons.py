@@ -5,9 +5,15 @@ import logging
 import sys
 
 from type_extractor.arg_parser import get_arg_parser_for_merge_jsons
+from type_extractor.deduplicate_types import deduplicate_json_types
 from type_extractor.io import print_types_functions_json
+from type_extractor.io import read_names_file
+from type_extractor.merge_files import TypedefChainRoots
 from type_extractor.merge_files import merge_json_file
+from type_extractor.parallel_merge import merge_json_files_parallel
 from type_extractor.remove_json_types import remove_unused_json_types
+from type_extractor.remove_json_types import select_functions
+from type_extractor.streaming_merge import StreamingMerger
 from type_extractor.utils import get_files_with_suffix_from_path
 from type_extractor.utils import setup_logging
 
@@ -15,20 +21,68 @@ from type_extractor.utils import setup_logging
 def parse_args():
     """Parses script arguments and returns them."""
     parser = get_arg_parser_for_merge_jsons(__doc__)
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.streaming and args.dedup_types:
+        parser.error('--dedup-types cannot be used with --streaming')
+    return args
+
+
+def get_roots(args, functions):
+    """Returns names of root functions, None when all functions are roots."""
+    if args.roots is None:
+        return None
+    roots = read_names_file(args.roots)
+    for name in roots:
+        if name not in functions:
+            logging.warning('Root function {} is not in merged functions'.format(name))
+    return roots
+
+
+def merge_streaming(args):
+    """Merges json files keeping only index of types in memory."""
+    merger = StreamingMerger(args.json_indent)
+    try:
+        for path in args.path:
+            for json_file in get_files_with_suffix_from_path(path, '.json'):
+                logging.info('Merging json file {}'.format(json_file))
+                merger.merge_json_file(json_file)
+
+        roots = get_roots(args, merger.func_positions)
+        logging.info('Writing output to: {}'.format(args.output))
+        with open(args.output, 'w') as output_file:
+            merger.print_json_file(output_file, args.keep_unused_types, roots)
+    finally:
+        merger.close()
 
 
 def main(args):
-    merged_types = {}
-    merged_functions = {}
+    if args.streaming:
+        return merge_streaming(args)
+
+    if args.jobs > 1:
+        json_files = [
+            json_file for path in args.path
+            for json_file in get_files_with_suffix_from_path(path, '.json')
+        ]
+        logging.info('Merging {} json files with {} jobs'.format(len(json_files), args.jobs))
+        merged_types, merged_functions = merge_json_files_parallel(json_files, args.jobs)
+    else:
+        merged_types = {}
+        merged_functions = {}
+        chain_roots = TypedefChainRoots(merged_types)
 
-    for path in args.path:
-        for json_file in get_files_with_suffix_from_path(path, '.json'):
-            logging.info('Merging json file {}'.format(json_file))
-            merge_json_file(merged_types, merged_functions, json_file)
+        for path in args.path:
+            for json_file in get_files_with_suffix_from_path(path, '.json'):
+                logging.info('Merging json file {}'.format(json_file))
+                merge_json_file(merged_types, merged_functions, json_file, chain_roots)
 
+    roots = get_roots(args, merged_functions)
+    if roots is not None:
+        merged_functions = select_functions(merged_functions, roots)
     if not args.keep_unused_types:
         merged_types = remove_unused_json_types(merged_functions, merged_types)
+    if args.dedup_types:
+        merged_types = deduplicate_json_types(merged_functions, merged_types)
 
     logging.info('Writing output to: {}'.format(args.output))
     with open(args.output, 'w') as output_file:
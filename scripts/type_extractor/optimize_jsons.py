@@ -3,16 +3,20 @@
 C types in different files will have different keys, therefore you shoud not
 try to merge them!
 2. Removes qualifier types.
+Structurally identical types are merged first with --dedup-types.
 """
 
 import multiprocessing
+import os
+import shutil
 import sys
+import tempfile
 
 from type_extractor.arg_parser import get_arg_parser_for_optimize_jsons
+from type_extractor.deduplicate_types import deduplicate_json_types
 from type_extractor.io import load_json_file
 from type_extractor.io import print_json_file
-from type_extractor.remove_json_types import remove_qualifier_json_types
-from type_extractor.substitute_json_keys import substitute_json_keys_with_natural_numbers
+from type_extractor.optimize_types import optimize_json_types
 from type_extractor.utils import get_files_with_suffix_from_all_paths
 
 
@@ -25,11 +29,20 @@ def parse_args():
 def optimize_json(json_file):
     content = load_json_file(json_file)
 
-    substitute_json_keys_with_natural_numbers(content)
-    remove_qualifier_json_types(content)
-
-    with open(json_file, 'w') as out:
-        print_json_file(out, content, args.json_indent)
+    if args.dedup_types:
+        content['types'] = deduplicate_json_types(content['functions'], content['types'])
+    optimize_json_types(content)
+
+    # Optimized json replaces the original one only when it is written whole.
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(json_file)))
+    try:
+        with os.fdopen(fd, 'w') as out:
+            print_json_file(out, content, args.json_indent)
+        shutil.copymode(json_file, tmp_file)
+        os.replace(tmp_file, json_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
 
 
 def main(args):
@@ -3,7 +3,9 @@
 import unittest
 from unittest import mock
 
+from type_extractor.arg_parser import get_arg_parser_for_convert_type_db
 from type_extractor.arg_parser import get_arg_parser_for_extract_types
+from type_extractor.arg_parser import get_arg_parser_for_gen_cstdlib_and_linux_jsons
 from type_extractor.arg_parser import get_arg_parser_for_merge_jsons
 from type_extractor.arg_parser import get_arg_parser_for_optimize_jsons
 
@@ -40,15 +42,31 @@ class ParseArgsExtractTypesTests(ParseArgsTestsBase):
 
     def test_output_format_is_json_when_not_given(self):
         args = self.parser.parse_args(['path'])
-        self.assertEqual(args.format, 'json')
+        self.assertEqual(args.formats, ['json'])
+
+    def test_key_scheme_is_sha1_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.key_scheme, 'sha1')
+
+    def test_key_scheme_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--key-scheme', 'structural-id'])
+        self.assertEqual(args.key_scheme, 'structural-id')
 
     def test_output_format_is_parsed_correctly_short_format(self):
         args = self.parser.parse_args(['path', '-f', 'txt'])
-        self.assertEqual(args.format, 'txt')
+        self.assertEqual(args.formats, ['txt'])
 
     def test_output_format_is_parsed_correctly_long_format(self):
         args = self.parser.parse_args(['path', '--format', 'txt'])
-        self.assertEqual(args.format, 'txt')
+        self.assertEqual(args.formats, ['txt'])
+
+    def test_several_output_formats_are_parsed_in_order_without_duplicates(self):
+        args = self.parser.parse_args(['path', '-f', 'lti,json,lti'])
+        self.assertEqual(args.formats, ['lti', 'json'])
+
+    def test_invalid_output_format_is_error(self):
+        with mock.patch('sys.stderr'), self.assertRaises(SystemExit):
+            self.parser.parse_args(['path', '-f', 'json,xml'])
 
     def test_output_directory_is_type_extractor_output_when_not_given(self):
         args = self.parser.parse_args(['path'])
@@ -82,6 +100,87 @@ class ParseArgsExtractTypesTests(ParseArgsTestsBase):
         args = self.parser.parse_args(['path', '--json-indent', '0'])
         self.assertEqual(args.json_indent, None)
 
+    def test_cache_is_used_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.use_cache, True)
+
+    def test_cache_is_not_used_when_no_cache_given(self):
+        args = self.parser.parse_args(['path', '--no-cache'])
+        self.assertEqual(args.use_cache, False)
+
+    def test_cache_dir_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--cache-dir', 'my_cache'])
+        self.assertEqual(args.cache_dir, 'my_cache')
+
+    def test_cache_size_is_1024_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.cache_size, 1024)
+
+    def test_cache_size_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--cache-size', '10'])
+        self.assertEqual(args.cache_size, 10)
+
+    def test_jobs_and_chunksize_are_none_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.jobs, None)
+        self.assertEqual(args.chunksize, None)
+
+    def test_jobs_is_parsed_correctly_short_form(self):
+        args = self.parser.parse_args(['path', '-j', '8'])
+        self.assertEqual(args.jobs, 8)
+
+    def test_jobs_and_chunksize_are_parsed_correctly_long_form(self):
+        args = self.parser.parse_args(['path', '--jobs', '8', '--chunksize', '3'])
+        self.assertEqual(args.jobs, 8)
+        self.assertEqual(args.chunksize, 3)
+
+    def test_timings_and_summary_are_not_used_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.timings, None)
+        self.assertEqual(args.summary, False)
+
+    def test_timings_and_summary_are_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--timings', 't.json', '--summary'])
+        self.assertEqual(args.timings, 't.json')
+        self.assertEqual(args.summary, True)
+
+    def test_profile_regex_is_not_used_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.profile_regex, False)
+        self.assertEqual(args.profile_regex_top, 20)
+
+    def test_profile_regex_does_not_take_path_as_count(self):
+        args = self.parser.parse_args(['--profile-regex', 'path'])
+        self.assertEqual(args.profile_regex, True)
+        self.assertEqual(args.path, ['path'])
+
+    def test_profile_regex_top_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--profile-regex', '--profile-regex-top', '5'])
+        self.assertEqual(args.profile_regex_top, 5)
+
+    def test_files_filters_are_empty_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.exclude, [])
+        self.assertEqual(args.include, [])
+        self.assertEqual(args.exclude_glob, [])
+        self.assertEqual(args.include_glob, [])
+
+    def test_files_filters_can_be_given_more_times(self):
+        args = self.parser.parse_args([
+            'path', '--exclude', 'GL/', '--exclude', 'X11/',
+            '--include', 'linux/', '--exclude-glob', '*.H', '--include-glob', 'sys/*'
+        ])
+        self.assertEqual(args.exclude, ['GL/', 'X11/'])
+        self.assertEqual(args.include, ['linux/'])
+        self.assertEqual(args.exclude_glob, ['*.H'])
+        self.assertEqual(args.include_glob, ['sys/*'])
+
+    def test_output_by_pattern_is_parsed_correctly(self):
+        args = self.parser.parse_args([
+            'path', '--output-by-pattern', 'stdio', 'std', '--output-by-pattern', 'gl', 'gl'
+        ])
+        self.assertEqual(args.output_by_pattern, [['stdio', 'std'], ['gl', 'gl']])
+
     def test_input_file_or_dir_is_required(self):
         with self.assertRaises(SystemExit) as exc:
             self.parser.parse_args([])
@@ -132,6 +231,30 @@ class ParseArgsMergeJsonsTests(ParseArgsTestsBase):
             self.parser.parse_args([])
         self.assertNotEqual(exc.exception.code, 0)
 
+    def test_streaming_is_false_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.streaming, False)
+
+    def test_streaming_is_true_when_given(self):
+        args = self.parser.parse_args(['path', '--streaming'])
+        self.assertEqual(args.streaming, True)
+
+    def test_roots_is_none_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertIsNone(args.roots)
+
+    def test_roots_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '--roots', 'roots.txt'])
+        self.assertEqual(args.roots, 'roots.txt')
+
+    def test_jobs_is_one_when_not_given(self):
+        args = self.parser.parse_args(['path'])
+        self.assertEqual(args.jobs, 1)
+
+    def test_jobs_is_parsed_correctly(self):
+        args = self.parser.parse_args(['path', '-j', '4'])
+        self.assertEqual(args.jobs, 4)
+
     def test_input_path_to_file_is_parsed_correctly(self):
         args = self.parser.parse_args(['output/stdio.json'])
         self.assertEqual(args.path, ['output/stdio.json'])
@@ -160,3 +283,52 @@ class ParseArgsOptimizeJsonTests(ParseArgsTestsBase):
     def test_accept_more_paths_to_input_files_dirs(self):
         args = self.parser.parse_args(['in/stdio.json', 'json_files/'])
         self.assertEqual(args.path, ['in/stdio.json', 'json_files/'])
+
+
+class ParseArgsConvertTypeDbTests(ParseArgsTestsBase):
+    """Tests for convert_type_db.py script arguments."""
+
+    def setUp(self):
+        super().setUp()
+        self.parser = get_arg_parser_for_convert_type_db(__doc__)
+
+    def test_output_is_required(self):
+        with self.assertRaises(SystemExit) as exc:
+            self.parser.parse_args(['in.json'])
+        self.assertNotEqual(exc.exception.code, 0)
+
+    def test_paths_are_parsed_correctly(self):
+        args = self.parser.parse_args(['in.json', '-o', 'out.bin'])
+        self.assertEqual(args.path, 'in.json')
+        self.assertEqual(args.output, 'out.bin')
+
+
+class ParseArgsGenCstdlibAndLinuxJsonsTests(ParseArgsTestsBase):
+    """Tests for gen_cstdlib_and_linux_jsons.py script arguments."""
+
+    def setUp(self):
+        super().setUp()
+        self.parser = get_arg_parser_for_gen_cstdlib_and_linux_jsons(__doc__)
+
+    def test_default_values_match_shell_script(self):
+        args = self.parser.parse_args([])
+        self.assertEqual(args.json_indent, 1)
+        self.assertEqual(args.cleanup, True)
+        self.assertEqual(args.include_dir, '/usr/include/')
+        self.assertEqual(args.files_filter, [])
+
+    def test_incremental_is_false_when_not_given(self):
+        args = self.parser.parse_args([])
+        self.assertEqual(args.incremental, False)
+
+    def test_incremental_is_true_when_given(self):
+        args = self.parser.parse_args(['--incremental'])
+        self.assertEqual(args.incremental, True)
+
+    def test_files_filter_can_be_given_more_times(self):
+        args = self.parser.parse_args(['-f', 'a/', '--files-filter', 'b/'])
+        self.assertEqual(args.files_filter, ['a/', 'b/'])
+
+    def test_no_cleanup_is_parsed_correctly(self):
+        args = self.parser.parse_args(['-N'])
+        self.assertEqual(args.cleanup, False)
@@ -0,0 +1,127 @@
+"""Units tests for the type_extractor.binary_format module."""
+
+import unittest
+
+from type_extractor.binary_format import BinaryDecoder
+from type_extractor.binary_format import BinaryFormatError
+from type_extractor.binary_format import INDEX_ENTRY
+from type_extractor.binary_format import IndexedDictView
+from type_extractor.binary_format import binary_to_content
+from type_extractor.binary_format import content_to_binary
+from type_extractor.binary_format import read_varint
+from type_extractor.binary_format import write_varint
+from type_extractor.json_types import PointerType
+from type_extractor.json_types import PrimitiveType
+
+CONTENT = {
+    'functions': {
+        'f': {'decl': 'int f(int a, ...);', 'name': 'f', 'vararg': True,
+              'params': [{'name': 'a', 'type': 'int'}], 'ret_type': 'int'},
+    },
+    'types': {
+        'int': {'bit_width': 32, 'name': 'int', 'type': 'integral_type'},
+        'arr': {'dimensions': [-1, 0, 1 << 40, 'N'], 'element_type': 'int', 'type': 'array'},
+        'x': {'float': 1.5, 'none': None, 'false': False, 'empty': {}, 'ключ': 'žluť'},
+    },
+}
+
+
+class VarintTests(unittest.TestCase):
+    def test_written_varint_is_read_back(self):
+        for number in (0, 1, 127, 128, 300, 1 << 63):
+            out = bytearray(b'x')
+            write_varint(out, number)
+
+            self.assertEqual(read_varint(out, 1), (number, len(out)))
+
+    def test_small_number_takes_one_byte(self):
+        out = bytearray()
+        write_varint(out, 127)
+
+        self.assertEqual(out, b'\x7f')
+
+
+class BinaryFormatTests(unittest.TestCase):
+    def test_decoded_content_is_same_as_encoded(self):
+        self.assertEqual(binary_to_content(content_to_binary(CONTENT)), CONTENT)
+
+    def test_content_may_be_any_json_value(self):
+        for content in ([], 'a', 0, None, {'a': []}):
+            self.assertEqual(binary_to_content(content_to_binary(content)), content)
+
+    def test_objects_are_encoded_as_their_repr_json(self):
+        ptr = PointerType(PrimitiveType('int'))
+
+        self.assertEqual(
+            binary_to_content(content_to_binary({'types': {'p': ptr}})),
+            {'types': {'p': {'type': 'pointer', 'pointed_type': ptr.pointed_type}}}
+        )
+
+    def test_strings_are_stored_only_once(self):
+        once = content_to_binary({'a': 'long string' * 10})
+        twice = content_to_binary({'a': 'long string' * 10, 'b': 'long string' * 10})
+
+        self.assertLess(len(twice) - len(once), 10)
+
+    def test_value_of_section_entry_is_decoded_from_its_offset(self):
+        decoder = BinaryDecoder(content_to_binary(CONTENT))
+        # Root dict: tag, count, key of the first section ('functions').
+        pos = decoder.root_pos + 3
+        _, types_pos = decoder.decode_value(pos)
+        # Types section: tag, count, index of sorted keys and offsets.
+        index_pos = types_pos + 3
+        key, offset = INDEX_ENTRY.unpack_from(decoder.data, index_pos)
+
+        self.assertEqual(decoder.get_string(key), 'arr')
+        self.assertEqual(
+            decoder.decode_value(decoder.root_pos + offset)[0], CONTENT['types']['arr']
+        )
+
+    def test_data_without_magic_number_raise_error(self):
+        with self.assertRaises(BinaryFormatError):
+            binary_to_content(b'{"types": {}}')
+
+    def test_data_of_other_version_raise_error(self):
+        data = bytearray(content_to_binary({}))
+        data[4] = 99
+
+        with self.assertRaises(BinaryFormatError):
+            binary_to_content(data)
+
+    def test_unsupported_value_raise_error(self):
+        with self.assertRaises(TypeError):
+            content_to_binary({'a': object()})
+
+
+class IndexedDictViewTests(unittest.TestCase):
+    def setUp(self):
+        self.sections = BinaryDecoder(content_to_binary(CONTENT)).get_sections()
+
+    def test_sections_are_indexed_dict_views(self):
+        self.assertIsInstance(self.sections['functions'], IndexedDictView)
+        self.assertIsInstance(self.sections['types'], IndexedDictView)
+
+    def test_values_are_decoded_by_key(self):
+        types = self.sections['types']
+
+        for key, value in CONTENT['types'].items():
+            self.assertEqual(types[key], value)
+            self.assertIn(key, types)
+
+    def test_missing_key_is_not_found(self):
+        types = self.sections['types']
+
+        self.assertNotIn('b', types)
+        self.assertIsNone(types.get('zzz'))
+        with self.assertRaises(KeyError):
+            types['']
+
+    def test_keys_are_sorted(self):
+        self.assertEqual(list(self.sections['types'].keys()), sorted(CONTENT['types']))
+        self.assertEqual(len(self.sections['types']), 3)
+
+    def test_other_values_in_root_are_decoded(self):
+        sections = BinaryDecoder(content_to_binary({'a': [1], 'b': {}})).get_sections()
+
+        self.assertEqual(sections['a'], [1])
+        self.assertEqual(len(sections['b']), 0)
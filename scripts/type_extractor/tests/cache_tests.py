@@ -0,0 +1,94 @@
+"""Units tests for the type_extractor.cache module."""
+
+import os
+import tempfile
+import unittest
+
+from type_extractor.cache import HeaderCache
+from type_extractor.cache import get_extractor_version
+
+
+class HeaderCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.cache = HeaderCache(os.path.join(self.tmp_dir, 'cache'), 100, 'v1')
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def read_file(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_key_is_same_for_same_input(self):
+        self.assertEqual(
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4),
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4)
+        )
+
+    def test_key_differs_when_content_differs(self):
+        self.assertNotEqual(
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4),
+            self.cache.get_key('int g(void);', 'a.h', 'json', 4)
+        )
+
+    def test_key_differs_when_path_format_or_indent_differs(self):
+        key = self.cache.get_key('int f(void);', 'a.h', 'json', 4)
+
+        self.assertNotEqual(key, self.cache.get_key('int f(void);', 'b.h', 'json', 4))
+        self.assertNotEqual(key, self.cache.get_key('int f(void);', 'a.h', 'lti', 4))
+        self.assertNotEqual(key, self.cache.get_key('int f(void);', 'a.h', 'json', None))
+
+    def test_key_differs_when_key_scheme_differs(self):
+        self.assertNotEqual(
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4, 'sha1'),
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4, 'blake2b-64')
+        )
+
+    def test_key_differs_when_declarations_scanner_differs(self):
+        self.assertNotEqual(
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4, 'sha1', 'tokens'),
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4, 'sha1', 'regex')
+        )
+
+    def test_key_differs_when_version_differs(self):
+        other_cache = HeaderCache(self.cache.cache_dir, 100, 'v2')
+
+        self.assertNotEqual(
+            self.cache.get_key('int f(void);', 'a.h', 'json', 4),
+            other_cache.get_key('int f(void);', 'a.h', 'json', 4)
+        )
+
+    def test_load_returns_false_when_output_is_not_cached(self):
+        out_f = os.path.join(self.tmp_dir, 'out.json')
+
+        self.assertFalse(self.cache.load('0123', out_f))
+        self.assertFalse(os.path.exists(out_f))
+
+    def test_stored_output_is_loaded(self):
+        self.cache.store('0123', self.write_file('a.json', '{}'))
+        out_f = os.path.join(self.tmp_dir, 'out.json')
+
+        self.assertTrue(self.cache.load('0123', out_f))
+        self.assertEqual(self.read_file(out_f), '{}')
+
+    def test_evict_removes_least_recently_used_outputs(self):
+        for i, key in enumerate(('0001', '0002', '0003')):
+            self.cache.store(key, self.write_file('a.json', 'x' * 40))
+            os.utime(self.cache.get_entry_path(key), (i, i))
+
+        self.cache.evict()
+
+        self.assertFalse(os.path.exists(self.cache.get_entry_path('0001')))
+        self.assertTrue(os.path.exists(self.cache.get_entry_path('0002')))
+        self.assertTrue(os.path.exists(self.cache.get_entry_path('0003')))
+
+
+class GetExtractorVersionTests(unittest.TestCase):
+    def test_version_is_stable(self):
+        self.assertEqual(get_extractor_version(), get_extractor_version())
@@ -0,0 +1,125 @@
+"""Unit tests for the deduplicate_types module."""
+
+import unittest
+
+from json_fixtures import typedef
+from type_extractor.deduplicate_types import deduplicate_json_types
+from type_extractor.deduplicate_types import get_new_keys
+from type_extractor.deduplicate_types import get_type_signature
+
+
+def struct(name, *member_types):
+    return {
+        'members': [{'name': 'm{}'.format(i), 'type': t} for i, t in enumerate(member_types)],
+        'name': name, 'type': 'structure'
+    }
+
+
+def pointer(pointed_type):
+    return {'pointed_type': pointed_type, 'type': 'pointer'}
+
+
+INT = {'bit_width': 32, 'name': 'int', 'type': 'integral_type'}
+
+
+class GetNewKeysTests(unittest.TestCase):
+    def test_anonymous_structs_with_same_members_are_merged_to_smallest_key(self):
+        types = {
+            'i': INT,
+            'b': struct('struct _TYPEDEF_B', 'i'),
+            'a': struct('struct _LOCAL_x_y', 'i'),
+        }
+
+        self.assertEqual(get_new_keys(types), {'i': 'i', 'a': 'a', 'b': 'a'})
+
+    def test_named_structs_are_not_merged(self):
+        types = {'i': INT, 'a': struct('struct A', 'i'), 'b': struct('struct B', 'i')}
+
+        self.assertEqual(get_new_keys(types), {'i': 'i', 'a': 'a', 'b': 'b'})
+
+    def test_structs_with_different_member_types_are_not_merged(self):
+        types = {
+            'i': INT, 'p': pointer('i'),
+            'a': struct('struct _TYPEDEF_A', 'i'),
+            'b': struct('struct _TYPEDEF_B', 'p'),
+        }
+
+        self.assertEqual(get_new_keys(types)['b'], 'b')
+
+    def test_recursive_types_are_merged(self):
+        types = {
+            'a': struct('struct _TYPEDEF_A', 'pa'), 'pa': pointer('a'),
+            'b': struct('struct _TYPEDEF_B', 'pb'), 'pb': pointer('b'),
+        }
+
+        self.assertEqual(get_new_keys(types), {'a': 'a', 'pa': 'pa', 'b': 'a', 'pb': 'pa'})
+
+    def test_types_referencing_merged_types_are_merged(self):
+        types = {
+            'i': INT,
+            'a': struct('struct _TYPEDEF_A', 'i'), 'pa': pointer('a'),
+            'b': struct('struct _TYPEDEF_B', 'i'), 'pb': pointer('b'),
+        }
+
+        self.assertEqual(get_new_keys(types)['pb'], 'pa')
+
+    def test_typedefs_with_different_names_are_not_merged(self):
+        types = {'i': INT, 'x': typedef('X', 'i'), 'y': typedef('Y', 'i')}
+
+        self.assertEqual(get_new_keys(types)['y'], 'y')
+
+    def test_missing_and_unknown_referenced_types_are_kept(self):
+        types = {
+            'a': pointer('missing'), 'b': pointer('missing'),
+            'x': typedef('X', 'unknown'),
+        }
+
+        self.assertEqual(
+            get_new_keys(types),
+            {'a': 'a', 'b': 'a', 'x': 'x', 'missing': 'missing'}
+        )
+
+    def test_missing_referenced_types_do_not_stop_refinement_early(self):
+        types = {
+            'int': INT, 'char': {'bit_width': 8, 'name': 'char', 'type': 'integral_type'},
+            'p3': pointer('int'), 'r3': pointer('char'),
+            'p2': pointer('p3'), 'r2': pointer('r3'),
+            't1': typedef('T1', 'M1'), 't2': typedef('T2', 'M2'),
+        }
+
+        new_keys = get_new_keys(types)
+
+        self.assertEqual(new_keys['r2'], 'r2')
+        self.assertEqual(new_keys['r3'], 'r3')
+
+
+class DeduplicateJsonTypesTests(unittest.TestCase):
+    def test_references_are_substituted_and_duplicates_removed(self):
+        types = {
+            'i': INT,
+            'a': struct('struct _TYPEDEF_A', 'i'), 'ta': typedef('A', 'a'),
+            'b': struct('struct _TYPEDEF_B', 'i'), 'tb': typedef('B', 'b'),
+        }
+        functions = {
+            'f': {'decl': 'void f(B b);', 'name': 'f',
+                  'params': [{'name': 'b', 'type': 'b'}], 'ret_type': 'missing'},
+        }
+
+        new_types = deduplicate_json_types(functions, types)
+
+        self.assertEqual(sorted(new_types), ['a', 'i', 'ta', 'tb'])
+        self.assertEqual(new_types['tb'], typedef('B', 'a'))
+        self.assertEqual(functions['f']['params'][0]['type'], 'a')
+        self.assertEqual(functions['f']['ret_type'], 'missing')
+
+
+class GetTypeSignatureTests(unittest.TestCase):
+    def test_referenced_types_are_returned_separately(self):
+        t = struct('struct _LOCAL_A_b', 'i', 'p')
+
+        signature, refs = get_type_signature(t)
+
+        self.assertEqual(refs, ['i', 'p'])
+        self.assertNotIn('_LOCAL_', signature)
+        self.assertNotIn('"i"', signature)
+        self.assertEqual(t, struct('struct _LOCAL_A_b', 'i', 'p'))
@@ -4,7 +4,10 @@ import unittest
 
 from type_extractor.func_info import FuncInfo
 from type_extractor.func_info import get_declarations
+from type_extractor.func_info import get_declarations_by_regex
+from type_extractor.func_info import get_declarations_by_tokens
 from type_extractor.func_info import parse_func_declaration
+from type_extractor.func_info import set_declarations_scanner
 from type_extractor.func_info import split_ret_type_and_call_convention
 from type_extractor.header_text_filters import use_filters
 from type_extractor.params_info import Param
@@ -90,6 +93,42 @@ class GetDeclarationsTests(unittest.TestCase):
             ['type* some_name(par1, with(brackets), ret *ptr, ...);']
         )
 
+    def test_declarations_are_found_by_regex_when_set(self):
+        self.addCleanup(set_declarations_scanner, 'tokens')
+        set_declarations_scanner('regex')
+
+        self.assertEqual(get_declarations(' int f(void);'), [' int f(void);'])
+
+
+class GetDeclarationsByTokensTests(unittest.TestCase):
+    TEXTS = [
+        'int f(void);\nint g(int a, char *b);',
+        '  unsigned long\t* h (int (*cb)(int), ...) ;',
+        '*x f(a); int g(b); x = h(c);',
+        'static int i(int a[2 + 3]);;ret j();',
+        'int f(a) k(b);\nint l(x = 1); int m(n)\n;',
+        'int n(a); int o(b',
+        'int *p(void); int * q(void); r(void);',
+        'int f(void) { return g(x); } int s(void);',
+    ]
+
+    def test_declarations_are_same_as_from_regex(self):
+        for text in self.TEXTS:
+            self.assertEqual(
+                get_declarations_by_tokens(text), get_declarations_by_regex(text), text
+            )
+
+    def test_declaration_starts_with_one_space_before_return_type(self):
+        self.assertEqual(
+            get_declarations_by_tokens('x;\n\n  int f(void);'), [' int f(void);']
+        )
+
+    def test_long_run_of_words_without_parenthesis_is_scanned_quickly(self):
+        # The regex backtracks for minutes on this.
+        text = 'int a ' * 100000 + 'int f(void);'
+
+        self.assertEqual(get_declarations_by_tokens(text), [text])
+
 
 class UseFiltersTests(unittest.TestCase):
     def test_substitute_inline_function_to_function(self):
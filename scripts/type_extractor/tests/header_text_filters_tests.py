@@ -2,6 +2,7 @@
 
 import unittest
 
+from type_extractor.header_text_filters import apply_filter_rules
 from type_extractor.header_text_filters import filter_annotations_with_brackets
 from type_extractor.header_text_filters import filter_annotations_without_brackets
 from type_extractor.header_text_filters import filter_conditional_preprocessor_statements
@@ -9,6 +10,7 @@ from type_extractor.header_text_filters import filter_cplusplus_ifdefs
 from type_extractor.header_text_filters import filter_oneline_typedefs
 from type_extractor.header_text_filters import filter_out_comments
 from type_extractor.header_text_filters import filter_out_macros
+from type_extractor.header_text_filters import filter_rule
 from type_extractor.header_text_filters import filter_specific_keywords
 from type_extractor.header_text_filters import filter_whitespaces
 from type_extractor.header_text_filters import join_lines_ending_with_backslash
@@ -127,6 +129,26 @@ class FilterTests(unittest.TestCase):
             ''
         )
 
+    def test_filter_all_nested_annotations_with_brackets(self):
+        self.assertEqual(
+            filter_annotations_with_brackets(
+                'int f(_In_ int a, _When_(x, _Out_writes_(n(m))) int *b, '
+                '_At_(*c, _Pre_valid_(y)) int *c);'),
+            'int f(_In_ int a,  int *b,  int *c);'
+        )
+
+    def test_filter_annotation_joined_with_bracket_after_removal(self):
+        self.assertEqual(
+            filter_annotations_with_brackets('_In_ _X_(a) (b) int x'),
+            ' int x'
+        )
+
+    def test_filter_annotations_with_brackets_stops_at_unclosed_bracket(self):
+        self.assertEqual(
+            filter_annotations_with_brackets('_X_(a) int x; _Y_(b (c) _Z_(d)'),
+            ' int x; _Y_(b (c) _Z_(d)'
+        )
+
     def test_filter__in__out_annotations_with_brackets(self):
         self.assertEqual(
             filter_annotations_with_brackets(', __in_xx(yy) param'), ', param')
@@ -175,6 +197,12 @@ class FilterTests(unittest.TestCase):
     def test_filter_many_whitespaces_to_one(self):
         self.assertEqual(filter_whitespaces('   \n \t '), ' ')
 
+    def test_filter_whitespaces_around_commas_and_brackets(self):
+        self.assertEqual(filter_whitespaces('f( a ,\t, b )'), 'f(a, , b)')
+
+    def test_filter_whitespaces_in_empty_block(self):
+        self.assertEqual(filter_whitespaces('{}'), '{ }')
+
     def test_filter_whitespaces_around_brackets(self):
         self.assertEqual(filter_whitespaces(' ( )  [  ]  {  } '), '()[]{ }')
 
@@ -488,3 +516,28 @@ class FilterTests(unittest.TestCase):
             filter_annotations_without_brackets('__SIZE_TYPE__ x'),
             '__SIZE_TYPE__ x'
         )
+
+
+class ApplyFilterRulesTests(unittest.TestCase):
+    def test_rule_is_applied_when_text_contains_literal(self):
+        rules = [filter_rule(r'\bx+', 'y', literals=('x',))]
+
+        self.assertEqual(apply_filter_rules('a xx b', rules), 'a y b')
+
+    def test_rule_without_literals_is_always_applied(self):
+        rules = [filter_rule(r'\s+', ' ')]
+
+        self.assertEqual(apply_filter_rules('a \n b', rules), 'a b')
+
+    def test_rule_is_skipped_when_text_does_not_contain_any_literal(self):
+        rules = [filter_rule(r'a', 'b', literals=('c',))]
+
+        self.assertEqual(apply_filter_rules('a', rules), 'a')
+
+    def test_rules_are_applied_in_given_order(self):
+        rules = [
+            filter_rule(r'a', 'b', literals=('a',)),
+            filter_rule(r'b', 'c', literals=('b',)),
+        ]
+
+        self.assertEqual(apply_filter_rules('a', rules), 'c')
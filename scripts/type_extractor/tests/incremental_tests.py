@@ -0,0 +1,132 @@
+"""Units tests for the type_extractor.incremental module."""
+
+import os
+import tempfile
+import unittest
+
+from type_extractor.incremental import get_empty_manifest
+from type_extractor.incremental import get_merge_signature
+from type_extractor.incremental import get_source_headers
+from type_extractor.incremental import load_manifest
+from type_extractor.incremental import save_manifest
+from type_extractor.incremental import update_header_states
+
+
+class IncrementalTestsBase(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+class ManifestTests(IncrementalTestsBase):
+    def test_empty_manifest_is_loaded_when_there_is_no_manifest(self):
+        manifest = load_manifest(os.path.join(self.tmp_dir, 'm.json'), 'v1')
+
+        self.assertEqual(manifest, get_empty_manifest('v1'))
+
+    def test_saved_manifest_is_loaded(self):
+        manifest_file = os.path.join(self.tmp_dir, 'm.json')
+        manifest = get_empty_manifest('v1')
+        manifest['merges']['out.json'] = '0123'
+
+        save_manifest(manifest_file, manifest)
+
+        self.assertEqual(load_manifest(manifest_file, 'v1'), manifest)
+
+    def test_manifest_from_other_extractor_version_is_not_used(self):
+        manifest_file = os.path.join(self.tmp_dir, 'm.json')
+        manifest = get_empty_manifest('v1')
+        manifest['merges']['out.json'] = '0123'
+        save_manifest(manifest_file, manifest)
+
+        self.assertEqual(load_manifest(manifest_file, 'v2'), get_empty_manifest('v2'))
+
+    def test_source_headers_are_forgotten_when_source_path_changes(self):
+        manifest = get_empty_manifest('v1')
+        get_source_headers(manifest, 'include', '/usr/include')['a.h'] = {}
+
+        self.assertEqual(get_source_headers(manifest, 'include', '/usr/include'), {'a.h': {}})
+        self.assertEqual(get_source_headers(manifest, 'include', '/other'), {})
+
+
+class UpdateHeaderStatesTests(IncrementalTestsBase):
+    def test_new_headers_are_changed(self):
+        headers = {'a.h': self.write_file('a.h', 'int a;')}
+        states = {}
+
+        changed, removed = update_header_states(headers, states)
+
+        self.assertEqual(changed, ['a.h'])
+        self.assertEqual(removed, [])
+        self.assertEqual(list(states), ['a.h'])
+
+    def test_unchanged_headers_are_not_changed(self):
+        headers = {'a.h': self.write_file('a.h', 'int a;')}
+        states = {}
+        update_header_states(headers, states)
+
+        changed, removed = update_header_states(headers, states)
+
+        self.assertEqual(changed, [])
+        self.assertEqual(removed, [])
+
+    def test_header_with_new_content_is_changed(self):
+        headers = {'a.h': self.write_file('a.h', 'int a;')}
+        states = {}
+        update_header_states(headers, states)
+        self.write_file('a.h', 'int b, c;')
+
+        changed, _ = update_header_states(headers, states)
+
+        self.assertEqual(changed, ['a.h'])
+
+    def test_touched_header_with_same_content_is_not_changed(self):
+        headers = {'a.h': self.write_file('a.h', 'int a;')}
+        states = {}
+        update_header_states(headers, states)
+        os.utime(headers['a.h'], (1, 1))
+
+        changed, _ = update_header_states(headers, states)
+
+        self.assertEqual(changed, [])
+        self.assertEqual(states['a.h']['mtime'], os.stat(headers['a.h']).st_mtime_ns)
+
+    def test_missing_headers_are_removed(self):
+        headers = {'a.h': self.write_file('a.h', 'int a;')}
+        states = {}
+        update_header_states(headers, states)
+
+        changed, removed = update_header_states({}, states)
+
+        self.assertEqual(changed, [])
+        self.assertEqual(removed, ['a.h'])
+        self.assertEqual(states, {})
+
+
+class GetMergeSignatureTests(IncrementalTestsBase):
+    def test_signature_is_same_for_same_inputs(self):
+        json_files = [(self.tmp_dir, self.write_file('a.json', '{}'))]
+
+        self.assertEqual(
+            get_merge_signature(json_files, 1), get_merge_signature(json_files, 1))
+
+    def test_signature_differs_when_content_differs(self):
+        json_files = [(self.tmp_dir, self.write_file('a.json', '{}'))]
+        signature = get_merge_signature(json_files, 1)
+        self.write_file('a.json', '{"functions": {}}')
+
+        self.assertNotEqual(get_merge_signature(json_files, 1), signature)
+
+    def test_signature_differs_when_order_or_options_differ(self):
+        a = (self.tmp_dir, self.write_file('a.json', '{}'))
+        b = (self.tmp_dir, self.write_file('b.json', '[]'))
+
+        self.assertNotEqual(get_merge_signature([a, b], 1), get_merge_signature([b, a], 1))
+        self.assertNotEqual(get_merge_signature([a, b], 1), get_merge_signature([a, b], 4))
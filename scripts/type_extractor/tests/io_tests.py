@@ -1,12 +1,32 @@
 """Units tests for the type_extractor.io module."""
 
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 from type_extractor.io import JSONHandler
+from type_extractor.io import TypeDatabaseReader
+from type_extractor.io import convert_binary_file_to_json
+from type_extractor.io import convert_json_file_to_binary
 from type_extractor.io import get_output_format_options
+from type_extractor.io import load_binary_file
+from type_extractor.io import json_entry_to_str
+from type_extractor.io import print_json_file
+from type_extractor.io import print_binary_file
+from type_extractor.io import print_json_sections
+from type_extractor.io import print_types_info
+from type_extractor.io import print_types_info_bin
+from type_extractor.io import print_types_info_json
+from type_extractor.io import print_types_info_lti
+from type_extractor.io import print_types_info_txt
+from type_extractor.io import read_names_file
 from type_extractor.io import str_types_sub
 from type_extractor.io import types_functions_to_json
 from type_extractor.io import types_sub
+from type_extractor.parse_includes import get_types_info_from_text
 
 
 class TypesFunctionsToJSONTests(unittest.TestCase):
@@ -41,9 +61,182 @@ class JSONHandlerTests(unittest.TestCase):
         self.assertRaises(TypeError, JSONHandler, a)
 
 
+class PrintJsonFileTests(unittest.TestCase):
+    CONTENT = {
+        'functions': {'f': {'params': [{'name': 'a'}], 'ret_type': 'int'}},
+        'types': {'void': {}, 'int': {'type': 'integral_type'}}
+    }
+
+    def test_output_is_same_as_json_dumps(self):
+        for indent in (None, 1, 4, '\t'):
+            output = io.StringIO()
+
+            print_json_file(output, self.CONTENT, indent)
+
+            self.assertEqual(
+                output.getvalue(),
+                json.dumps(self.CONTENT, indent=indent, sort_keys=True) + '\n'
+            )
+
+    def test_objects_are_converted_by_repr_json(self):
+        class A:
+            def repr_json(self):
+                return {'x': 10}
+        output = io.StringIO()
+
+        print_json_file(output, {'a': A()}, None)
+
+        self.assertEqual(output.getvalue(), '{"a": {"x": 10}}\n')
+
+    def test_indented_output_is_written_while_encoded(self):
+        output = mock.Mock()
+
+        print_json_file(output, self.CONTENT, 4)
+
+        self.assertGreater(len(list(output.writelines.call_args[0][0])), 1)
+
+
+class PrintJsonSectionsTests(unittest.TestCase):
+    def assert_same_as_print_json_file(self, content, indent):
+        expected = io.StringIO()
+        print_json_file(expected, content, indent)
+        output = io.StringIO()
+        sections = [
+            (key, [json_entry_to_str(k, v, indent, 2) for k, v in sorted(entries.items())])
+            for key, entries in sorted(content.items())
+        ]
+        print_json_sections(output, sections, indent)
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_output_is_same_as_from_print_json_file(self):
+        content = {
+            'functions': {'f': {'params': [{'name': 'a'}], 'ret_type': 'int'}},
+            'types': {'int': {'type': 'integral_type'}, 'void': {}}
+        }
+        for indent in (None, 1, 4, '\t'):
+            self.assert_same_as_print_json_file(content, indent)
+
+    def test_output_is_same_as_from_print_json_file_for_empty_sections(self):
+        for indent in (None, 4):
+            self.assert_same_as_print_json_file({'functions': {}, 'types': {}}, indent)
+            self.assert_same_as_print_json_file({}, indent)
+
+
+class BinaryFormatFilesTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def test_json_file_converted_to_binary_and_back_is_same(self):
+        json_file = os.path.join(self.tmp_dir, 'a.json')
+        with open(json_file, 'w') as f:
+            print_json_file(f, PrintJsonFileTests.CONTENT, 4)
+        bin_file = os.path.join(self.tmp_dir, 'a.bin')
+        out_file = os.path.join(self.tmp_dir, 'b.json')
+
+        convert_json_file_to_binary(json_file, bin_file)
+        convert_binary_file_to_json(bin_file, out_file, 4)
+
+        self.assertEqual(load_binary_file(bin_file), PrintJsonFileTests.CONTENT)
+        with open(json_file) as expected, open(out_file) as output:
+            self.assertEqual(output.read(), expected.read())
+
+    def test_binary_output_has_same_content_as_json_output(self):
+        header = 'typedef struct s { int a; } S;\nS *f(const char *p, ...);\n'
+        json_output = io.StringIO()
+        bin_file = os.path.join(self.tmp_dir, 'a.bin')
+
+        print_types_info_json(json_output, *get_types_info_from_text('a.h', header, 'json'))
+        with open(bin_file, 'wb') as f:
+            print_types_info_bin(f, *get_types_info_from_text('a.h', header, 'bin'))
+
+        self.assertEqual(load_binary_file(bin_file), json.loads(json_output.getvalue()))
+
+
+class PrintTypesInfoTests(unittest.TestCase):
+    HEADER = 'typedef struct s { int a; } S;\nS *f(const char *p, ...);\nint g(S s);\n'
+
+    def get_output(self, print_types_info_format, parsed_format):
+        f_out = io.BytesIO() if parsed_format == 'bin' else io.StringIO()
+        print_types_info_format(f_out, *get_types_info_from_text('a.h', self.HEADER, parsed_format))
+        return f_out.getvalue()
+
+    def test_all_formats_from_one_parse_are_same_as_from_separate_parses(self):
+        outputs = [('bin', io.BytesIO()), ('json', io.StringIO()),
+                   ('lti', io.StringIO()), ('txt', io.StringIO())]
+
+        print_types_info(outputs, *get_types_info_from_text('a.h', self.HEADER, 'txt'))
+
+        self.assertEqual(outputs[0][1].getvalue(), self.get_output(print_types_info_bin, 'bin'))
+        self.assertEqual(outputs[1][1].getvalue(), self.get_output(print_types_info_json, 'json'))
+        self.assertEqual(outputs[2][1].getvalue(), self.get_output(print_types_info_lti, 'lti'))
+        self.assertEqual(outputs[3][1].getvalue(), self.get_output(print_types_info_txt, 'txt'))
+
+    def test_txt_output_marks_only_vararg_functions(self):
+        output = self.get_output(print_types_info_txt, 'txt')
+
+        self.assertEqual(output.count('Varargs: True'), 1)
+
+
+class TypeDatabaseReaderTests(unittest.TestCase):
+    CONTENT = {
+        'functions': {
+            'f': {'name': 'f', 'params': [{'name': 'p', 'type': 'ptr_s'}], 'ret_type': 'int'},
+            'g': {'name': 'g', 'params': [], 'ret_type': 'void'},
+        },
+        'types': {
+            'int': {'name': 'int', 'type': 'integral_type'},
+            'ptr_s': {'pointed_type': 's', 'type': 'pointer'},
+            's': {'members': [{'name': 'next', 'type': 'ptr_s'}], 'name': 's',
+                  'type': 'structure'},
+            'void': {'type': 'void'},
+        },
+    }
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        bin_file = os.path.join(tmp_dir.name, 'a.bin')
+        with open(bin_file, 'wb') as f:
+            print_binary_file(f, self.CONTENT)
+        self.reader = TypeDatabaseReader(bin_file)
+        self.addCleanup(self.reader.close)
+
+    def test_function_is_returned_by_name(self):
+        self.assertEqual(self.reader.get_function('g'), self.CONTENT['functions']['g'])
+        self.assertIsNone(self.reader.get_function('h'))
+
+    def test_type_is_returned_by_key(self):
+        self.assertEqual(self.reader.get_type('int'), self.CONTENT['types']['int'])
+        self.assertIsNone(self.reader.get_type('long'))
+
+    def test_function_names_are_sorted(self):
+        self.assertEqual(list(self.reader.get_function_names()), ['f', 'g'])
+
+    def test_functions_are_returned_with_types_they_use(self):
+        content = self.reader.get_functions_with_types(['f'])
+
+        self.assertEqual(content['functions'], {'f': self.CONTENT['functions']['f']})
+        self.assertEqual(sorted(content['types']), ['int', 'ptr_s', 's'])
+
+    def test_missing_function_raise_error(self):
+        with self.assertRaises(KeyError):
+            self.reader.get_functions_with_types(['h'])
+
+
+class ReadNamesFileTests(unittest.TestCase):
+    def test_names_are_read_without_empty_and_comment_lines(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('# functions\nf\n\n  g  \n')
+        self.addCleanup(os.remove, f.name)
+
+        self.assertEqual(read_names_file(f.name), ['f', 'g'])
+
+
 class GetOutputFormatOptionsTests(unittest.TestCase):
     def test_output_format_options(self):
-        self.assertEqual(get_output_format_options(), ['txt', 'lti', 'json'])
+        self.assertEqual(get_output_format_options(), ['txt', 'lti', 'json', 'bin'])
 
 
 class TypeSubTests(unittest.TestCase):
@@ -0,0 +1,35 @@
+"""Helpers shared by tests working with json types and json files."""
+
+import json
+import os
+import tempfile
+
+from type_extractor.merge_files import merge_json_file
+
+
+def typedef(name, typedefed_type):
+    return {'name': name, 'type': 'typedef', 'typedefed_type': typedefed_type}
+
+
+class JsonFilesMixin(object):
+    """Writes json files of a test to a temporary directory."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.json_files = []
+
+    def add_json_file(self, functions, types):
+        json_file = os.path.join(self.tmp_dir, '{}.json'.format(len(self.json_files)))
+        with open(json_file, 'w') as f:
+            json.dump({'functions': functions, 'types': types}, f)
+        self.json_files.append(json_file)
+
+    def merge_one_by_one(self):
+        """Merges json files with merge_json_file(), returns types and functions."""
+        merged_types = {}
+        merged_functions = {}
+        for json_file in self.json_files:
+            merge_json_file(merged_types, merged_functions, json_file)
+        return merged_types, merged_functions
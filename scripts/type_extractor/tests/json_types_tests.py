@@ -1,11 +1,14 @@
 """Units tests for the type_extractor.json_types module."""
 
 import unittest
+from unittest import mock
 
 from type_extractor.func_info import FuncInfo
 from type_extractor.json_types import ArrayType
 from type_extractor.json_types import EnumType
+from type_extractor.json_types import PARSED_TYPES_CACHE
 from type_extractor.json_types import FunctionType
+from type_extractor.json_types import ParsedTypesCache
 from type_extractor.json_types import PointerType
 from type_extractor.json_types import PrimitiveType
 from type_extractor.json_types import QualifierType
@@ -25,6 +28,7 @@ from type_extractor.json_types import parse_struct_to_type_for_json
 from type_extractor.json_types import parse_type_to_type_for_json
 from type_extractor.json_types import parse_typedef_to_type_for_json
 from type_extractor.json_types import parse_union_to_type_for_json
+from type_extractor.json_types import set_key_scheme
 from type_extractor.json_types import valid_typedef_name
 from type_extractor.params_info import Param
 from type_extractor.parse_enums import Enum
@@ -46,6 +50,35 @@ class TypesTests(unittest.TestCase):
             {'type': 'integral_type', 'name': 'int'}
         )
 
+    def test_repr_json_returns_optional_attributes_only_when_set(self):
+        self.assertEqual(
+            PrimitiveType('int32_t', 32).repr_json(),
+            {'type': 'integral_type', 'name': 'int32_t', 'bit_width': 32}
+        )
+        self.assertNotIn('vararg', FunctionType(VoidType()).repr_json())
+
+    def test_type_hash_is_computed_only_once(self):
+        t = FunctionType(VoidType(), [Param('a', 'int')], True)
+
+        with mock.patch.object(
+                FunctionType, 'get_type_hash', return_value='h') as get_type_hash:
+            t.type_hash
+            t.type_hash
+
+        get_type_hash.assert_called_once_with()
+
+    def test_type_hash_is_computed_again_after_attribute_change(self):
+        t = TypedefedType('a')
+        old_hash = t.type_hash
+
+        t.name = 'b'
+
+        self.assertNotEqual(t.type_hash, old_hash)
+        self.assertEqual(t.type_hash, TypedefedType('b').type_hash)
+
+    def test_types_have_no_dict(self):
+        self.assertFalse(hasattr(StructType('s'), '__dict__'))
+
     def test_primitive_type_correct_string_repr(self):
         self.assertEqual(
             PrimitiveType('int').__repr__(),
@@ -870,6 +903,73 @@ class ParseTypesToTypesForJsonTests(unittest.TestCase):
         self.assertEqual(types, expected)
 
 
+class ParsedTypesCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = ParsedTypesCache()
+
+    def test_repeated_type_text_is_parsed_from_cache(self):
+        self.cache.parse('const char *', {})
+        self.cache.parse('const char *', {})
+
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_types_added_while_parsing_are_added_again_from_cache(self):
+        expected = {}
+        t = parse_type_to_type_for_json('int (*)(const char *, ...)', expected)
+        self.cache.parse('int (*)(const char *, ...)', {})
+        types = {}
+
+        self.assertEqual(self.cache.parse('int (*)(const char *, ...)', types), t)
+        self.assertEqual(types, expected)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_existing_types_are_not_replaced(self):
+        typedef = TypedefedType('DWORD', PrimitiveType('int'))
+        types = {typedef.type_hash: typedef}
+
+        self.cache.parse('DWORD *', types)
+
+        self.assertIs(types[typedef.type_hash], typedef)
+
+    def test_different_texts_are_cached_separately(self):
+        self.assertEqual(self.cache.parse('int', {}), PrimitiveType('int'))
+        self.assertEqual(self.cache.parse('int *', {}), PointerType(PrimitiveType('int')))
+        self.assertEqual(self.cache.misses, 2)
+
+
+class KeySchemesTests(unittest.TestCase):
+    def tearDown(self):
+        set_key_scheme('sha1')
+
+    def test_sha1_is_default_scheme(self):
+        self.assertEqual(
+            PrimitiveType('int').type_hash, '46f8ab7c0cff9df7cd124852e26022a6bf89e315'
+        )
+
+    def test_blake2b_64_key_is_16_hex_digits(self):
+        set_key_scheme('blake2b-64')
+
+        self.assertRegex(PrimitiveType('int').type_hash, r'^[0-9a-f]{16}$')
+
+    def test_structural_id_of_short_type_is_its_description(self):
+        set_key_scheme('structural-id')
+
+        self.assertEqual(PointerType(PrimitiveType('int')).type_hash, 'pointerint')
+
+    def test_structural_id_of_long_type_is_its_hash(self):
+        set_key_scheme('structural-id')
+
+        self.assertRegex(TypedefedType('a' * 40).type_hash, r'^#[0-9a-f]{16}$')
+
+    def test_setting_scheme_clears_parsed_types_cache(self):
+        parse_type_to_type_for_json('const char *', {})
+
+        set_key_scheme('blake2b-64')
+
+        self.assertEqual(PARSED_TYPES_CACHE.entries, {})
+
+
 class ValidTypedefNameTests(unittest.TestCase):
     def test_name_starting_with_underscore_is_valid(self):
         self.assertTrue(valid_typedef_name('_xyz'))
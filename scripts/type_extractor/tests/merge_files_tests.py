@@ -3,9 +3,12 @@
 import json
 import unittest
 
+from json_fixtures import typedef
+from type_extractor.merge_files import TypedefChainRoots
 from type_extractor.merge_files import choose_one_type
 from type_extractor.merge_files import merge_functions
 from type_extractor.merge_files import merge_types
+from type_extractor.merge_files import typedef_loops_with_already_inserted_typedefs
 
 
 class ChooseOneTypeTests(unittest.TestCase):
@@ -117,3 +120,50 @@ class MergeTypesTests(unittest.TestCase):
             merged[A_index]['typedefed_type'] == 'unknown' or
             merged[B_index]['typedefed_type'] == 'unknown'
         )
+
+    def test_typedef_loop_is_found_with_roots_kept_between_merges(self):
+        merged = {}
+        chain_roots = TypedefChainRoots(merged)
+
+        merge_types(merged, {'A': typedef('A', 'unknown'), 'B': typedef('B', 'A')}, chain_roots)
+        merge_types(merged, {'C': typedef('C', 'B')}, chain_roots)
+        merge_types(merged, {'A': typedef('A', 'C')}, chain_roots)
+
+        self.assertEqual(merged['A'], typedef('A', 'unknown'))
+
+
+class TypedefChainRootsTests(unittest.TestCase):
+    def test_chain_ends_in_first_type_that_is_not_known_typedef(self):
+        types = {
+            'A': typedef('A', 'B'), 'B': typedef('B', 's'), 's': {'type': 'structure'},
+            'C': typedef('C', 'D'), 'D': typedef('D', 'unknown'), 'E': typedef('E', 'x'),
+        }
+        chain_roots = TypedefChainRoots(types)
+
+        self.assertEqual(chain_roots.find('A'), 's')
+        self.assertEqual(chain_roots.find('C'), 'D')
+        self.assertEqual(chain_roots.find('E'), 'x')
+        self.assertEqual(chain_roots.find('x'), 'x')
+
+    def test_chain_is_followed_from_cached_end_when_it_grows(self):
+        types = {'A': typedef('A', 'B'), 'B': typedef('B', 'unknown')}
+        chain_roots = TypedefChainRoots(types)
+        chain_roots.find('A')
+
+        types['B'] = typedef('B', 'C')
+        types['C'] = typedef('C', 'D')
+
+        self.assertEqual(chain_roots.find('A'), 'D')
+        self.assertEqual(chain_roots.shortcuts['A'], 'D')
+
+    def test_looping_chain_ends_before_visiting_type_again(self):
+        types = {'A': typedef('A', 'B'), 'B': typedef('B', 'A')}
+
+        self.assertEqual(TypedefChainRoots(types).find('A'), 'B')
+
+    def test_loop_check_terminates_on_loop_already_in_merged_types(self):
+        merged = {'A': typedef('A', 'B'), 'B': typedef('B', 'A')}
+
+        self.assertFalse(
+            typedef_loops_with_already_inserted_typedefs(typedef('C', 'A'), merged)
+        )
@@ -0,0 +1,73 @@
+"""Unit tests for the optimize_types module."""
+
+import copy
+import unittest
+
+from type_extractor.optimize_types import get_qualified_type
+from type_extractor.optimize_types import optimize_json_types
+from type_extractor.remove_json_types import remove_qualifier_json_types
+from type_extractor.substitute_json_keys import substitute_json_keys_with_natural_numbers
+
+CONTENT = {
+    'functions': {
+        'f': {'decl': 'const int *f(const int a, s b);', 'name': 'f',
+              'params': [{'name': 'a', 'type': 'ci'}, {'name': 'b', 'type': 'S'}],
+              'ret_type': 'p'},
+    },
+    'types': {
+        'i': {'name': 'int', 'type': 'integral_type'},
+        'ci': {'modified_type': 'i', 'qualifier': 'const', 'type': 'qualifier'},
+        'vci': {'modified_type': 'ci', 'qualifier': 'volatile', 'type': 'qualifier'},
+        'p': {'pointed_type': 'vci', 'type': 'pointer'},
+        'a': {'dimensions': [2], 'element_type': 'ci', 'type': 'array'},
+        's': {'members': [{'name': 'm', 'type': 'a'}, {'name': 'n', 'type': 'vci'}],
+              'name': 's', 'type': 'structure'},
+        'S': {'name': 'S', 'type': 'typedef', 'typedefed_type': 's'},
+        'U': {'name': 'U', 'type': 'typedef', 'typedefed_type': 'unknown'},
+        'ft': {'params': [{'name': '', 'type': 'vci'}], 'ret_type': 'ci',
+               'type': 'function'},
+    },
+}
+
+
+class OptimizeJsonTypesTests(unittest.TestCase):
+    def test_result_is_same_as_from_substituting_keys_and_removing_qualifiers(self):
+        content = copy.deepcopy(CONTENT)
+        expected = copy.deepcopy(CONTENT)
+        substitute_json_keys_with_natural_numbers(expected)
+        remove_qualifier_json_types(expected)
+
+        optimize_json_types(content)
+
+        self.assertEqual(content, expected)
+
+    def test_references_to_qualifiers_lead_to_qualified_types(self):
+        content = copy.deepcopy(CONTENT)
+
+        optimize_json_types(content)
+
+        types = content['types']
+        int_key = content['functions']['f']['params'][0]['type']
+        self.assertEqual(types[int_key], {'name': 'int', 'type': 'integral_type'})
+        self.assertEqual(types[content['functions']['f']['ret_type']]['pointed_type'], int_key)
+        self.assertNotIn('qualifier', [t['type'] for t in types.values()])
+
+    def test_unknown_typedefed_type_is_kept(self):
+        content = copy.deepcopy(CONTENT)
+
+        optimize_json_types(content)
+
+        self.assertIn(
+            {'name': 'U', 'type': 'typedef', 'typedefed_type': 'unknown'},
+            content['types'].values()
+        )
+
+
+class GetQualifiedTypeTests(unittest.TestCase):
+    def test_chain_of_qualifiers_is_followed_to_non_qualifier_type(self):
+        types = CONTENT['types']
+
+        self.assertEqual(get_qualified_type(types['vci'], types), 'i')
+
+    def test_missing_modified_type_is_returned(self):
+        self.assertEqual(get_qualified_type({'modified_type': 'x'}, {}), 'x')
@@ -0,0 +1,67 @@
+"""Units tests for the type_extractor.parallel_merge module."""
+
+import unittest
+
+from json_fixtures import JsonFilesMixin
+from json_fixtures import typedef
+from type_extractor.parallel_merge import merge_json_files_parallel
+from type_extractor.parallel_merge import merge_json_files_part
+from type_extractor.parallel_merge import merge_parts
+from type_extractor.parallel_merge import merge_typedefs
+from type_extractor.parallel_merge import split_to_parts
+
+
+STRUCT_S_DECL = {'members': [], 'name': 's', 'type': 'structure'}
+STRUCT_S = {'members': [{'name': 'a', 'type': 'int'}], 'name': 's', 'type': 'structure'}
+FUNC_F1 = {'decl': 'int f(void);', 'header': 'a.h', 'name': 'f', 'params': [], 'ret_type': 'int'}
+FUNC_F2 = {'decl': 'int f(void);', 'header': 'b.h', 'name': 'f', 'params': [], 'ret_type': 'int'}
+
+
+class MergeJsonFilesParallelTests(JsonFilesMixin, unittest.TestCase):
+    def add_files_with_typedefs_depending_on_order(self):
+        # Merging the last two files as one part would make B and A a loop.
+        self.add_json_file({}, {'B': typedef('B', 'A')})
+        self.add_json_file({}, {'A': typedef('A', 'unknown')})
+        self.add_json_file({}, {'C': typedef('C', 'B'), 'A': typedef('A', 'B')})
+        self.add_json_file({}, {'B': typedef('B', 'A'), 'C': typedef('C', 'A')})
+
+    def test_result_is_same_as_from_merging_files_one_by_one(self):
+        self.add_json_file({'f': FUNC_F1}, {'s': STRUCT_S_DECL, 'T': typedef('T', 'unknown')})
+        self.add_json_file({'f': FUNC_F2}, {'s': STRUCT_S, 'T': typedef('T', 's')})
+        self.add_json_file({}, {'s': STRUCT_S_DECL, 'U': typedef('U', 'T')})
+
+        for jobs in (2, 3):
+            self.assertEqual(
+                merge_json_files_parallel(self.json_files, jobs), self.merge_one_by_one()
+            )
+
+    def test_typedefs_are_chosen_in_order_of_files(self):
+        self.add_files_with_typedefs_depending_on_order()
+
+        types, _ = merge_json_files_parallel(self.json_files, 4)
+
+        self.assertEqual(types, self.merge_one_by_one()[0])
+        self.assertEqual(types['A'], typedef('A', 'unknown'))
+
+    def test_merge_parts_keeps_typedefs_of_both_parts_in_order(self):
+        self.add_files_with_typedefs_depending_on_order()
+
+        types, _, typedefs = merge_parts((
+            merge_json_files_part(self.json_files[:1]),
+            merge_json_files_part(self.json_files[1:])
+        ))
+
+        self.assertEqual(types['A'], typedef('A', 'B'))
+        self.assertEqual(merge_typedefs(typedefs)['A'], typedef('A', 'unknown'))
+        self.assertEqual(len(typedefs), 6)
+
+
+class SplitToPartsTests(unittest.TestCase):
+    def test_parts_are_consecutive_and_of_similar_length(self):
+        self.assertEqual(split_to_parts([1, 2, 3, 4, 5], 3), [[1, 2], [3, 4], [5]])
+
+    def test_there_are_no_empty_parts(self):
+        self.assertEqual(split_to_parts([1, 2], 4), [[1], [2]])
+
+    def test_no_items_give_one_empty_part(self):
+        self.assertEqual(split_to_parts([], 2), [[]])
@@ -1,11 +1,14 @@
 """Units tests for the type_extractor.params_info module."""
 
+import random
 import unittest
 
 from type_extractor.params_info import Param
 from type_extractor.params_info import parse_func_parameters
 from type_extractor.params_info import parse_one_param
 from type_extractor.params_info import split_param_to_type_and_name
+from type_extractor.params_info import split_params
+from type_extractor.params_info import split_params_by_chars
 
 
 class ParamNoAttributesSetTestReturnValueTests(unittest.TestCase):
@@ -288,3 +291,24 @@ class SplitParameterWithIdentifierToTypeAndNameTests(unittest.TestCase):
 
     def test_parse_func_as_param_correctly(self):
         self.assertEqual(parse_one_param('int f(int a)'), Param('f', 'int (int a)'))
+
+
+class SplitParamsTests(unittest.TestCase):
+    def test_commas_in_parentheses_do_not_split_params(self):
+        self.assertEqual(
+            split_params(' int a, void (*f)(int, char) , char c'),
+            ['int a', 'void (*f)(int, char)', 'char c']
+        )
+
+    def test_params_without_parentheses_are_split_at_all_commas(self):
+        self.assertEqual(split_params('int, char *p,'), ['int', 'char *p', ''])
+
+    def test_last_param_in_unbalanced_parentheses_is_dropped(self):
+        self.assertEqual(split_params('int a, f(b'), ['int a'])
+        self.assertEqual(split_params(')'), [])
+
+    def test_result_is_same_as_from_reference_implementation(self):
+        rand = random.Random(0)
+        for _ in range(2000):
+            s = ''.join(rand.choice('a (),\t;') for _ in range(rand.randint(0, 12)))
+            self.assertEqual(split_params(s), split_params_by_chars(s), repr(s))
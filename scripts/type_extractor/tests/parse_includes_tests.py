@@ -7,6 +7,7 @@ from type_extractor.params_info import Param
 from type_extractor.parse_enums import Enum
 from type_extractor.parse_enums import EnumItem
 from type_extractor.parse_includes import get_types_info_from_text
+from type_extractor.parse_includes import iter_typedef_declarators
 from type_extractor.parse_includes import parse_all_enums
 from type_extractor.parse_includes import parse_all_functions
 from type_extractor.parse_includes import parse_typedefs
@@ -48,6 +49,25 @@ class ParseTypedefsTests(unittest.TestCase):
         self.assertEqual(parse_typedefs('typedef void (* ptr);'),
                          [Param('ptr', 'void *')])
 
+    def test_typedefs_are_parsed_in_order_of_declarators(self):
+        self.assertEqual(
+            parse_typedefs('typedef int A, * PA; typedef char C;'),
+            [Param('A', 'int'), Param('PA', 'int *'), Param('C', 'char')]
+        )
+
+
+class IterTypedefDeclaratorsTests(unittest.TestCase):
+    def test_type_of_first_declarator_is_used_for_next_declarators(self):
+        self.assertEqual(
+            list(iter_typedef_declarators('typedef unsigned long UL, *PUL, (*PF)(int);')),
+            ['unsigned long UL', 'unsigned long *PUL', 'unsigned long (*PF)(int)']
+        )
+
+    def test_declarators_are_yielded_lazily(self):
+        declarators = iter_typedef_declarators('typedef int A; typedef int B;')
+
+        self.assertEqual(next(declarators), 'int A')
+
 
 class ParseAllEnumsTests(unittest.TestCase):
     def test_parse_all_enums_from_text(self):
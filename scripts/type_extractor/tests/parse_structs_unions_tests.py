@@ -1,14 +1,18 @@
 """Units tests for the type_extractor.parse_structs_unions module."""
 
+import random
 import unittest
 
 from type_extractor.params_info import Param
 from type_extractor.parse_structs_unions import Struct
 from type_extractor.parse_structs_unions import Union
 from type_extractor.parse_structs_unions import get_all_structs
+from type_extractor.parse_structs_unions import get_all_structs_and_unions
 from type_extractor.parse_structs_unions import get_all_unions
 from type_extractor.parse_structs_unions import parse_struct
 from type_extractor.parse_structs_unions import parse_union
+from type_extractor.parse_structs_unions import split_members
+from type_extractor.parse_structs_unions import split_members_by_chars
 
 
 class GetAllStructsTests(unittest.TestCase):
@@ -43,6 +47,78 @@ class GetAllStructsTests(unittest.TestCase):
 
         self.assertEqual(structs, expected)
 
+    def test_struct_with_many_nested_structs_is_not_truncated(self):
+        members = ' '.join('struct { int a; } m%d;' % i for i in range(30))
+        text = 'typedef struct x { %s } X; int f(void);' % members
+
+        text, structs = get_all_structs(text)
+
+        self.assertEqual(structs, ['typedef struct x { %s } X;' % members])
+        self.assertEqual(text, '; int f(void);')
+
+    def test_struct_continues_when_closing_bracket_is_not_followed_by_names(self):
+        text = 'struct x { int a; } arr[2]; struct y { int b; } y;'
+        expected = ['struct x { int a; } arr[2]; struct y { int b; } y;']
+
+        text, structs = get_all_structs(text)
+
+        self.assertEqual(structs, expected)
+
+    def test_text_without_structs_is_returned(self):
+        text = 'int a; typedef struct x { int a; } X; int b; struct y {int c;};'
+
+        text, structs = get_all_structs(text)
+
+        self.assertEqual(text, 'int a; ; int b; ;')
+
+
+class GetAllStructsAndUnionsTests(unittest.TestCase):
+    def test_structs_and_unions_are_found_in_one_pass(self):
+        text = 'struct s { int a; }; union u { int b; }; int f(void);'
+
+        text, structs, unions = get_all_structs_and_unions(text)
+
+        self.assertEqual(structs, ['struct s { int a; };'])
+        self.assertEqual(unions, ['union u { int b; };'])
+        self.assertEqual(text, '; union u { int b; }; int f(void);')
+
+    def test_unions_inside_structs_are_found(self):
+        text = 'struct s { union u { int b; } x; };'
+
+        text, structs, unions = get_all_structs_and_unions(text)
+
+        self.assertEqual(structs, ['struct s { union u { int b; } x; };'])
+        self.assertEqual(unions, ['union u { int b; } x;'])
+
+    def test_structs_inside_unions_are_found(self):
+        text = 'union u { struct s { int b; } x; };'
+
+        text, structs, unions = get_all_structs_and_unions(text)
+
+        self.assertEqual(structs, ['struct s { int b; } x;'])
+        self.assertEqual(unions, ['union u { struct s { int b; } x; };'])
+        self.assertEqual(text, 'union u { ; };')
+
+    def test_search_for_kind_stops_at_first_definition_without_end(self):
+        text = ('struct s { int a; void g() { } int f(void); '
+                'struct t { int b; }; union u { int c; };')
+
+        text, structs, unions = get_all_structs_and_unions(text)
+
+        self.assertEqual(structs, [])
+        self.assertEqual(unions, ['union u { int c; };'])
+        self.assertEqual(
+            text, 'struct s { int a; void g() { } int f(void); '
+                  'struct t { int b; }; union u { int c; };')
+
+    def test_cpp_templates_are_skipped(self):
+        text = 'struct s { A<int> a; }; struct t { int b; };'
+
+        text, structs, unions = get_all_structs_and_unions(text)
+
+        self.assertEqual(structs, ['struct t { int b; };'])
+        self.assertEqual(text, '; ;')
+
 
 class StructTests(unittest.TestCase):
     def setUp(self):
@@ -228,3 +304,21 @@ class ParseUnionTests(unittest.TestCase):
             parse_union('struct x { int x; char * data; };', 'file'),
             Union('x', '', [Param('x', 'int'), Param('data', 'char *')], 'file')
         )
+
+
+class SplitMembersTests(unittest.TestCase):
+    def test_semicolons_in_braces_do_not_split_members(self):
+        self.assertEqual(
+            split_members(' int a; struct { int b; char c; } s; char d;'),
+            ['int a', 'struct { int b; char c; } s', 'char d']
+        )
+
+    def test_text_after_last_semicolon_is_not_member(self):
+        self.assertEqual(split_members('int a; int b'), ['int a'])
+        self.assertEqual(split_members('int a; struct { int b; } c'), ['int a'])
+
+    def test_result_is_same_as_from_reference_implementation(self):
+        rand = random.Random(0)
+        for _ in range(2000):
+            s = ''.join(rand.choice('a {};\n,') for _ in range(rand.randint(0, 12)))
+            self.assertEqual(split_members(s), split_members_by_chars(s), repr(s))
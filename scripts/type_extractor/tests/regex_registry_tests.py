@@ -0,0 +1,112 @@
+"""Unit tests for the regex_registry module."""
+
+import re
+import unittest
+import unittest.mock
+
+from type_extractor.regex_registry import REGEXES
+from type_extractor.regex_registry import format_regex_profile
+from type_extractor.regex_registry import get_formatted_regex
+from type_extractor.regex_registry import get_regex
+from type_extractor.regex_registry import get_regex_profile
+from type_extractor.regex_registry import merge_regex_profiles
+from type_extractor.regex_registry import reset_regex_profile
+from type_extractor.regex_registry import set_regex_profiling
+
+
+class GetRegexTests(unittest.TestCase):
+    def test_same_pattern_is_compiled_once(self):
+        self.assertIs(get_regex(r'a+b'), get_regex(r'a+b'))
+
+    def test_pattern_with_other_flags_is_other_regex(self):
+        self.assertIsNot(get_regex(r'a+b'), get_regex(r'a+b', re.I))
+        self.assertIsNotNone(get_regex(r'a+b', re.I).search('AAB'))
+
+    def test_regex_has_methods_of_compiled_pattern(self):
+        regex = get_regex(r'(\w)(\d)')
+        self.assertEqual(regex.search('-a1').group(2), '1')
+        self.assertIsNone(regex.match('-a1'))
+        self.assertIsNotNone(regex.fullmatch('a1'))
+        self.assertEqual(regex.findall('a1 b2'), [('a', '1'), ('b', '2')])
+        self.assertEqual([m.start() for m in regex.finditer('a1 b2')], [0, 3])
+        self.assertEqual(regex.sub(r'\2\1', 'a1 b2', 1), '1a b2')
+        self.assertEqual(regex.subn('', 'a1 b2'), (' ', 2))
+        self.assertEqual(regex.split('xa1y'), ['x', 'a', '1', 'y'])
+
+    def test_formatted_regex_is_not_registered(self):
+        regex = get_formatted_regex(r'\b{}\b', 'not_registered_name')
+        self.assertIsNotNone(regex.search('a not_registered_name'))
+        self.assertFalse(any('not_registered_name' in p for p, _ in REGEXES))
+
+
+class RegexProfilingTests(unittest.TestCase):
+    def setUp(self):
+        set_regex_profiling(True)
+        reset_regex_profile()
+
+    def tearDown(self):
+        set_regex_profiling(False)
+        reset_regex_profile()
+
+    def test_calls_of_regexes_are_counted(self):
+        regex = get_regex(r'profiled\d')
+        regex.search('profiled1')
+        regex.sub('', 'profiled2')
+        self.assertEqual(len(list(regex.finditer('profiled3 profiled4'))), 2)
+        self.assertEqual(get_regex_profile()[r'profiled\d'][0], 3)
+
+    def test_regex_registered_before_enabling_profiling_is_profiled(self):
+        set_regex_profiling(False)
+        regex = get_regex(r'registered before')
+        set_regex_profiling(True)
+        regex.search('registered before')
+        self.assertEqual(get_regex_profile()[r'registered before'][0], 1)
+
+    def test_formatted_regexes_are_counted_under_template(self):
+        for name in ('first', 'second'):
+            get_formatted_regex(r'^{}\d', name).search(name + '1')
+        self.assertEqual(get_regex_profile(), {r'^{}\d': [2, unittest.mock.ANY]})
+        self.assertFalse(any(p.startswith(('^first', '^second')) for p, _ in REGEXES))
+
+    def test_reset_clears_profile(self):
+        get_regex(r'reset').search('reset')
+        reset_regex_profile()
+        self.assertEqual(get_regex_profile(), {})
+
+    def test_regexes_are_not_counted_when_profiling_is_disabled(self):
+        set_regex_profiling(False)
+        get_regex(r'not profiled').search('not profiled')
+        self.assertEqual(get_regex_profile(), {})
+
+
+class MergeRegexProfilesTests(unittest.TestCase):
+    def test_calls_and_times_of_same_patterns_are_summed(self):
+        merged = merge_regex_profiles([
+            {'a': [1, 0.5], 'b': [2, 1.0]},
+            {'a': [3, 0.25]},
+        ])
+        self.assertEqual(merged, {'a': [4, 0.75], 'b': [2, 1.0]})
+
+    def test_merging_no_profiles_returns_empty_profile(self):
+        self.assertEqual(merge_regex_profiles([]), {})
+
+
+class FormatRegexProfileTests(unittest.TestCase):
+    def test_top_patterns_are_sorted_by_time(self):
+        report = format_regex_profile(
+            {'fast': [10, 0.001], 'slow': [1, 2.0], 'middle': [5, 0.5]}, top=2)
+        lines = report.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].endswith('slow'))
+        self.assertTrue(lines[2].endswith('middle'))
+
+    def test_long_verbose_pattern_is_shown_on_one_shortened_line(self):
+        report = format_regex_profile({'(\n    a\n  | b\n)' + 'c' * 10: [1, 1.0]}, width=12)
+        self.assertTrue(report.splitlines()[1].endswith('  ( a | b )...'))
+
+    def test_empty_profile_gives_only_header(self):
+        self.assertEqual(len(format_regex_profile({}).splitlines()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 """Units tests for the type_extractor.remove_json_types module."""
 
+import sys
 import unittest
 
+from type_extractor.remove_json_types import add_types_to_new_types
+from type_extractor.remove_json_types import get_referenced_types
 from type_extractor.remove_json_types import remove_qualifier_json_types
 from type_extractor.remove_json_types import remove_unused_json_types
+from type_extractor.remove_json_types import select_functions
 
 
 class RemoveUnusedJsonTypesTests(unittest.TestCase):
@@ -268,6 +272,71 @@ class RemoveUnusedJsonTypesTests(unittest.TestCase):
         self.assertEqual(remove_unused_json_types(functions, types), types)
 
 
+class AddTypesToNewTypesTests(unittest.TestCase):
+    def test_types_pointing_to_each_other_are_added_once(self):
+        types = {
+            'ptr_s': {'pointed_type': 's', 'type': 'pointer'},
+            's': {'members': [{'name': 'next', 'type': 'ptr_s'}], 'type': 'structure'},
+        }
+        requested = []
+
+        def get_type(type_key):
+            requested.append(type_key)
+            return types[type_key]
+        new_types = {}
+        add_types_to_new_types(['s'], get_type, new_types)
+
+        self.assertEqual(new_types, types)
+        self.assertEqual(sorted(requested), ['ptr_s', 's'])
+
+    def test_types_already_in_new_types_are_not_followed(self):
+        new_types = {'ptr_s': {'pointed_type': 's', 'type': 'pointer'}}
+
+        add_types_to_new_types(['ptr_s'], {}.__getitem__, new_types)
+
+        self.assertEqual(list(new_types), ['ptr_s'])
+
+
+class RemoveUnusedJsonTypesDeepChainsTests(unittest.TestCase):
+    def test_long_chain_of_types_does_not_hit_recursion_limit(self):
+        types = {'0': {'type': 'integral_type', 'name': 'int'}}
+        for i in range(1, 10 * sys.getrecursionlimit()):
+            types[str(i)] = {'type': 'pointer', 'pointed_type': str(i - 1)}
+        last = str(len(types) - 1)
+        functions = {'f': {'params': [], 'ret_type': last}}
+
+        self.assertEqual(len(remove_unused_json_types(functions, types)), len(types))
+
+
+class SelectFunctionsTests(unittest.TestCase):
+    def test_only_functions_with_given_names_are_selected(self):
+        functions = {'f': {'name': 'f'}, 'g': {'name': 'g'}}
+
+        self.assertEqual(select_functions(functions, ['g', 'h']), {'g': {'name': 'g'}})
+
+
+class GetReferencedTypesTests(unittest.TestCase):
+    def test_referenced_types_of_all_kinds_of_types(self):
+        self.assertEqual(get_referenced_types({'type': 'array', 'element_type': 'e'}), ['e'])
+        self.assertEqual(
+            get_referenced_types(
+                {'type': 'function', 'ret_type': 'r', 'params': [{'type': 'p'}]}),
+            ['r', 'p']
+        )
+        self.assertEqual(get_referenced_types({'type': 'pointer', 'pointed_type': 'p'}), ['p'])
+        self.assertEqual(get_referenced_types({'type': 'qualifier', 'modified_type': 'm'}), ['m'])
+        self.assertEqual(
+            get_referenced_types({'type': 'union', 'members': [{'type': 'a'}, {'type': 'b'}]}),
+            ['a', 'b']
+        )
+        self.assertEqual(get_referenced_types({'type': 'typedef', 'typedefed_type': 't'}), ['t'])
+
+    def test_unknown_typedefed_type_and_terminal_types_reference_nothing(self):
+        self.assertEqual(
+            get_referenced_types({'type': 'typedef', 'typedefed_type': 'unknown'}), [])
+        self.assertEqual(get_referenced_types({'type': 'integral_type'}), [])
+
+
 class RemoveQualifierTypesTests(unittest.TestCase):
     def test_remove_qualifier_types_from_function(self):
         json = {
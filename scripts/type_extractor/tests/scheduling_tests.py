@@ -0,0 +1,90 @@
+"""Units tests for the type_extractor.scheduling module."""
+
+import os
+import tempfile
+import unittest
+
+from type_extractor.scheduling import estimate_costs
+from type_extractor.scheduling import format_timings_summary
+from type_extractor.scheduling import get_chunks
+from type_extractor.scheduling import get_file_sizes
+from type_extractor.scheduling import get_jobs_count
+
+
+class GetJobsCountTests(unittest.TestCase):
+    def test_given_jobs_count_is_returned(self):
+        self.assertEqual(get_jobs_count(3), 3)
+
+    def test_all_cpus_are_used_when_jobs_are_not_given(self):
+        self.assertEqual(get_jobs_count(None), os.cpu_count() or 1)
+
+
+class GetFileSizesTests(unittest.TestCase):
+    def test_sizes_of_files_are_returned(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            f = os.path.join(tmp_dir, 'a.h')
+            with open(f, 'w') as out:
+                out.write('int a;')
+
+            self.assertEqual(get_file_sizes([f, os.path.join(tmp_dir, 'b.h')]), [6, 0])
+
+
+class EstimateCostsTests(unittest.TestCase):
+    def test_sizes_are_costs_without_timings(self):
+        self.assertEqual(estimate_costs(['a', 'b'], [10, 20]), [10, 20])
+
+    def test_known_timings_are_used(self):
+        self.assertEqual(
+            estimate_costs(['a', 'b'], [10, 20], {'a': 0.5, 'b': 0.25}), [0.5, 0.25])
+
+    def test_unknown_timings_are_estimated_from_sizes(self):
+        self.assertEqual(
+            estimate_costs(['a', 'b', 'c'], [10, 30, 20], {'a': 1.0, 'b': 3.0}),
+            [1.0, 3.0, 2.0]
+        )
+
+
+class GetChunksTests(unittest.TestCase):
+    def test_no_chunks_for_no_items(self):
+        self.assertEqual(get_chunks([], [], 4), [])
+
+    def test_items_are_ordered_from_the_most_costly(self):
+        self.assertEqual(
+            get_chunks(['a', 'b', 'c'], [1, 3, 2], 1, chunksize=1),
+            [['b'], ['c'], ['a']]
+        )
+
+    def test_items_with_same_cost_keep_their_order(self):
+        self.assertEqual(
+            get_chunks(['a', 'b', 'c'], [1, 1, 1], 1, chunksize=1),
+            [['a'], ['b'], ['c']]
+        )
+
+    def test_given_chunksize_is_used(self):
+        self.assertEqual(
+            get_chunks(['a', 'b', 'c'], [1, 3, 2], 1, chunksize=2),
+            [['b', 'c'], ['a']]
+        )
+
+    def test_costly_items_are_alone_and_small_ones_are_grouped(self):
+        items = ['big1', 'big2'] + ['small%d' % i for i in range(16)]
+        costs = [40, 40] + [5] * 16
+
+        chunks = get_chunks(items, costs, 2)
+
+        self.assertEqual(chunks[:2], [['big1'], ['big2']])
+        self.assertEqual(len(chunks), 6)
+        self.assertTrue(all(len(chunk) == 4 for chunk in chunks[2:]))
+
+
+class FormatTimingsSummaryTests(unittest.TestCase):
+    def test_summary_contains_totals_and_slowest_files(self):
+        summary = format_timings_summary({'a.h': 1.0, 'b.h': 3.0, 'c.h': 2.0}, 2.5, 2, 2)
+
+        self.assertEqual(
+            summary,
+            'Parsed 3 files in 2.50 s with 2 jobs (sum of file times 6.00 s).\n'
+            'Slowest files:\n'
+            '     3.000 s  b.h\n'
+            '     2.000 s  c.h'
+        )
@@ -0,0 +1,111 @@
+"""Units tests for the type_extractor.streaming_merge module."""
+
+import io
+import json
+import unittest
+
+from json_fixtures import JsonFilesMixin
+from type_extractor.io import print_types_functions_json
+from type_extractor.remove_json_types import remove_unused_json_types
+from type_extractor.remove_json_types import select_functions
+from type_extractor.streaming_merge import StreamingMerger
+from type_extractor.streaming_merge import get_type_stub
+
+INT = {'name': 'int', 'type': 'integral_type'}
+FUNC_F = {'decl': 'int f(struct s *);', 'header': 'a.h', 'name': 'f',
+          'params': [{'name': 'p', 'type': 'ptr_s'}], 'ret_type': 'int'}
+PTR_S = {'pointed_type': 'struct_s', 'type': 'pointer'}
+STRUCT_S_DECL = {'members': [], 'name': 's', 'type': 'structure'}
+STRUCT_S = {'members': [{'name': 'a', 'type': 'int'}], 'name': 's', 'type': 'structure'}
+TYPEDEF_UNKNOWN = {'name': 'T', 'type': 'typedef', 'typedefed_type': 'unknown'}
+TYPEDEF_INT = {'name': 'T', 'type': 'typedef', 'typedefed_type': 'int'}
+
+
+class StreamingMergerTests(JsonFilesMixin, unittest.TestCase):
+    def merge(self, keep_unused_types=False, indent=4, roots=None):
+        merged_types, merged_functions = self.merge_one_by_one()
+        if roots is not None:
+            merged_functions = select_functions(merged_functions, roots)
+        if not keep_unused_types:
+            merged_types = remove_unused_json_types(merged_functions, merged_types)
+        expected = io.StringIO()
+        print_types_functions_json(expected, merged_types, merged_functions, indent)
+
+        merger = StreamingMerger(indent)
+        self.addCleanup(merger.close)
+        for json_file in self.json_files:
+            merger.merge_json_file(json_file)
+        output = io.StringIO()
+        merger.print_json_file(output, keep_unused_types, roots)
+        return expected.getvalue(), output.getvalue()
+
+    def test_output_is_same_as_from_merge_json_file(self):
+        self.add_json_file(
+            {'f': FUNC_F},
+            {'int': INT, 'ptr_s': PTR_S, 'struct_s': STRUCT_S_DECL, 'T': TYPEDEF_INT}
+        )
+        self.add_json_file({}, {'struct_s': STRUCT_S, 'int': INT})
+
+        expected, output = self.merge()
+
+        self.assertEqual(output, expected)
+        self.assertEqual(
+            json.loads(output)['types']['struct_s']['members'], STRUCT_S['members'])
+        self.assertNotIn('T', json.loads(output)['types'])
+
+    def test_unused_types_are_kept_when_requested(self):
+        self.add_json_file({'f': FUNC_F}, {'int': INT, 'ptr_s': PTR_S, 'struct_s': STRUCT_S})
+        self.add_json_file({}, {'T': TYPEDEF_UNKNOWN})
+        self.add_json_file({}, {'T': TYPEDEF_INT})
+
+        expected, output = self.merge(keep_unused_types=True)
+
+        self.assertEqual(output, expected)
+        self.assertEqual(json.loads(output)['types']['T'], TYPEDEF_INT)
+
+    def test_only_root_functions_and_their_types_are_kept(self):
+        func_g = {'decl': 'void g(void);', 'header': 'a.h', 'name': 'g',
+                  'params': [], 'ret_type': 'int'}
+        self.add_json_file({'f': FUNC_F, 'g': func_g},
+                           {'int': INT, 'ptr_s': PTR_S, 'struct_s': STRUCT_S})
+
+        expected, output = self.merge(roots=['g', 'g', 'h'])
+
+        self.assertEqual(output, expected)
+        self.assertEqual(list(json.loads(output)['functions']), ['g'])
+        self.assertEqual(list(json.loads(output)['types']), ['int'])
+
+    def test_first_function_and_struct_with_members_win(self):
+        other_f = dict(FUNC_F, decl='int f(void);', params=[])
+        self.add_json_file({'f': FUNC_F}, {'int': INT, 'ptr_s': PTR_S, 'struct_s': STRUCT_S})
+        self.add_json_file({'f': other_f}, {'struct_s': STRUCT_S_DECL})
+
+        expected, output = self.merge()
+
+        self.assertEqual(output, expected)
+        self.assertEqual(json.loads(output)['functions']['f'], FUNC_F)
+
+    def test_output_is_same_for_no_indentation(self):
+        self.add_json_file({'f': FUNC_F}, {'int': INT, 'ptr_s': PTR_S, 'struct_s': STRUCT_S})
+
+        expected, output = self.merge(indent=None)
+
+        self.assertEqual(output, expected)
+
+    def test_missing_used_type_is_error(self):
+        self.add_json_file({'f': FUNC_F}, {'int': INT})
+
+        with self.assertRaises(KeyError):
+            self.merge()
+
+
+class GetTypeStubTests(unittest.TestCase):
+    def test_struct_stub_keeps_only_emptiness_of_members(self):
+        self.assertEqual(get_type_stub(STRUCT_S), {'type': 'structure', 'members': [None]})
+        self.assertEqual(get_type_stub(STRUCT_S_DECL), {'type': 'structure', 'members': []})
+
+    def test_typedef_stub_keeps_name_and_typedefed_type(self):
+        self.assertEqual(get_type_stub(TYPEDEF_INT), TYPEDEF_INT)
+
+    def test_other_stubs_keep_only_type(self):
+        self.assertEqual(get_type_stub(PTR_S), {'type': 'pointer'})
@@ -1 +1,95 @@
 """Unit tests for the type_extractor.utils module."""
+
+import os
+import tempfile
+import unittest
+
+from type_extractor.utils import FilesFilter
+from type_extractor.utils import get_files_with_suffix_from_path
+
+
+class FilesFilterTests(unittest.TestCase):
+    def test_everything_is_accepted_without_patterns(self):
+        files_filter = FilesFilter()
+
+        self.assertTrue(files_filter.accepts_dir('GL'))
+        self.assertTrue(files_filter.accepts_file('GL/gl.h'))
+
+    def test_dir_matching_exclude_regex_is_not_accepted(self):
+        files_filter = FilesFilter(exclude=['GL/', 'python.*/'])
+
+        self.assertFalse(files_filter.accepts_dir('GL'))
+        self.assertFalse(files_filter.accepts_dir('python3.6m'))
+        self.assertTrue(files_filter.accepts_dir('linux'))
+
+    def test_file_matching_exclude_regex_is_not_accepted(self):
+        files_filter = FilesFilter(exclude=[r'c\+\+/'])
+
+        self.assertFalse(files_filter.accepts_file('c++/7/cstdio.h'))
+        self.assertTrue(files_filter.accepts_file('stdio.h'))
+
+    def test_exclude_glob_has_to_match_whole_path(self):
+        files_filter = FilesFilter(exclude_globs=['X11/*', '*.H'])
+
+        self.assertFalse(files_filter.accepts_dir('X11'))
+        self.assertFalse(files_filter.accepts_file('X11/extensions/Xrender.h'))
+        self.assertFalse(files_filter.accepts_file('gmp.H'))
+        self.assertTrue(files_filter.accepts_file('linux/X11/x.h'))
+
+    def test_only_files_matching_include_patterns_are_accepted(self):
+        files_filter = FilesFilter(include=[r'^linux/'], include_globs=['*stdio.h'])
+
+        self.assertTrue(files_filter.accepts_file('linux/types.h'))
+        self.assertTrue(files_filter.accepts_file('stdio.h'))
+        self.assertFalse(files_filter.accepts_file('stdlib.h'))
+        self.assertTrue(files_filter.accepts_dir('sys'))
+
+    def test_exclude_patterns_win_over_include_patterns(self):
+        files_filter = FilesFilter(exclude=['GL/'], include=['gl'])
+
+        self.assertFalse(files_filter.accepts_file('GL/gl.h'))
+
+
+class GetFilesWithSuffixFromPathTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = tmp_dir.name
+        for rel_path in ('a.h', 'b.c', 'GL/gl.h', 'sys/types.h'):
+            file_path = os.path.join(self.path, rel_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            open(file_path, 'w').close()
+
+    def get_files(self, files_filter=None):
+        return sorted(
+            os.path.relpath(f, self.path) for f in
+            get_files_with_suffix_from_path(self.path, '.h', files_filter)
+        )
+
+    def test_all_files_with_suffix_are_returned_without_filter(self):
+        self.assertEqual(
+            self.get_files(),
+            ['GL/gl.h', 'a.h', os.path.join('sys', 'types.h')]
+        )
+
+    def test_excluded_dirs_are_not_walked(self):
+        walked = []
+
+        class RecordingFilter(FilesFilter):
+            def accepts_file(self, rel_path):
+                walked.append(rel_path)
+                return super().accepts_file(rel_path)
+
+        files = self.get_files(RecordingFilter(exclude=['GL/']))
+
+        self.assertEqual(files, ['a.h', os.path.join('sys', 'types.h')])
+        self.assertNotIn('GL/gl.h', walked)
+
+    def test_file_path_is_returned_regardless_of_filter(self):
+        file_path = os.path.join(self.path, 'a.h')
+
+        self.assertEqual(
+            list(get_files_with_suffix_from_path(
+                file_path, '.h', FilesFilter(exclude=['a']))),
+            [file_path]
+        )
@@ -2,7 +2,10 @@
 
 import argparse
 
+from .cache import get_default_cache_dir
+from .func_info import DECLARATIONS_SCANNERS
 from .io import get_output_format_options
+from .json_types import KEY_SCHEMES
 
 
 class GetJsonIndent(argparse.Action):
@@ -25,6 +28,20 @@ class GetJsonIndent(argparse.Action):
         setattr(namespace, self.dest, indent)
 
 
+class GetOutputFormats(argparse.Action):
+    """Parses comma-separated list of output formats."""
+
+    def __call__(self, parser, namespace, value, option_string=None):
+        formats = []
+        for out_format in value.split(','):
+            if out_format not in get_output_format_options():
+                parser.error('argument {}: invalid choice: {!r} (choose from {})'.format(
+                    option_string, out_format, ', '.join(get_output_format_options())))
+            if out_format not in formats:
+                formats.append(out_format)
+        setattr(namespace, self.dest, formats)
+
+
 def get_arg_parser_for_extract_types(doc):
     """Creates and returns argument parser."""
     parser = argparse.ArgumentParser(
@@ -37,18 +54,102 @@ def get_arg_parser_for_extract_types(doc):
         help='enable emission of logging info'
     )
     parser.add_argument(
-        '-f', '--format', dest='format',
-        action='store', choices=get_output_format_options(),
-        default='json', help='choose output format of parsing'
+        '-f', '--format', dest='formats', metavar='FORMAT[,FORMAT...]',
+        action=GetOutputFormats, default=['json'],
+        help='choose output formats of parsing ({}), all of them are printed '
+             'from one parse of each header'.format(', '.join(get_output_format_options()))
     )
     parser.add_argument(
         '-o', '--output', dest='output',
         default='type_extractor_output', help='choose output directory'
     )
+    parser.add_argument(
+        '--key-scheme', dest='key_scheme',
+        choices=sorted(KEY_SCHEMES), default='sha1',
+        help='choose how keys of types in json output are made, '
+             'jsons merged together must use the same scheme'
+    )
+    parser.add_argument(
+        '--declarations-scanner', dest='declarations_scanner',
+        choices=sorted(DECLARATIONS_SCANNERS), default='tokens',
+        help='choose how function declarations are found in headers, '
+             'the regex scanner is kept for comparison'
+    )
     parser.add_argument(
         '--json-indent', dest='json_indent', action=GetJsonIndent,
         default=4, help='choose indentation for json files'
     )
+    parser.add_argument(
+        '--cache-dir', dest='cache_dir',
+        default=get_default_cache_dir(),
+        help='choose directory for cached outputs of unchanged headers'
+    )
+    parser.add_argument(
+        '--cache-size', dest='cache_size', type=int, default=1024,
+        help='maximal size of the cache in MB, least recently used outputs '
+             'are removed first'
+    )
+    parser.add_argument(
+        '--no-cache', dest='use_cache',
+        action='store_false', default=True,
+        help='parse all headers, do not use cached outputs'
+    )
+    parser.add_argument(
+        '-j', '--jobs', dest='jobs', type=int, default=None,
+        help='count of parallel jobs, all CPUs are used by default'
+    )
+    parser.add_argument(
+        '--chunksize', dest='chunksize', type=int, default=None,
+        help='count of headers sent to a job at once, by default headers are '
+             'grouped by their estimated parsing times'
+    )
+    parser.add_argument(
+        '--timings', dest='timings', metavar='FILE',
+        help='order headers by parsing times from FILE and save parsing times '
+             'from this run to FILE'
+    )
+    parser.add_argument(
+        '--summary', dest='summary',
+        action='store_true', default=False,
+        help='print summary of parsing times with the slowest headers'
+    )
+    parser.add_argument(
+        '--profile-regex', dest='profile_regex',
+        action='store_true', default=False,
+        help='count and time calls of regular expressions and print the most '
+             'expensive ones, headers taken from cache are not parsed'
+    )
+    parser.add_argument(
+        '--profile-regex-top', dest='profile_regex_top', metavar='N',
+        type=int, default=20,
+        help='choose how many regular expressions --profile-regex prints'
+    )
+    parser.add_argument(
+        '--exclude', dest='exclude', metavar='REGEX',
+        action='append', default=[],
+        help='skip headers (and dirs) whose path relative to PATH matches regex'
+    )
+    parser.add_argument(
+        '--include', dest='include', metavar='REGEX',
+        action='append', default=[],
+        help='extract only headers whose path relative to PATH matches regex'
+    )
+    parser.add_argument(
+        '--exclude-glob', dest='exclude_glob', metavar='GLOB',
+        action='append', default=[],
+        help='skip headers (and dirs) whose path relative to PATH matches glob'
+    )
+    parser.add_argument(
+        '--include-glob', dest='include_glob', metavar='GLOB',
+        action='append', default=[],
+        help='extract only headers whose path relative to PATH matches glob'
+    )
+    parser.add_argument(
+        '--output-by-pattern', dest='output_by_pattern', nargs=2,
+        metavar=('REGEX', 'DIR'), action='append', default=[],
+        help='write outputs for headers whose path relative to PATH matches '
+             'regex to DIR instead of the output directory'
+    )
     parser.add_argument(
         'path', metavar='PATH', nargs='+',
         help='path to file or dir to extract types'
@@ -80,6 +181,27 @@ def get_arg_parser_for_merge_jsons(doc):
         action='store_true', default=False,
         help='type not used in any function is removed by default'
     )
+    parser.add_argument(
+        '--roots', dest='roots', metavar='FILE',
+        help='file with names of functions (one per line) to keep, with types '
+             'they use; all functions are kept by default'
+    )
+    parser.add_argument(
+        '--dedup-types', dest='dedup_types',
+        action='store_true', default=False,
+        help='merge structurally identical types, not used with --streaming'
+    )
+    parser.add_argument(
+        '-j', '--jobs', dest='jobs', type=int, default=1,
+        help='count of parallel jobs merging parts of json files, '
+             'not used with --streaming'
+    )
+    parser.add_argument(
+        '--streaming', dest='streaming',
+        action='store_true', default=False,
+        help='keep only index of types in memory, merged types are kept in '
+             'a temporary file until the output is written'
+    )
     parser.add_argument(
         'path', metavar='PATH', nargs='+',
         help='path to json file or dir with json files'
@@ -97,8 +219,84 @@ def get_arg_parser_for_optimize_jsons(doc):
         '--json-indent', dest='json_indent', action=GetJsonIndent,
         default=4, help='choose indentation for json files'
     )
+    parser.add_argument(
+        '--dedup-types', dest='dedup_types',
+        action='store_true', default=False,
+        help='merge structurally identical types before keys are substituted'
+    )
     parser.add_argument(
         'path', metavar='PATH', nargs='+',
         help='path to json file or dir with json files'
     )
     return parser
+
+
+def get_arg_parser_for_convert_type_db(doc):
+    """Creates and returns argument parser."""
+    parser = argparse.ArgumentParser(
+        description=doc,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        '-o', '--output', dest='output', required=True,
+        help='choose output file'
+    )
+    parser.add_argument(
+        '--json-indent', dest='json_indent', action=GetJsonIndent,
+        default=4, help='choose indentation for json files'
+    )
+    parser.add_argument(
+        'path', metavar='PATH',
+        help='path to json file or file in the binary format'
+    )
+    return parser
+
+
+def get_arg_parser_for_gen_cstdlib_and_linux_jsons(doc):
+    """Creates and returns argument parser."""
+    parser = argparse.ArgumentParser(
+        description=doc,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        '-l', '--enable-logging', dest='enable_logging',
+        action='store_true', default=False,
+        help='enable emission of logging info'
+    )
+    parser.add_argument(
+        '-f', '--files-filter', dest='files_filter',
+        action='append', default=[],
+        help='pattern (regex) to ignore specific header files'
+    )
+    parser.add_argument(
+        '-i', '--json-indent', dest='json_indent', action=GetJsonIndent,
+        default=1, help='choose indentation for json files'
+    )
+    parser.add_argument(
+        '-N', '--no-cleanup', dest='cleanup',
+        action='store_false', default=True,
+        help='do not remove dirs with JSONs for individual header files'
+    )
+    parser.add_argument(
+        '--incremental', dest='incremental',
+        action='store_true', default=False,
+        help='extract only headers changed since the last incremental run and '
+             'merge only JSONs with changed inputs, implies --no-cleanup'
+    )
+    parser.add_argument(
+        '--include-dir', dest='include_dir', default='/usr/include/',
+        help='choose directory with headers'
+    )
+    parser.add_argument(
+        '-o', '--output', dest='output', default='.',
+        help='choose output directory'
+    )
+    parser.add_argument(
+        '--cstdlib-headers', dest='cstdlib_headers',
+        help='set path to the C standard library headers with high-priority types info'
+    )
+    parser.add_argument(
+        '--linux-headers', dest='linux_headers',
+        help='set path to the Linux headers with high-priority types info'
+    )
+    return parser
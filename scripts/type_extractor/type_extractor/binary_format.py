@@ -0,0 +1,309 @@
+"""Compact binary format of JSON type databases.
+
+A file consists of a header, a table of all strings and the encoded document:
+
+    b'RTDB', version (1 byte)
+    count of strings (u32), offsets of strings in the blob (u32 * (count + 1))
+    blob of UTF-8 encoded strings
+    root value
+
+Every value starts with a tag byte. Strings, keys of dicts included, are
+varint indexes to the table of strings, so every key and name is stored once.
+Integers are zigzag varints, floats are doubles, lists and dicts have count of
+items (varint) before their items. Dicts in the root dict (functions and
+types) are indexed: sorted keys with offsets of values relative to the root
+value (u32 pairs) precede the values, so one entry can be read without
+decoding the others. All fixed-size numbers are little-endian.
+"""
+
+import struct
+
+MAGIC = b'RTDB'
+VERSION = 1
+
+TAG_NULL = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_LIST = 6
+TAG_DICT = 7
+TAG_INDEXED_DICT = 8
+
+U32 = struct.Struct('<I')
+DOUBLE = struct.Struct('<d')
+INDEX_ENTRY = struct.Struct('<II')
+
+
+class BinaryFormatError(ValueError):
+    """Data are not in the binary format."""
+
+
+def write_varint(out, number):
+    """Appends unsigned varint to out."""
+    while number > 0x7f:
+        out.append((number & 0x7f) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def read_varint(data, pos):
+    """Returns unsigned varint at pos and position after it."""
+    number = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+class BinaryEncoder(object):
+    """Encodes JSON-like content to the binary format.
+
+    Objects with repr_json() are encoded as the value it returns.
+    """
+
+    def __init__(self):
+        self.strings = {}
+        self.body = bytearray()
+
+    def encode(self, content):
+        """Returns content encoded to bytes."""
+        self.encode_value(content, 0)
+        blob = bytearray()
+        offsets = [0]
+        for string in self.strings:
+            blob += string.encode('utf-8')
+            offsets.append(len(blob))
+        header = bytearray(MAGIC)
+        header.append(VERSION)
+        header += U32.pack(len(self.strings))
+        header += struct.pack('<{}I'.format(len(offsets)), *offsets)
+        return bytes(header + blob + self.body)
+
+    def string_index(self, string):
+        index = self.strings.get(string)
+        if index is None:
+            index = self.strings[string] = len(self.strings)
+        return index
+
+    def encode_value(self, value, level):
+        body = self.body
+        if hasattr(value, 'repr_json'):
+            value = value.repr_json()
+        if isinstance(value, str):
+            body.append(TAG_STR)
+            write_varint(body, self.string_index(value))
+        elif value is None:
+            body.append(TAG_NULL)
+        elif value is True:
+            body.append(TAG_TRUE)
+        elif value is False:
+            body.append(TAG_FALSE)
+        elif isinstance(value, int):
+            body.append(TAG_INT)
+            write_varint(body, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif isinstance(value, float):
+            body.append(TAG_FLOAT)
+            body += DOUBLE.pack(value)
+        elif isinstance(value, (list, tuple)):
+            body.append(TAG_LIST)
+            write_varint(body, len(value))
+            for item in value:
+                self.encode_value(item, level + 1)
+        elif isinstance(value, dict):
+            if level == 1:
+                self.encode_indexed_dict(value, level)
+            else:
+                body.append(TAG_DICT)
+                write_varint(body, len(value))
+                for key, item in value.items():
+                    write_varint(body, self.string_index(key))
+                    self.encode_value(item, level + 1)
+        else:
+            raise TypeError('Object of type {} with value of {} cannot be '
+                            'encoded'.format(type(value), repr(value)))
+
+    def encode_indexed_dict(self, value, level):
+        body = self.body
+        body.append(TAG_INDEXED_DICT)
+        write_varint(body, len(value))
+        index_pos = len(body)
+        body.extend(bytes(INDEX_ENTRY.size * len(value)))
+        for i, key in enumerate(sorted(value)):
+            INDEX_ENTRY.pack_into(
+                body, index_pos + i * INDEX_ENTRY.size, self.string_index(key), len(body))
+            self.encode_value(value[key], level + 1)
+
+
+class BinaryDecoder(object):
+    """Decodes content from data in the binary format.
+
+    data can be any bytes-like object, e.g. mmap. Strings are decoded when
+    they are used for the first time.
+    """
+
+    def __init__(self, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise BinaryFormatError('Missing magic number of the binary format')
+        if data[len(MAGIC)] != VERSION:
+            raise BinaryFormatError(
+                'Unsupported version of the binary format: {}'.format(data[len(MAGIC)]))
+        self.data = data
+        self.strings_count = U32.unpack_from(data, len(MAGIC) + 1)[0]
+        self.offsets_pos = len(MAGIC) + 1 + U32.size
+        self.blob_pos = self.offsets_pos + U32.size * (self.strings_count + 1)
+        self.root_pos = self.blob_pos + self.get_string_offset(self.strings_count)
+        self.strings = {}
+
+    def get_string_offset(self, index):
+        return U32.unpack_from(self.data, self.offsets_pos + U32.size * index)[0]
+
+    def get_string(self, index):
+        """Returns string from the table of strings."""
+        string = self.strings.get(index)
+        if string is None:
+            start = self.blob_pos + self.get_string_offset(index)
+            end = self.blob_pos + self.get_string_offset(index + 1)
+            string = self.strings[index] = bytes(self.data[start:end]).decode('utf-8')
+        return string
+
+    def decode(self):
+        """Returns the whole decoded content."""
+        return self.decode_value(self.root_pos)[0]
+
+    def get_sections(self):
+        """Returns items of the root dict without decoding them. Indexed dicts
+        are returned as IndexedDictView, other values are decoded.
+        """
+        data = self.data
+        if data[self.root_pos] != TAG_DICT:
+            raise BinaryFormatError('Root value is not a dict')
+        count, pos = read_varint(data, self.root_pos + 1)
+        sections = {}
+        for _ in range(count):
+            index, pos = read_varint(data, pos)
+            if data[pos] == TAG_INDEXED_DICT:
+                view = IndexedDictView(self, pos)
+                sections[self.get_string(index)] = view
+                pos = view.end_pos
+            else:
+                sections[self.get_string(index)], pos = self.decode_value(pos)
+        return sections
+
+    def decode_value(self, pos):
+        """Returns value at pos and position after it."""
+        data = self.data
+        tag = data[pos]
+        pos += 1
+        if tag == TAG_STR:
+            index, pos = read_varint(data, pos)
+            return self.get_string(index), pos
+        elif tag == TAG_DICT:
+            count, pos = read_varint(data, pos)
+            value = {}
+            for _ in range(count):
+                index, pos = read_varint(data, pos)
+                value[self.get_string(index)], pos = self.decode_value(pos)
+            return value, pos
+        elif tag == TAG_LIST:
+            count, pos = read_varint(data, pos)
+            value = []
+            for _ in range(count):
+                item, pos = self.decode_value(pos)
+                value.append(item)
+            return value, pos
+        elif tag == TAG_INT:
+            number, pos = read_varint(data, pos)
+            return (number >> 1) if not number & 1 else -((number + 1) >> 1), pos
+        elif tag == TAG_NULL:
+            return None, pos
+        elif tag == TAG_TRUE:
+            return True, pos
+        elif tag == TAG_FALSE:
+            return False, pos
+        elif tag == TAG_FLOAT:
+            return DOUBLE.unpack_from(data, pos)[0], pos + DOUBLE.size
+        elif tag == TAG_INDEXED_DICT:
+            count, pos = read_varint(data, pos)
+            value = {}
+            index_pos = pos
+            pos += INDEX_ENTRY.size * count
+            for i in range(count):
+                index, _ = INDEX_ENTRY.unpack_from(data, index_pos + i * INDEX_ENTRY.size)
+                value[self.get_string(index)], pos = self.decode_value(pos)
+            return value, pos
+        raise BinaryFormatError('Unknown tag {} at {}'.format(tag, pos - 1))
+
+
+class IndexedDictView(object):
+    """Read-only view of an indexed dict, values are decoded on access.
+
+    Keys are looked up by binary search in the index of sorted keys.
+    """
+
+    def __init__(self, decoder, pos):
+        self.decoder = decoder
+        self.count, self.index_pos = read_varint(decoder.data, pos + 1)
+        self.end_pos = self.index_pos + INDEX_ENTRY.size * self.count
+        if self.count:
+            self.end_pos = decoder.decode_value(self.get_value_pos(self.count - 1))[1]
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def __getitem__(self, key):
+        i = self.find(key)
+        if i is None:
+            raise KeyError(key)
+        return self.decoder.decode_value(self.get_value_pos(i))[0]
+
+    def get(self, key, default=None):
+        i = self.find(key)
+        if i is None:
+            return default
+        return self.decoder.decode_value(self.get_value_pos(i))[0]
+
+    def keys(self):
+        for i in range(self.count):
+            yield self.get_key(i)
+
+    def get_key(self, i):
+        index, _ = INDEX_ENTRY.unpack_from(
+            self.decoder.data, self.index_pos + i * INDEX_ENTRY.size)
+        return self.decoder.get_string(index)
+
+    def get_value_pos(self, i):
+        _, offset = INDEX_ENTRY.unpack_from(
+            self.decoder.data, self.index_pos + i * INDEX_ENTRY.size)
+        return self.decoder.root_pos + offset
+
+    def find(self, key):
+        """Returns position of key in the index, None if it is not there."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.get_key(low) == key:
+            return low
+        return None
+
+
+def content_to_binary(content):
+    """Returns content encoded in the binary format."""
+    return BinaryEncoder().encode(content)
+
+
+def binary_to_content(data):
+    """Returns content decoded from data in the binary format."""
+    return BinaryDecoder(data).decode()
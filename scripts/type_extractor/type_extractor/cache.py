@@ -0,0 +1,111 @@
+"""Persistent cache of outputs of extract_types.py.
+
+Output for a header is stored under a key made of the header's content, its
+path relative to the input path, the output format, indentation, scheme of
+type keys, scanner of declarations and the version of the extractor.
+Unchanged headers are then not parsed again, their outputs are copied from
+the cache.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_default_cache_dir():
+    """Returns default directory for the cache of outputs."""
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        cache_home = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'retdec', 'type_extractor')
+
+
+def get_extractor_version():
+    """Returns version of the extractor, which is a hash of its sources.
+
+    Any change of the extractor invalidates all outputs in the cache.
+    """
+    version = hashlib.sha1()
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith('.py'):
+            version.update(name.encode('utf-8'))
+            with open(os.path.join(PACKAGE_DIR, name), 'rb') as f:
+                version.update(f.read())
+    return version.hexdigest()
+
+
+class HeaderCache(object):
+    """On-disk cache of outputs for header files."""
+
+    def __init__(self, cache_dir, max_size, version=None):
+        """Constructs cache in cache_dir holding at most max_size bytes."""
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.version = version if version is not None else get_extractor_version()
+
+    def get_key(self, content, relative_path, output_format, indent, key_scheme='sha1',
+                declarations_scanner='tokens'):
+        """Returns key of output for header with the given content."""
+        key = hashlib.sha1()
+        for part in (self.version, relative_path, output_format, repr(indent), key_scheme,
+                     declarations_scanner):
+            key.update(part.encode('utf-8'))
+            key.update(b'\0')
+        key.update(content.encode('utf-8', errors='replace'))
+        return key.hexdigest()
+
+    def get_entry_path(self, key):
+        """Returns path to the cached output for key."""
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def load(self, key, output_file):
+        """Copies cached output for key to output_file.
+
+        Returns False when there is no such output in the cache.
+        """
+        entry = self.get_entry_path(key)
+        try:
+            shutil.copyfile(entry, output_file)
+            # Used outputs are evicted last.
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, output_file):
+        """Stores content of output_file as output for key."""
+        entry = self.get_entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            fd, tmp_entry = tempfile.mkstemp(dir=os.path.dirname(entry))
+            os.close(fd)
+            shutil.copyfile(output_file, tmp_entry)
+            os.replace(tmp_entry, entry)
+        except OSError as e:
+            logging.warning('Failed to cache output {}: {}'.format(output_file, e))
+
+    def evict(self):
+        """Removes least recently used outputs until the cache fits its size."""
+        entries = []
+        size = 0
+        for dir_path, _, file_list in os.walk(self.cache_dir):
+            for fname in file_list:
+                entry = os.path.join(dir_path, fname)
+                try:
+                    stat = os.stat(entry)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+                size += stat.st_size
+        for _, entry_size, entry in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
@@ -0,0 +1,112 @@
+"""Merges structurally identical types.
+
+Types are identical when they are of the same kind, have the same attributes
+and their referenced types are identical too. Names of anonymous structs,
+unions and enums (generated '_LOCAL_' and '_TYPEDEF_' names) do not matter.
+Identical types are found by partition refinement: types are split to classes
+by their own attributes and classes are split by classes of referenced types
+until no class is split. Recursive types are therefore merged too. Each class
+is replaced by the type with the smallest key.
+"""
+
+import json
+
+from .regex_registry import get_regex
+from .json_types import TYPES
+from .remove_json_types import get_func_referenced_types
+from .remove_json_types import get_referenced_types
+from .substitute_json_keys import substitute_keys_in_functions
+from .substitute_json_keys import substitute_type_keys
+
+ANONYMOUS_NAME_RE = get_regex(r'^(?:(?:struct|union|enum) )?_(?:LOCAL|TYPEDEF)_')
+
+
+def deduplicate_json_types(functions, types):
+    """Merges identical types, references in functions and types are
+    substituted with the kept types. Returns new types.
+    """
+    new_keys = get_new_keys(types)
+    for func in functions.values():
+        for k in get_func_referenced_types(func):
+            new_keys.setdefault(k, k)
+    substitute_keys_in_functions(functions, new_keys)
+    new_types = {}
+    for k, t in types.items():
+        if new_keys[k] == k:
+            substitute_type_keys(t, new_keys)
+            new_types[k] = t
+    return new_types
+
+
+def get_new_keys(types):
+    """Returns dictionary where key is type key and value is key of the type
+    that replaces it. Referenced keys missing in types are kept.
+    """
+    classes, refs = get_initial_classes(types)
+    # Classes are only refined, so the partition is stable once the number of
+    # classes of types stops growing. Missing referenced types are not counted.
+    classes_count = len(set(classes.values()))
+    for type_refs in refs.values():
+        for k in type_refs:
+            if k not in types:
+                classes[k] = k
+    while True:
+        ids = {}
+        new_classes = {
+            k: ids.setdefault((classes[k], tuple(classes[r] for r in refs[k])), len(ids))
+            for k in types
+        }
+        classes.update(new_classes)
+        if len(ids) == classes_count:
+            break
+        classes_count = len(ids)
+
+    kept = {}
+    for k in sorted(types):
+        kept.setdefault(classes[k], k)
+    return {k: kept[c] if k in types else k for k, c in classes.items()}
+
+
+def get_initial_classes(types):
+    """Splits types to classes by their own attributes.
+
+    Returns class for each type key and keys of types referenced by it.
+    """
+    ids = {}
+    classes = {}
+    refs = {}
+    for k, t in types.items():
+        signature, refs[k] = get_type_signature(t)
+        classes[k] = ids.setdefault(signature, len(ids))
+    return classes, refs
+
+
+def get_type_signature(type):
+    """Returns string with attributes of type without referenced types and
+    keys of referenced types.
+    """
+    type_refs = get_referenced_types(type)
+    # Only attributes with referenced types are copied, type is not changed.
+    t = dict(type)
+    type_of_type = t['type']
+    if type_of_type in REFERENCE_ATTRIBUTES:
+        attr = REFERENCE_ATTRIBUTES[type_of_type]
+        if t[attr] != 'unknown':
+            t[attr] = ''
+    elif type_of_type == TYPES.FUNCTION.value:
+        t['ret_type'] = ''
+        t['params'] = [dict(p, type='') for p in t['params']]
+    elif type_of_type in (TYPES.STRUCT.value, TYPES.UNION.value):
+        t['members'] = [dict(m, type='') for m in t['members']]
+    if ANONYMOUS_NAME_RE.match(t.get('name', '')):
+        t['name'] = ''
+    return json.dumps(t, sort_keys=True), type_refs
+
+
+# Attribute with the only referenced type of types by their kind.
+REFERENCE_ATTRIBUTES = {
+    TYPES.ARRAY.value: 'element_type',
+    TYPES.POINTER.value: 'pointed_type',
+    TYPES.QUALIFIER.value: 'modified_type',
+    TYPES.TYPEDEF.value: 'typedefed_type',
+}
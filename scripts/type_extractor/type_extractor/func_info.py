@@ -2,6 +2,8 @@
 
 import re
 
+from .regex_registry import get_formatted_regex
+from .regex_registry import get_regex
 from .utils import object_attr_string_repr
 
 
@@ -79,22 +81,131 @@ class FuncInfo:
         for p in self.params:
             if p.name.startswith('_'):
                 p.name = p.name.strip('_')
-                self.decl = re.sub(r'_+{}\b'.format(re.escape(p.name)),
-                                   p.name, self.decl, 1)
+                self.decl = get_formatted_regex(r'_+{}\b', re.escape(p.name)).sub(
+                    p.name, self.decl, 1)
 
 
 def get_declarations(text):
     """Extracts all function declarations from text."""
-    return re.findall(r'\s?\w+[\w\s\*]*\s+\w+\([\w\s\*\+-/,.()[\]]*?\)\s*;', text)
+    return declarations_scanner(text)
+
+
+def get_declarations_by_regex(text):
+    """Extracts all function declarations from text by one regular expression.
+
+    The regex backtracks a lot on long runs of words without '(' and on long
+    parentheses without ';'.
+    """
+    return get_regex(r'\s?\w+[\w\s\*]*\s+\w+\([\w\s\*\+-/,.()[\]]*?\)\s*;').findall(text)
+
+
+# Tokens of C text: words, runs of white space and single other characters.
+TOKEN_RE = get_regex(r'(\w+)|(\s+)|(.)', re.DOTALL)
+WORD, SPACE, PUNCT = 1, 2, 3
+# Characters besides words and spaces that may be in parentheses of declaration.
+PARAMS_PUNCT = frozenset('*+,-./()[]')
+
+
+def tokenize(text):
+    """Returns list of tokens (kind, start, end, value) of text."""
+    return [(m.lastindex, m.start(), m.end(), m.group()) for m in TOKEN_RE.finditer(text)]
+
+
+def get_declarations_by_tokens(text):
+    """Extracts all function declarations from text in one pass over its tokens.
+
+    Declarations are the same as from get_declarations_by_regex(): return type
+    made of words, spaces and '*' starting with a word, space, name, '(',
+    parameters without characters other than PARAMS_PUNCT, ')' and ';'.
+    """
+    tokens = tokenize(text)
+    declarations = []
+    run_start = 0  # First token of the run of words, spaces and '*' before '('.
+    params_end = -1  # First token after the last '(' not allowed in parameters.
+    i = 0
+    while i < len(tokens):
+        kind, _, _, value = tokens[i]
+        i += 1
+        if kind != PUNCT or value == '*':
+            continue
+        if value != '(':
+            run_start = i
+            continue
+
+        paren = i - 1
+        if params_end <= paren:
+            params_end = get_params_end(tokens, paren + 1)
+        start = get_declaration_start(tokens, run_start, paren)
+        run_start = i
+        if start is None or not is_declaration_end(tokens, paren, params_end):
+            continue
+        declarations.append(text[start:tokens[params_end][2]])
+        i = run_start = params_end + 1
+    return declarations
+
+
+def get_params_end(tokens, i):
+    """Returns index of the first token from i that can not be in parameters."""
+    while i < len(tokens):
+        kind, _, _, value = tokens[i]
+        if kind == PUNCT and value not in PARAMS_PUNCT:
+            return i
+        i += 1
+    return i
+
+
+def get_declaration_start(tokens, run_start, paren):
+    """Returns position in text where the declaration with parameters in
+    parentheses at index paren starts, None when there is no return type and
+    name before them. Tokens from run_start are words, spaces and '*'.
+    """
+    if (paren - 2 < run_start or tokens[paren - 1][0] != WORD or
+            tokens[paren - 2][0] != SPACE):
+        return None
+    first_word = run_start
+    while tokens[first_word][0] != WORD:
+        first_word += 1
+    if first_word == paren - 1:
+        return None
+    start = tokens[first_word][1]
+    # One space before the return type is a part of the declaration.
+    if first_word > run_start and tokens[first_word - 1][0] == SPACE:
+        start -= 1
+    return start
+
+
+def is_declaration_end(tokens, paren, params_end):
+    """Checks that parameters after paren end with ')' and ';' at params_end."""
+    if params_end == len(tokens) or tokens[params_end][3] != ';':
+        return False
+    close = params_end - 1
+    if tokens[close][0] == SPACE:
+        close -= 1
+    return close > paren and tokens[close][3] == ')'
+
+
+DECLARATIONS_SCANNERS = {
+    'tokens': get_declarations_by_tokens,
+    'regex': get_declarations_by_regex,
+}
+
+# Extracts function declarations from text.
+declarations_scanner = get_declarations_by_tokens
+
+
+def set_declarations_scanner(scanner):
+    """Sets how function declarations are found, one of DECLARATIONS_SCANNERS."""
+    global declarations_scanner
+    declarations_scanner = DECLARATIONS_SCANNERS[scanner]
 
 
 def parse_func_declaration(decl):
     """Gets return type and parameters from declaration."""
     decl = edit_decl(decl)
-    m = re.search(r'([\w\s\*]+)\s+(\w+)\s*\(', decl)
+    m = get_regex(r'([\w\s\*]+)\s+(\w+)\s*\(').search(decl)
     name = m.group(2)
     ret, call_convention = split_ret_type_and_call_convention(m.group(1))
-    params_str = re.search(r'\((.*)\)', decl).group(1)
+    params_str = get_regex(r'\((.*)\)').search(decl).group(1)
     return name, ret.strip(), params_str, call_convention
 
 
@@ -105,9 +216,9 @@ def edit_decl(decl):
         int fname OF((int x, char c));
         int BZ_API(fname)(int a);
     """
-    decl = re.sub(r'(.*?)\b__NTH\((\w*\(.*?\))\);', r'\1\2;', decl)
-    decl = re.sub(r'(.+?\s\w+)\b\w+\((\(.*?\))\);', r'\1\2;', decl)
-    decl = re.sub(r'(.*?)\b\w+\((\w+)\)\s*\((.*)\);', r'\1 \2(\3);', decl)
+    decl = get_regex(r'(.*?)\b__NTH\((\w*\(.*?\))\);').sub(r'\1\2;', decl)
+    decl = get_regex(r'(.+?\s\w+)\b\w+\((\(.*?\))\);').sub(r'\1\2;', decl)
+    decl = get_regex(r'(.*?)\b\w+\((\w+)\)\s*\((.*)\);').sub(r'\1 \2(\3);', decl)
     return decl
 
 
@@ -1,7 +1,15 @@
-"""Filters useless information from header content."""
+"""Filters useless information from header content.
+
+Filtering rules are compiled once, when the module is imported. A rule is
+a tuple (compiled regex, replacement, literals), where literals are strings
+of which at least one has to be in the text for the regex to match. Rules
+whose literals are missing in the text are skipped without running the regex.
+"""
 
 import re
 
+from .regex_registry import get_regex
+
 
 def use_filters(text):
     text = unify_ends_of_lines(text)
@@ -20,13 +28,39 @@ def use_filters(text):
     return text if is_supported(text) else ''
 
 
+def filter_rule(pattern, repl='', flags=0, literals=()):
+    """Compiles one filtering rule."""
+    return get_regex(pattern, flags), repl, literals
+
+
+def apply_filter_rules(text, rules):
+    """Applies the given rules to text one after another."""
+    for regex, repl, literals in rules:
+        if literals and not any(literal in text for literal in literals):
+            continue
+        text = regex.sub(repl, text)
+    return text
+
+
+def substitute_keywords(table):
+    """Returns replacement function substituting matched keyword by its value
+    from table.
+    """
+    return lambda m: table[m.group(0)]
+
+
 def unify_ends_of_lines(text):
     """Converts CRLF (DOS) and CR (MacOS) to LF (UNIX).
 
     This is needed to simplify other filtering functions (they can assume that
     lines end with LF).
     """
-    return re.sub('\r\n|\r', '\n', text)
+    return apply_filter_rules(text, END_OF_LINE_RULES)
+
+
+END_OF_LINE_RULES = [
+    filter_rule('\r\n|\r', '\n', literals=('\r',)),
+]
 
 
 def join_lines_ending_with_backslash(text):
@@ -48,65 +82,102 @@ def join_lines_ending_with_backslash(text):
 
 def filter_cplusplus_ifdefs(text):
     """Removes code for C++."""
-    text = re.sub(
-        r'#\s*if(def)?\s*\(?__cplusplus\)?.*?#\s*(else|elif|endif)', ';', text, flags=re.S)
-    return text
+    return apply_filter_rules(text, CPLUSPLUS_IFDEFS_RULES)
+
+
+CPLUSPLUS_IFDEFS_RULES = [
+    filter_rule(
+        r'#\s*if(def)?\s*\(?__cplusplus\)?.*?#\s*(else|elif|endif)', ';',
+        flags=re.S, literals=('__cplusplus',)),
+]
 
 
 def filter_conditional_preprocessor_statements(text):
     """Removes 'else' branches of #if[def] statement."""
-    return re.sub(
+    return apply_filter_rules(text, CONDITIONAL_PREPROCESSOR_STATEMENTS_RULES)
+
+
+CONDITIONAL_PREPROCESSOR_STATEMENTS_RULES = [
+    filter_rule(
         r'^\s*#\s*if(?:def)?.*?[\r\n]{1,2}(.*?(?=#\s*(?:else|elif|endif))).*?#\s*endif',
-        r'\1', text, flags=re.S | re.M
-    )
+        r'\1', flags=re.S | re.M, literals=('#',)),
+]
 
 
 def is_supported(text):
     """Is the given text supported and should be processed?"""
     # Files with C++ classes are not supported.
-    if re.search(r'\bclass\b[\w\s]+(:[^{]+)?\{', text):
+    if 'class' in text and CPP_CLASS_RE.search(text):
         return False
 
     # Files with assembly code in Windows SDK are not supported. They start
     # with the following comment:
-    if re.search(r'; *Copyright *\(c\) *Microsoft *Corporation\.', text):
+    if 'Copyright' in text and ASSEMBLY_COPYRIGHT_RE.search(text):
         return False
 
     return True
 
 
+CPP_CLASS_RE = get_regex(r'\bclass\b[\w\s]+(:[^{]+)?\{')
+ASSEMBLY_COPYRIGHT_RE = get_regex(r'; *Copyright *\(c\) *Microsoft *Corporation\.')
+
+
 def inline_func_to_decl(text):
-    return re.sub(r'\)\s*\{.*?\}', '); ', text, flags=re.S)
+    return apply_filter_rules(text, INLINE_FUNC_RULES)
+
+
+INLINE_FUNC_RULES = [
+    filter_rule(r'\)\s*\{.*?\}', '); ', flags=re.S, literals=('{',)),
+]
 
 
 def filter_out_comments(text):
     """Removes one-line and multi-line comments."""
-    text = re.sub(r'//(?:(?!\*/).)*$', '', text, flags=re.M)
-    text = re.sub(r'(?<!/)/\*.*?\*/', ' ', text, flags=re.S)
-    text = re.sub(r'//.*?$', '', text, flags=re.M)
-    return text
+    return apply_filter_rules(text, COMMENTS_RULES)
+
+
+COMMENTS_RULES = [
+    filter_rule(r'//(?:(?!\*/).)*$', flags=re.M, literals=('//',)),
+    filter_rule(r'(?<!/)/\*.*?\*/', ' ', flags=re.S, literals=('/*',)),
+    filter_rule(r'//.*?$', flags=re.M, literals=('//',)),
+]
 
 
 def filter_out_dead_code(text):
     """Removes '#if 0' code."""
-    return re.sub(
-        r'^\s*#\s*if\s*0\s*(?!\|\|).*?#\s*(else|elif|endif)', '', text, flags=re.S | re.M)
+    return apply_filter_rules(text, DEAD_CODE_RULES)
+
+
+DEAD_CODE_RULES = [
+    filter_rule(
+        r'^\s*#\s*if\s*0\s*(?!\|\|).*?#\s*(else|elif|endif)',
+        flags=re.S | re.M, literals=('#',)),
+]
 
 
 def filter_out_macros(text):
     """Removes one-line and multi-line preprocessor instructions."""
-    text = re.sub(r'^\s*#.*[^\\]$', '', text, flags=re.M)
-    start = r'^\s*#[^\\]+'
-    cont = r'(?:.*\\[\n\r]{1,2})+'
-    last = r'.*$'
-    text = re.sub(start + cont + last, ' ', text, flags=re.M)
-    return text
+    return apply_filter_rules(text, MACROS_RULES)
+
+
+MACROS_RULES = [
+    filter_rule(r'^\s*#.*[^\\]$', flags=re.M, literals=('#',)),
+    filter_rule(
+        r'^\s*#[^\\]+'          # start
+        r'(?:.*\\[\n\r]{1,2})+'  # continuation lines
+        r'.*$',                 # last line
+        ' ', flags=re.M, literals=('#',)),
+]
 
 
 def filter_oneline_typedefs(text):
     """Removes definitions of typedefed types."""
-    text = re.sub(r'typedef[^{}]*?;', '', text, flags=re.S)
-    return text
+    return apply_filter_rules(text, ONELINE_TYPEDEFS_RULES)
+
+
+ONELINE_TYPEDEFS_RULES = [
+    filter_rule(r'typedef[^{}]*?;', flags=re.S, literals=('typedef',)),
+]
 
 
 def filter_annotations_without_brackets(text):
@@ -114,8 +185,12 @@ def filter_annotations_without_brackets(text):
 
     Leaves only In|Out|Inout(opt). We expect annotations as '_sth_[sth2_]'.
     """
-    text = re.sub(r'_Must_inspect_result_', '', text)
-    text = re.sub(
+    return apply_filter_rules(text, ANNOTATIONS_WITHOUT_BRACKETS_RULES)
+
+
+ANNOTATIONS_WITHOUT_BRACKETS_RULES = [
+    filter_rule(r'_Must_inspect_result_', literals=('_Must_inspect_result_',)),
+    filter_rule(
         r"""
             __attribute__\s*
             \(\(
@@ -123,46 +198,105 @@ def filter_annotations_without_brackets(text):
             (\([^()]+\))?
             \)\)
         """,
-        '',
-        text,
-        flags=re.VERBOSE
-    )
-    text = re.sub(
-        r'\b(?!(_In_|_Out_|_Inout_)(opt_|z_)?\b|\w+_TYPE__\b)(_{1,2}\w+?_\b)(?!\s*\()', '', text)
-    return text
+        flags=re.VERBOSE, literals=('__attribute__',)
+    ),
+    # '(?=_)' only speeds up the search, every annotation starts with '_'.
+    filter_rule(
+        r'\b(?=_)(?!(_In_|_Out_|_Inout_)(opt_|z_)?\b|\w+_TYPE__\b)(_{1,2}\w+?_\b)(?!\s*\()',
+        literals=('_',)),
+]
 
 
 def filter_annotations_with_brackets(text):
     """Removes annotations with some brackets.
 
     Even nested e.g. _When_(sth(nested bracket(nested in nested))).
-    """
-    text = re.sub(r'(?<=,|\()\s*\b__(in|out)\w+\s*\([^)]*\)', '', text)
 
-    x = 0
-    found = re.search(r'\b_{1,2}[A-Z]\w*_{1,2}\b\s*\(.*?\)(.*?\)){%d}' % x, text, flags=re.S)
-    if found is None:
+    The text is walked only once, brackets are matched by counting their
+    depth. When an annotation's bracket is never closed, the rest of the text
+    is left untouched.
+    """
+    text = apply_filter_rules(text, IN_OUT_ANNOTATIONS_WITH_BRACKETS_RULES)
+    if '(' not in text:
         return text
-    annot = re.escape(found.group(0))
-    while annot:
-        while annot.count('(') != annot.count(')'):
-            x = x + 1
-            found = re.search(r'\b_{1,2}[A-Z]\w*_\b\s*\(.*?\)(.*?\)){%d}' % x, text, flags=re.S)
-            if found is None:
-                return text
-            annot = re.escape(found.group(0))
-        text = re.sub(annot, '', text, count=1)
-        x = 0
-        found = re.search(r'\b_{1,2}[A-Z]\w*_\b\s*\(.*?\)(.*?\)){%d}' % x, text, flags=re.S)
-        if found is None:
-            return text
-        annot = re.escape(found.group(0))
+
+    kept = []
+    pos = 0
+    while True:
+        annot = ANNOTATION_WITH_BRACKETS_RE.search(text, pos)
+        if annot is None:
+            break
+        end = find_closing_bracket(text, annot.end())
+        if end is None:
+            break
+        kept.append(text[pos:annot.start()])
+        pos = end
+        # The removal may join an already kept annotation with a following
+        # bracket, e.g. '_In_ _X_(a) (b)' -> '_In_ (b)', remove it too.
+        while OPENING_BRACKET_RE.match(text, pos):
+            annot_start = find_annotation_name_at_end(kept)
+            if annot_start is None:
+                break
+            end = find_closing_bracket(
+                text, OPENING_BRACKET_RE.match(text, pos).end())
+            if end is None:
+                return ''.join(kept) + text[pos:]
+            i, offset = annot_start
+            kept[i:] = [kept[i][:offset]]
+            pos = end
+    kept.append(text[pos:])
+    return ''.join(kept)
+
+
+def find_closing_bracket(text, pos):
+    """Returns position behind the bracket that closes the one opened right
+    before pos. Returns None when the bracket is not closed.
+    """
+    depth = 1
+    for bracket in BRACKETS_RE.finditer(text, pos):
+        if bracket.group(0) == '(':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return bracket.end()
+    return None
+
+
+def find_annotation_name_at_end(kept):
+    """Searches annotation name at the end of the kept parts of text,
+    only whitespaces may follow it.
+
+    Returns (index of the part, offset of the name in it) or None.
+    """
+    i = len(kept) - 1
+    while i > 0 and not kept[i].strip():
+        i -= 1
+    name = ANNOTATION_NAME_AT_END_RE.search(''.join(kept[i:]))
+    return (i, name.start()) if name is not None else None
+
+
+ANNOTATION_WITH_BRACKETS_RE = get_regex(r'\b_{1,2}[A-Z]\w*_\b\s*\(')
+ANNOTATION_NAME_AT_END_RE = get_regex(r'\b_{1,2}[A-Z]\w*_\s*\Z')
+OPENING_BRACKET_RE = get_regex(r'\s*\(')
+BRACKETS_RE = get_regex(r'[()]')
+
+
+IN_OUT_ANNOTATIONS_WITH_BRACKETS_RULES = [
+    filter_rule(
+        r'(?<=,|\()\s*\b__(in|out)\w+\s*\([^)]*\)', literals=('__in', '__out')),
+]
 
 
 def filter_specific_keywords(text):
     """Filters some keywords we don't need."""
-    text = re.sub(
-        r"""\b(
+    return apply_filter_rules(text, SPECIFIC_KEYWORDS_RULES)
+
+
+SPECIFIC_KEYWORDS_RULES = [
+    # The lookahead only speeds up the search, all the keywords are uppercase.
+    filter_rule(
+        r"""\b(?=[A-Z])(
                 ACLUIAPI
             |
                 ACMAPI
@@ -314,23 +448,26 @@ def filter_specific_keywords(text):
                 WSPAPI
             )\b
         """,
-        '',
-        text,
         flags=re.VERBOSE
-    )
-    text = re.sub(r'\bextern(\s*"C"\s*\{)?', '', text)  # extern "C" {
-    text = re.sub(r'\bExternC\b', '', text)
-    text = re.sub(r'\s*(__)?(THROW|throw\s*\().*?;', ';', text)
-    text = re.sub(r'__wur', '', text)
-    text = re.sub(r'\b(\w*_)?NAMESPACE(_\w*)?\b', '', text)
-    text = re.sub(
-        r'(\bEXTERN_GUID|\bDEFINE_)\w*\b(\s*\([^()]*(\(\))?[^()]*\))?', '', text)
-    text = re.sub(r'^[\w\s\*]*?__REDIRECT.*?;', '', text, flags=re.M | re.S)
-    text = re.sub(r'\b_{1,2}(RPC|CRT(?!_DOUBLE)|crt)\w*\b(\s*\([^()]*\))?', '', text)
-    text = re.sub(r'__(BEGIN|END)_DECLS', '', text)
-    text = re.sub(r'\b\w*ALIGN\w*\b(\([^()]*\))?', '', text)
-    text = re.sub(
-        r"""\b(
+    ),
+    filter_rule(r'\bextern(\s*"C"\s*\{)?', literals=('extern',)),  # extern "C" {
+    filter_rule(r'\bExternC\b', literals=('ExternC',)),
+    filter_rule(r'\s*(__)?(THROW|throw\s*\().*?;', ';', literals=('THROW', 'throw')),
+    filter_rule(r'__wur', literals=('__wur',)),
+    filter_rule(r'\b(\w*_)?NAMESPACE(_\w*)?\b', literals=('NAMESPACE',)),
+    filter_rule(
+        r'(\bEXTERN_GUID|\bDEFINE_)\w*\b(\s*\([^()]*(\(\))?[^()]*\))?',
+        literals=('EXTERN_GUID', 'DEFINE_')),
+    filter_rule(r'^[\w\s\*]*?__REDIRECT.*?;', flags=re.M | re.S, literals=('__REDIRECT',)),
+    filter_rule(
+        r'\b_{1,2}(RPC|CRT(?!_DOUBLE)|crt)\w*\b(\s*\([^()]*\))?',
+        literals=('_RPC', '_CRT', '_crt')),
+    filter_rule(r'__(BEGIN|END)_DECLS', literals=('__BEGIN_DECLS', '__END_DECLS')),
+    filter_rule(r'\b\w*ALIGN\w*\b(\([^()]*\))?', literals=('ALIGN',)),
+    # Exports, externs, inlines and call conventions. Every alternative
+    # matches a whole word, so they can be removed in one pass.
+    filter_rule(
+        r"""\b(?=[ACDEFIMNPRSVWXZ_i])(
                 DRMEXPORT
             |
                 EXPORT
@@ -338,25 +475,11 @@ def filter_specific_keywords(text):
                 ZEXPORT
             |
                 FILEHC_EXPORT
-            )\b
-        """,
-        '',
-        text,
-        flags=re.VERBOSE
-    )
-    text = re.sub(
-        r"""\b(
+            |
                 EXTERN_C
             |
                 ZEXTERN
-            )\b
-        """,
-        '',
-        text,
-        flags=re.VERBOSE
-    )
-    text = re.sub(
-        r"""\b(
+            |
                 inline
             |
                 _inline
@@ -396,14 +519,7 @@ def filter_specific_keywords(text):
                 VXDINLINE
             |
                 WS2TCPIP_INLINE
-            )\b
-        """,
-        '',
-        text,
-        flags=re.VERBOSE
-    )
-    text = re.sub(
-        r"""\b(
+            |
                 __callback
             |
                 __kernel_entry
@@ -423,47 +539,82 @@ def filter_specific_keywords(text):
                 __clrcall
             )\b
         """,
-        '',
-        text,
         flags=re.VERBOSE
-    )
-    text = re.sub(r'__drv_\w+\b(\s*\([^()]*(\([^()]*\))?[^()]*\))?', '', text)
-    text = re.sub(r'\breturn\b.*?;', ';', text)  # in inline blocks
-    text = re.sub(r'\b__analysis_noreturn\b', '', text)
-    text = re.sub(r'\b_.?CRTIMP\b', '', text)
-    text = re.sub(r'\b\w*(DECLSPEC|declspec)\w*\b(\([^()]*\))?', '', text)
-    text = re.sub(r'\b\__ALTDECL\b', '', text)
-    text = re.sub(r'__(in|out)_data_source\([\s\w\*]+\)', '', text)
-    text = re.sub(r'\b(FAR|far)\b', '', text)
-    text = re.sub(r'\bstatic\b', '', text)
-    text = re.sub(r'\b__fortify_function\b', '', text)
-    text = re.sub(r'\w+\s*\(\([\d\s,]*\)\)', '', text)
-    text = re.sub(r'(__|\b)aligned\(\w+\)', '', text)
-    text = re.sub(r'\[v1_enum\]', '', text)
-    text = re.sub(r'\bDHCP_CONST\b', '', text)
-    return text
+    ),
+    filter_rule(
+        r'__drv_\w+\b(\s*\([^()]*(\([^()]*\))?[^()]*\))?', literals=('__drv_',)),
+    filter_rule(r'\breturn\b.*?;', ';', literals=('return',)),  # in inline blocks
+    filter_rule(r'\b__analysis_noreturn\b', literals=('__analysis_noreturn',)),
+    filter_rule(r'\b_.?CRTIMP\b', literals=('CRTIMP',)),
+    filter_rule(
+        r'\b\w*(DECLSPEC|declspec)\w*\b(\([^()]*\))?', literals=('DECLSPEC', 'declspec')),
+    filter_rule(r'\b\__ALTDECL\b', literals=('__ALTDECL',)),
+    filter_rule(r'__(in|out)_data_source\([\s\w\*]+\)', literals=('_data_source(',)),
+    filter_rule(r'\b(?=[Ffs_])(FAR|far|static|__fortify_function)\b'),
+    filter_rule(r'\w+\s*\(\([\d\s,]*\)\)', literals=('((',)),
+    filter_rule(r'(__|\b)aligned\(\w+\)', literals=('aligned(',)),
+    filter_rule(r'\[v1_enum\]', literals=('[v1_enum]',)),
+    filter_rule(r'\bDHCP_CONST\b', literals=('DHCP_CONST',)),
+]
 
 
 def substitute_specific_keywords(text):
     text = substitute_api_macors(text)
-    text = re.sub(r'\bSEC_ENTRY\b', '__stdcall', text)
-    text = re.sub(r'\bRPC_VAR_ENTRY\b', '__cdecl', text)
-    text = re.sub(r'\bCONST\b', 'const', text)
-    text = re.sub(r'\b__restrict\b', 'restrict', text)
-    text = re.sub(r'\b(?:OF|Z_ARG)\s*\(\(([^;]*)\)\)\s*;', r'(\1);', text)  # zlib.h
-    text = re.sub(r'\b(\w+)\s+(OPTIONAL)\b', r'\2 \1', text)
-    return text
+    return apply_filter_rules(text, SPECIFIC_KEYWORDS_SUBSTITUTION_RULES)
+
+
+SPECIFIC_KEYWORDS_SUBSTITUTES = {
+    'SEC_ENTRY': '__stdcall',
+    'RPC_VAR_ENTRY': '__cdecl',
+    'CONST': 'const',
+    '__restrict': 'restrict',
+}
+
+
+SPECIFIC_KEYWORDS_SUBSTITUTION_RULES = [
+    filter_rule(
+        r'\b(SEC_ENTRY|RPC_VAR_ENTRY|CONST|__restrict)\b',
+        substitute_keywords(SPECIFIC_KEYWORDS_SUBSTITUTES),
+        literals=tuple(SPECIFIC_KEYWORDS_SUBSTITUTES)),
+    filter_rule(
+        r'\b(?:OF|Z_ARG)\s*\(\(([^;]*)\)\)\s*;', r'(\1);', literals=('OF', 'Z_ARG')),  # zlib.h
+    filter_rule(r'\b(\w+)\s+(OPTIONAL)\b', r'\2 \1', literals=('OPTIONAL',)),
+]
 
 
 def substitute_api_macors(text):
-    text = re.sub(r'\bBOOLAPI\b', 'BOOL', text)
-    text = re.sub(r'\bPFAPIENTRY\b', 'DWORD', text)
-    text = re.sub(r'\bSNMPAPI\b', 'INT', text)
-    text = re.sub(r'\bTDHAPI\b', 'ULONG', text)
-    text = re.sub(r'\bURLCACHEAPI\b', 'DWORD', text)
+    return apply_filter_rules(text, API_MACROS_RULES)
+
+
+class ApiMacrosSubstitutes(dict):
+    """API macros are substituted by their return types, HRESULT by default."""
+
+    def __missing__(self, key):
+        return 'HRESULT'
+
+
+API_MACROS_SUBSTITUTES = ApiMacrosSubstitutes({
+    'BOOLAPI': 'BOOL',
+    'PFAPIENTRY': 'DWORD',
+    'SNMPAPI': 'INT',
+    'TDHAPI': 'ULONG',
+    'URLCACHEAPI': 'DWORD',
+})
 
-    text = re.sub(
+
+API_MACROS_RULES = [
+    filter_rule(
         r"""\b(
+                BOOLAPI
+            |
+                PFAPIENTRY
+            |
+                SNMPAPI
+            |
+                TDHAPI
+            |
+                URLCACHEAPI
+            |
                 DWMAPI
             |
                 EXPORTAPI
@@ -487,11 +638,10 @@ def substitute_api_macors(text):
                 WINOLE(?:AUT)?API
             )\b
         """,
-        'HRESULT',
-        text,
-        flags=re.VERBOSE
-    )
-    text = re.sub(
+        substitute_keywords(API_MACROS_SUBSTITUTES),
+        flags=re.VERBOSE, literals=('API', 'STDMETHODIMP')
+    ),
+    filter_rule(
         r"""\b(?:
                 LWSTDAPIV?_
             |
@@ -506,10 +656,9 @@ def substitute_api_macors(text):
                 \(([^()]+(?:\([^()]*\))?[^()]*)\)
         """,
         r'\1',
-        text,
-        flags=re.VERBOSE
-    )
-    return text
+        flags=re.VERBOSE, literals=('API_', 'APIV_', 'STDMETHODIMP_')
+    ),
+]
 
 
 def filter_whitespaces(text):
@@ -517,15 +666,21 @@ def filter_whitespaces(text):
 
     Adds spaces around pointers, behind commas.
     """
-    text = re.sub(r'\s*\*\s*', ' * ', text)
-    text = re.sub(r'\*\s+\*', '**', text)
-    text = re.sub(r'\*\s+\*', '**', text)  # need for 3+ pointers
-    text = re.sub(r'\s*,\s*', ', ', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\s*\)\s*', ')', text)
-    text = re.sub(r'\s*\(\s*', '(', text)
-    text = re.sub(r'\s*\{\s*', '{ ', text)
-    text = re.sub(r'\s*\}\s*', ' }', text)
-    text = re.sub(r'\s*\[\s*', '[', text)
-    text = re.sub(r'\s*\]\s*', ']', text)
-    return text
+    return apply_filter_rules(text, WHITESPACES_RULES)
+
+
+WHITESPACES_RULES = [
+    # Pointers separated by whitespaces are joined: ' * * ' -> ' ** '.
+    filter_rule(
+        r'\s*\*(?:\s*\*)*\s*',
+        lambda m: ' ' + '*' * m.group(0).count('*') + ' ',
+        literals=('*',)),
+    # Whitespaces are unified before commas are handled, which gives the same
+    # result. Single spaces are left untouched.
+    filter_rule(r'\s\s+|[^\S ]', ' '),
+    filter_rule(r'\s*,\s*', ', ', literals=(',',)),
+    filter_rule(r'\s*([()])\s*', r'\1', literals=('(', ')')),
+    filter_rule(r'\s*\{\s*', '{ ', literals=('{',)),
+    filter_rule(r'\s*\}\s*', ' }', literals=('}',)),
+    filter_rule(r'\s*([\[\]])\s*', r'\1', literals=('[', ']')),
+]
@@ -0,0 +1,104 @@
+"""Incremental regeneration of JSONs with types info.
+
+Manifest remembers the state of every header from the previous run (mtime,
+size and hash of content) and a signature of inputs of every merged JSON.
+Only changed headers have to be extracted again and only JSONs with changed
+inputs have to be merged again.
+"""
+
+import hashlib
+import os
+
+from .io import load_json_file
+from .io import print_json_file
+
+
+def get_empty_manifest(extractor_version):
+    """Returns manifest with no headers and merged JSONs."""
+    return {'extractor_version': extractor_version, 'sources': {}, 'merges': {}}
+
+
+def load_manifest(manifest_file, extractor_version):
+    """Loads manifest from the previous run.
+
+    Manifest from other version of the extractor is useless, empty manifest
+    is returned instead.
+    """
+    try:
+        manifest = load_json_file(manifest_file)
+    except (OSError, ValueError):
+        return get_empty_manifest(extractor_version)
+    if manifest.get('extractor_version') != extractor_version:
+        return get_empty_manifest(extractor_version)
+    return manifest
+
+
+def save_manifest(manifest_file, manifest):
+    """Saves manifest so that interrupted saving leaves the old one intact."""
+    tmp_file = manifest_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        print_json_file(f, manifest, indent=1)
+    os.replace(tmp_file, manifest_file)
+
+
+def get_file_hash(file_path):
+    """Returns SHA1 hash of file's content."""
+    file_hash = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def get_source_headers(manifest, source, path):
+    """Returns states of headers from source in manifest.
+
+    States are forgotten when the source is on other path than before.
+    """
+    source_info = manifest['sources'].get(source)
+    if source_info is None or source_info['path'] != path:
+        source_info = {'path': path, 'headers': {}}
+        manifest['sources'][source] = source_info
+    return source_info['headers']
+
+
+def update_header_states(headers, states):
+    """Compares headers with their states from the previous run.
+
+    headers maps relative paths of headers to their paths. Hashes are
+    computed only for headers with changed mtime or size. states are updated
+    to the current state of headers.
+
+    Returns lists of changed (or new) and removed headers' relative paths.
+    """
+    changed = []
+    for rel_path, header in sorted(headers.items()):
+        stat = os.stat(header)
+        state = states.get(rel_path)
+        if (state is not None and state['mtime'] == stat.st_mtime_ns and
+                state['size'] == stat.st_size):
+            continue
+        header_hash = get_file_hash(header)
+        if state is None or state['hash'] != header_hash:
+            changed.append(rel_path)
+        states[rel_path] = {
+            'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': header_hash
+        }
+    removed = sorted(set(states) - set(headers))
+    for rel_path in removed:
+        del states[rel_path]
+    return changed, removed
+
+
+def get_merge_signature(json_files, options):
+    """Returns signature of merge inputs.
+
+    json_files is a list of input dirs and JSON files from them in order of
+    merging. Signature covers their names, hashes and merge options.
+    """
+    signature = hashlib.sha1(repr(options).encode('utf-8'))
+    for input_dir, json_file in json_files:
+        signature.update(input_dir.encode('utf-8') + b'\0')
+        signature.update(os.path.relpath(json_file, input_dir).encode('utf-8') + b'\0')
+        signature.update(get_file_hash(json_file).encode('utf-8'))
+    return signature.hexdigest()
@@ -1,14 +1,20 @@
 """I/O functions."""
 
 import json
-import re
+import mmap
 
+from .binary_format import BinaryDecoder
+from .binary_format import binary_to_content
+from .binary_format import content_to_binary
 from .json_types import convert_enums_to_type_for_json
 from .json_types import convert_func_types_to_type_for_json
 from .json_types import convert_structs_to_type_for_json
 from .json_types import convert_typedefs_to_type_for_json
 from .json_types import convert_unions_to_type_for_json
 from .lti_types import LTI_TYPES
+from .regex_registry import get_regex
+from .remove_json_types import add_types_to_new_types
+from .remove_json_types import get_func_referenced_types
 
 
 def read_text_file(file_path):
@@ -19,12 +25,99 @@ def read_text_file(file_path):
         return f.read()
 
 
+def read_names_file(file_path):
+    """Returns names from file with one name per line. Empty lines and lines
+    starting with # are skipped.
+    """
+    names = []
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                names.append(line)
+    return names
+
+
 def load_json_file(json_file):
     """Loads the data from the given json file, returns them as dict."""
     with open(json_file, 'r') as j_file:
         return json.load(j_file)
 
 
+def load_binary_file(bin_file):
+    """Loads the data from the given file in the binary format, returns them
+    as dict.
+    """
+    with open(bin_file, 'rb') as b_file:
+        return binary_to_content(b_file.read())
+
+
+def print_binary_file(f_out, content):
+    """Prints content in the binary format to f_out opened in binary mode."""
+    f_out.write(content_to_binary(content))
+
+
+class TypeDatabaseReader(object):
+    """Reads functions and types from a file in the binary format on request.
+
+    The file is memory-mapped. Functions and types are found by binary search
+    in indexes of their sorted keys, only the requested ones are decoded.
+    """
+
+    def __init__(self, bin_file):
+        with open(bin_file, 'rb') as b_file:
+            self.data = mmap.mmap(b_file.fileno(), 0, access=mmap.ACCESS_READ)
+        sections = BinaryDecoder(self.data).get_sections()
+        self.functions = sections['functions']
+        self.types = sections['types']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.functions = self.types = None
+        self.data.close()
+
+    def get_function(self, name):
+        """Returns function with the given name, None if there is no such."""
+        return self.functions.get(name)
+
+    def get_type(self, type_key):
+        """Returns type with the given key, None if there is no such."""
+        return self.types.get(type_key)
+
+    def get_function_names(self):
+        """Returns names of all functions in sorted order."""
+        return self.functions.keys()
+
+    def get_functions_with_types(self, names):
+        """Returns content with the given functions and all types they use,
+        directly or through other types.
+        """
+        functions = {name: self.functions[name] for name in names}
+        types = {}
+        for func in functions.values():
+            add_types_to_new_types(get_func_referenced_types(func), self.types.__getitem__, types)
+        return types_functions_to_json(types, functions)
+
+
+def convert_json_file_to_binary(json_file, bin_file):
+    """Converts json file to file in the binary format."""
+    content = load_json_file(json_file)
+    with open(bin_file, 'wb') as f_out:
+        print_binary_file(f_out, content)
+
+
+def convert_binary_file_to_json(bin_file, json_file, indent=4):
+    """Converts file in the binary format to json file."""
+    content = load_binary_file(bin_file)
+    with open(json_file, 'w') as f_out:
+        print_json_file(f_out, content, indent)
+
+
 def types_functions_to_json(json_types, functions):
     """Creates string for JSON output from types and functions."""
     return {'functions': functions, 'types': json_types}
@@ -36,24 +129,117 @@ def print_types_functions_json(f_out, json_types, functions, indent=4):
 
 
 def print_json_file(f_out, content, indent=4, sort_keys=True):
-    print(
-        json.dumps(content, default=JSONHandler, indent=indent, sort_keys=sort_keys),
-        file=f_out
-    )
+    """Prints content as JSON to f_out.
 
+    Indented JSON is written while it is being encoded, it is never in memory
+    as a whole. JSON without indentation is encoded at once by the faster C
+    encoder, which does not support indentation.
+    """
+    if indent is None:
+        f_out.write(json.dumps(content, default=JSONHandler, sort_keys=sort_keys))
+    else:
+        encoder = json.JSONEncoder(default=JSONHandler, indent=indent, sort_keys=sort_keys)
+        f_out.writelines(encoder.iterencode(content))
+    f_out.write('\n')
 
-def print_types_info_json(f_out, functions, typedefs, structs, unions, enums, indent=4):
-    """JSON output for types and functions."""
+
+def json_entry_to_str(key, value, indent=4, level=1):
+    """Returns "key": value pair as it is nested at the given level of
+    a document printed by print_json_file.
+    """
+    prefix = '\n' + get_json_indent_str(indent) * level if indent is not None else ''
+    value = json.dumps(value, default=JSONHandler, indent=indent, sort_keys=True)
+    return json.dumps(key) + ': ' + value.replace('\n', prefix)
+
+
+def print_json_sections(f_out, sections, indent=4):
+    """Prints dictionary of dictionaries without having it in memory.
+
+    sections is a list of pairs (key, entries), where entries are iterables
+    of entries already converted by json_entry_to_str with level=2. Keys of
+    sections and entries have to be sorted. Output is the same as from
+    print_json_file.
+    """
+    if indent is None:
+        outer, inner, separator = '', '', ', '
+    else:
+        indent_str = get_json_indent_str(indent)
+        outer, inner, separator = '\n' + indent_str, '\n' + indent_str * 2, ','
+    f_out.write('{')
+    for i, (key, entries) in enumerate(sections):
+        f_out.write(separator if i else '')
+        f_out.write(outer + json.dumps(key) + ': {')
+        empty = True
+        for entry in entries:
+            f_out.write((inner if empty else separator + inner) + entry)
+            empty = False
+        f_out.write('}' if empty else outer + '}')
+    f_out.write(('\n' if indent is not None and sections else '') + '}\n')
+
+
+def get_json_indent_str(indent):
+    """Returns string used by json module for one level of indentation."""
+    return ' ' * indent if isinstance(indent, int) else indent
+
+
+def get_json_types(functions, typedefs, structs, unions, enums):
+    """Returns json types of all types and functions."""
     json_types = {}
     convert_typedefs_to_type_for_json(typedefs, json_types)
     convert_enums_to_type_for_json(enums, json_types)
     convert_func_types_to_type_for_json(functions, json_types)
     convert_structs_to_type_for_json(structs, json_types)
     convert_unions_to_type_for_json(unions, json_types)
+    return json_types
+
 
+def print_types_info_json(f_out, functions, typedefs, structs, unions, enums, indent=4):
+    """JSON output for types and functions."""
+    json_types = get_json_types(functions, typedefs, structs, unions, enums)
     print_types_functions_json(f_out, json_types, functions, indent)
 
 
+def print_types_info_bin(f_out, functions, typedefs, structs, unions, enums, indent=4):
+    """Output for types and functions in the binary format, f_out has to be
+    opened in binary mode. Content is the same as in JSON output.
+    """
+    json_types = get_json_types(functions, typedefs, structs, unions, enums)
+    print_types_functions_bin(f_out, json_types, functions, indent)
+
+
+def print_types_functions_bin(f_out, json_types, functions, indent=4):
+    print_binary_file(f_out, types_functions_to_json(json_types, functions))
+
+
+def print_types_info(outputs, functions, typedefs, structs, unions, enums, indent=4):
+    """Prints types and functions parsed once to outputs in several formats.
+
+    outputs are pairs (output format, output file). Conversion to json types
+    changes parsed functions and types, so text formats are printed first
+    and json types are converted once for all formats printed from them.
+    """
+    json_types = None
+    for out_format, f_out in sorted(outputs, key=lambda o: o[0] in JSON_TYPES_PRINTERS):
+        if out_format in TEXT_PRINTERS:
+            TEXT_PRINTERS[out_format](f_out, functions, typedefs, structs, unions, enums, indent)
+            continue
+        if json_types is None:
+            remove_vararg_params(functions)
+            json_types = get_json_types(functions, typedefs, structs, unions, enums)
+        JSON_TYPES_PRINTERS[out_format](f_out, json_types, functions, indent)
+
+
+def remove_vararg_params(functions):
+    """Removes '...' parameters that are added to vararg functions parsed for
+    text formats, json formats have just the vararg flag.
+    """
+    for f_info in functions.values():
+        params = f_info.params
+        if (f_info.has_vararg and params and params[-1].name_text == 'vararg' and
+                params[-1].type_text == '...'):
+            params.pop()
+
+
 def JSONHandler(obj):
     if hasattr(obj, 'repr_json'):
         return obj.repr_json()
@@ -87,7 +273,7 @@ def print_types_info_txt(f_out, functions, typedefs, structs, unions, enums, ide
         for p in f_info.params:
             f_out.write('Name: {}\t\ttype: {} {}'.format(p.name_text,
                         p.type_text, p.annotations_text) + '\n')
-        if f_info.vararg:
+        if f_info.has_vararg:
             f_out.write('Varargs: True' + '\n')
         f_out.write('\n')
 
@@ -128,28 +314,42 @@ def str_types_sub(type_text, name):
 
 def array_sub(type_text):
     """Creates lti format of arrays e.g. 'type [N]' =>  '[N x type]'."""
-    num = re.search(r'\[(\d+)\]', type_text)
+    num = get_regex(r'\[(\d+)\]').search(type_text)
     if num is None:
         return type_text
-    type_text = re.sub(r'\s*\[.*\]', '', type_text)
+    type_text = get_regex(r'\s*\[.*\]').sub('', type_text)
     num = num.group(1)
     return '[' + num + ' x ' + str_types_sub_no_array(type_text) + ']'
 
 
 def str_types_sub_no_array(type_text):
     """Creates lti format for types, expect no arrays."""
-    type_text = re.sub(r'const', ' ', type_text).strip()
-    type_text = re.sub(r'(un)?signed', ' ', type_text).strip()
+    type_text = get_regex(r'const').sub(' ', type_text).strip()
+    type_text = get_regex(r'(un)?signed').sub(' ', type_text).strip()
     if type_text in LTI_TYPES.keys():
         return LTI_TYPES[type_text]
 
     if '*' in type_text:
-        type_text_nptr = re.sub(r'\s*\*+\s*', '', type_text)
+        type_text_nptr = get_regex(r'\s*\*+\s*').sub('', type_text)
         if type_text_nptr in LTI_TYPES.keys():
             return LTI_TYPES[type_text_nptr] + '*' * type_text.count('*')
 
     return ''.join([types_sub(item) for item in type_text.split(' ')])
 
 
+BINARY_OUTPUT_FORMATS = {'bin'}
+
+# Formats printed from parsed types and functions as they are and formats
+# printed from json types, see print_types_info().
+TEXT_PRINTERS = {
+    'txt': print_types_info_txt,
+    'lti': print_types_info_lti,
+}
+JSON_TYPES_PRINTERS = {
+    'json': print_types_functions_json,
+    'bin': print_types_functions_bin,
+}
+
+
 def get_output_format_options():
-    return ['txt', 'lti', 'json']
+    return ['txt', 'lti', 'json', 'bin']
@@ -2,7 +2,7 @@
 
 import enum
 import hashlib
-import re
+import logging
 
 from .common_types import COMMON_TYPES
 from .func_info import CALL_CONVENTIONS
@@ -11,6 +11,7 @@ from .parse_enums import Enum
 from .parse_structs_unions import CompositeType
 from .parse_structs_unions import Struct
 from .parse_structs_unions import Union
+from .regex_registry import get_regex
 
 
 PRIMITIVE_TYPES = {
@@ -96,14 +97,35 @@ class TYPES(enum.Enum):
 
 
 class BaseType:
-    """Base class implementing methods common for all types."""
+    """Base class implementing methods common for all types.
+
+    Attributes of types are in __slots__ of their classes. Hash of a type is
+    computed by get_type_hash() on the first access and cached, assignment to
+    any attribute drops the cached hash.
+    """
+
+    __slots__ = ('_type_hash',)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_type_hash', None)
+
+    @property
+    def type_hash(self):
+        type_hash = getattr(self, '_type_hash', None)
+        if type_hash is None:
+            type_hash = self.get_type_hash()
+            object.__setattr__(self, '_type_hash', type_hash)
+        return type_hash
 
     @property
     def type_text(self):
         return str(self.type)
 
     def repr_json(self):
-        return self.__dict__
+        return {
+            attr: getattr(self, attr) for attr in type(self).__slots__ if hasattr(self, attr)
+        }
 
     def __eq__(self, other):
         return self.type_hash == other.type_hash
@@ -112,14 +134,15 @@ class BaseType:
 class PrimitiveType(BaseType):
     """Representation of primitive data types."""
 
+    __slots__ = ('type', 'name', 'bit_width')
+
     def __init__(self, name='', bit_width=None):
         self.type = TYPES.FLOATING_POINT.value if name in FP_TYPES else TYPES.INTEGRAL.value
         self.name = name
         if bit_width:
             self.bit_width = bit_width
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.name)
 
     def __repr__(self):
@@ -127,11 +150,12 @@ class PrimitiveType(BaseType):
 
 
 class VoidType(BaseType):
+    __slots__ = ('type',)
+
     def __init__(self):
         self.type = TYPES.VOID.value
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.type)
 
     def __repr__(self):
@@ -141,12 +165,13 @@ class VoidType(BaseType):
 class PointerType(BaseType):
     """Representation of pointer types."""
 
+    __slots__ = ('type', 'pointed_type')
+
     def __init__(self, pointed_type):
         self.type = TYPES.POINTER.value
         self.pointed_type = pointed_type.type_hash
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.type + self.pointed_type)
 
     def __repr__(self):
@@ -157,6 +182,8 @@ class PointerType(BaseType):
 class TypedefedType(BaseType):
     """Representation of typedefed types."""
 
+    __slots__ = ('type', 'name', 'typedefed_type')
+
     default = 'unknown'
 
     def __init__(self, name='', typedefed_type=None):
@@ -167,8 +194,7 @@ class TypedefedType(BaseType):
         else:
             self.typedefed_type = typedefed_type.type_hash
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.type + self.name)
 
     @property
@@ -187,6 +213,8 @@ class TypedefedType(BaseType):
 class QualifierType(BaseType):
     """Representation of type qualifiers const/restrict/volatile."""
 
+    __slots__ = ('type', 'name', 'modified_type')
+
     def __init__(self, name='', modified_type=None):
         self.type = TYPES.QUALIFIER.value
         self.name = name
@@ -195,8 +223,7 @@ class QualifierType(BaseType):
         else:
             self.modified_type = ''
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.type + self.name + self.modified_type)
 
     def __repr__(self):
@@ -207,13 +234,14 @@ class QualifierType(BaseType):
 class StructType(BaseType):
     """Representation of struct types."""
 
+    __slots__ = ('type', 'name', 'members')
+
     def __init__(self, name='', members=None):
         self.type = TYPES.STRUCT.value
         self.name = 'struct ' + name
         self.members = members if members is not None else []
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.name)
 
     @property
@@ -228,13 +256,14 @@ class StructType(BaseType):
 class UnionType(BaseType):
     """Representation of union types."""
 
+    __slots__ = ('type', 'name', 'members')
+
     def __init__(self, name='', members=None):
         self.type = TYPES.UNION.value
         self.name = 'union ' + name
         self.members = members if members is not None else []
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.name)
 
     @property
@@ -249,6 +278,8 @@ class UnionType(BaseType):
 class FunctionType(BaseType):
     """Representation of functions as parameters."""
 
+    __slots__ = ('type', 'ret_type', 'params', 'vararg', 'call_conv')
+
     def __init__(self, ret_type, params=None, vararg=None, call_conv=None):
         self.type = TYPES.FUNCTION.value
         self.ret_type = ret_type.type_hash
@@ -258,8 +289,7 @@ class FunctionType(BaseType):
         if call_conv:
             self.call_conv = call_conv
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         hash_source = self.type + self.ret_type + str(self.params)
         hash_source += str(getattr(self, 'vararg', ''))
         hash_source += getattr(self, 'call_conv', '')
@@ -273,13 +303,14 @@ class FunctionType(BaseType):
 class ArrayType(BaseType):
     """Representation of arrays."""
 
+    __slots__ = ('type', 'element_type', 'dimensions')
+
     def __init__(self, element_type, dimensions=None):
         self.type = TYPES.ARRAY.value
         self.element_type = element_type.type_hash
         self.dimensions = dimensions if dimensions is not None else []
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         return hash_function(self.type + self.element_type +
                              str(self.dimensions))
 
@@ -291,13 +322,14 @@ class ArrayType(BaseType):
 class EnumType(BaseType):
     """Representation of enums."""
 
+    __slots__ = ('type', 'name', 'items')
+
     def __init__(self, name='', items=None):
         self.type = TYPES.ENUM.value
         self.name = 'enum ' + name
         self.items = items if items is not None else []
 
-    @property
-    def type_hash(self):
+    def get_type_hash(self):
         if self.name != 'enum ':
             return hash_function(self.name)
         else:
@@ -308,11 +340,82 @@ class EnumType(BaseType):
             self.__class__.__name__, self.name, self.items)
 
 
-def hash_function(str):
+class ParsedTypesCache:
+    """Cache of types parsed from type texts.
+
+    For every text, the parsed type and types added to types while parsing it
+    are kept, so parsing of a repeated text is one lookup.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, type_text, types):
+        """Returns type parsed from type_text, adds its subtypes to types."""
+        entry = self.entries.get(type_text)
+        if entry is None:
+            self.misses += 1
+            new_types = {}
+            t = parse_type_text_to_type_for_json(type_text, new_types)
+            entry = self.entries[type_text] = (t, tuple(new_types.items()))
+        else:
+            self.hits += 1
+        t, new_types = entry
+        for type_hash, new_t in new_types:
+            if type_hash not in types:
+                types[type_hash] = new_t
+        return t
+
+    def log_stats(self):
+        logging.info('Parsed types cache: {} hits, {} misses'.format(self.hits, self.misses))
+
+
+# Types are parsed in one process for many headers, cache is shared by them.
+PARSED_TYPES_CACHE = ParsedTypesCache()
+
+
+def sha1_key(str):
     """Returns SHA1 hash of string."""
     return hashlib.sha1(str.encode('utf-8')).hexdigest()
 
 
+def blake2b_64_key(str):
+    """Returns 64-bit BLAKE2b hash of string."""
+    return hashlib.blake2b(str.encode('utf-8'), digest_size=8).hexdigest()
+
+
+STRUCTURAL_ID_MAX_LEN = 32
+
+
+def structural_id_key(str):
+    """Returns string itself when it is short, '#' and its 64-bit BLAKE2b hash
+    otherwise. Strings describing types never start with '#'.
+    """
+    if len(str) <= STRUCTURAL_ID_MAX_LEN:
+        return str
+    return '#' + blake2b_64_key(str)
+
+
+KEY_SCHEMES = {
+    'sha1': sha1_key,
+    'blake2b-64': blake2b_64_key,
+    'structural-id': structural_id_key,
+}
+
+# Returns key of type from string describing the type.
+hash_function = sha1_key
+
+
+def set_key_scheme(scheme):
+    """Sets scheme of keys of types, one of KEY_SCHEMES."""
+    global hash_function
+    hash_function = KEY_SCHEMES[scheme]
+    # Cached types have keys in the previous scheme.
+    PARSED_TYPES_CACHE.entries.clear()
+
+
 def convert_func_types_to_type_for_json(functions, types):
     """Converts parameters and return type of function declaration to json representation."""
     for name, f_info in functions.items():
@@ -374,6 +477,11 @@ def parse_type_to_type_for_json(str, types):
         t = parse_enum_to_type_for_json(str, types)
         return t
 
+    return PARSED_TYPES_CACHE.parse(str, types)
+
+
+def parse_type_text_to_type_for_json(str, types):
+    """Parses type given by text to json representation."""
     if str == 'void':
         return VoidType()
 
@@ -443,7 +551,7 @@ def get_primitive_type_or_typedef(splitted_type):
 
 def parse_primitive_type(type_name):
     """Searches bit width in types, where we are sure that it's fixed."""
-    bitWidth = re.search(r'^(?:__)?u?int(8|16|32|64)(?:_t)?$', type_name)
+    bitWidth = get_regex(r'^(?:__)?u?int(8|16|32|64)(?:_t)?$').search(type_name)
     if bitWidth:
         return PrimitiveType(type_name, int(bitWidth.group(1)))
     return PrimitiveType(type_name)
@@ -488,7 +596,7 @@ def parse_array_type(str, types):
 
 def get_array_dimensions(dimensions):
     """Returns list of all dimensions."""
-    dimensions = re.sub(r'^\[|\]$', '', dimensions).split('][')
+    dimensions = get_regex(r'^\[|\]$').sub('', dimensions).split('][')
     return [int(d) if d.isdigit() else d for d in dimensions]
 
 
@@ -513,7 +621,7 @@ def parse_composite_type_to_json_type(comp_type, types, json_type=StructType):
         if comp_type.name_text:
             sub_t = json_type(comp_type.name_text, comp_type.members_list)
         else:  # not best solution for unique typedef union { }x;
-            unique_name = re.sub(r'\s*\*\s*|, ', '_', comp_type.type_name_text)
+            unique_name = get_regex(r'\s*\*\s*|, ').sub('_', comp_type.type_name_text)
             sub_t = json_type('_TYPEDEF_' + unique_name, comp_type.members_list)
         types[sub_t.type_hash] = sub_t
         t = parse_typedefs_to_json_type(comp_type.type_name_text, sub_t, types)
@@ -540,7 +648,7 @@ def check_name_of_nested_composite_type(type, param_name, parent):
             parent_name = parent.name_text
         else:
             parent_name = parent.type_name_text
-            parent_name = re.sub(r'\s*\*\s*|, ', '_', parent_name)
+            parent_name = get_regex(r'\s*\*\s*|, ').sub('_', parent_name)
         type.name = '_LOCAL_' + parent_name + '_' + param_name
 
 
@@ -567,12 +675,12 @@ def parse_func_as_param_to_type_for_json(str, types):
     if ret_type.type_hash not in types:
         types[ret_type.type_hash] = ret_type
 
-    func_str = re.sub(r'.*?\(', '(', str, count=1)
+    func_str = get_regex(r'.*?\(').sub('(', str, count=1)
     is_pointer = False
     if func_str.startswith('(*)'):
         is_pointer = True
         func_str = func_str[3:]
-    call_conv_and_params = re.search(r'^\(\s*(\w*\s*?\*?)\s*\)(\(.*\))', func_str)
+    call_conv_and_params = get_regex(r'^\(\s*(\w*\s*?\*?)\s*\)(\(.*\))').search(func_str)
     call_conv = None
     if call_conv_and_params:
         func_str = call_conv_and_params.group(2)
@@ -634,4 +742,4 @@ def parse_typedef_to_type_for_json(typedef, types):
 
 def valid_typedef_name(name):
     """Valid typedef name cannot contain spaces. Also ignore names of primitive types."""
-    return re.search(r'^[_a-zA-Z]\w*$', name) and name not in PRIMITIVE_TYPES
+    return get_regex(r'^[_a-zA-Z]\w*$').search(name) and name not in PRIMITIVE_TYPES
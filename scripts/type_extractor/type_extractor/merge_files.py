@@ -4,25 +4,68 @@ from .io import load_json_file
 from .json_types import TYPES
 
 
-def typedef_loops_with_already_inserted_typedefs(new_type, merged_types):
-    """Checks if new type would create circular typedefs in merged_types."""
-    if new_type['typedefed_type'] not in merged_types:
-        return False
-    aliased_type = merged_types[new_type['typedefed_type']]
-    new_type_name = new_type['name']
-
-    while aliased_type['type'] == TYPES.TYPEDEF.value:
-        if new_type_name == aliased_type['name']:
-            return True
-        if aliased_type['typedefed_type'] not in merged_types:
-            return False
-        aliased_type = merged_types[aliased_type['typedefed_type']]
-
-    return False
-
-
-def choose_one_type(existing_type, new_type, merged):
-    """Chooses one representation of data type when they are duplicit."""
+class TypedefChainRoots(object):
+    """Finds ends of chains of typedefs in merged types.
+
+    A chain goes from a type through typedefed types and ends in a type that
+    is not a typedef, a typedef to unknown type or a missing type. Merging
+    only replaces typedefs to unknown types, so chains only grow at their
+    ends and a type found on a chain stays on it. Found ends are kept as
+    shortcuts (parents with path compression, as in union-find) and a chain
+    is followed from its cached end only.
+    """
+
+    def __init__(self, types):
+        self.types = types
+        self.shortcuts = {}
+
+    def get_typedefed_type(self, type_key):
+        t_type = self.types.get(type_key)
+        if (t_type is None or t_type['type'] != TYPES.TYPEDEF.value or
+                t_type['typedefed_type'] == 'unknown'):
+            return None
+        return t_type['typedefed_type']
+
+    def find(self, type_key):
+        """Returns key of the last type in the chain starting at type_key.
+
+        A chain that loops ends before it would visit a type again.
+        """
+        path = [type_key]
+        visited = {type_key}
+        while True:
+            next_key = self.shortcuts.get(type_key)
+            if next_key is None:
+                next_key = self.get_typedefed_type(type_key)
+            if next_key is None or next_key in visited:
+                break
+            type_key = next_key
+            path.append(type_key)
+            visited.add(type_key)
+        for k in path[:-1]:
+            self.shortcuts[k] = type_key
+        return type_key
+
+
+def typedef_loops_with_already_inserted_typedefs(new_type, merged_types, chain_roots=None):
+    """Checks if new type would create circular typedefs in merged_types.
+
+    Keys of typedefs are given by their names, so the new typedef replaces
+    the typedef to unknown type with its name, which ends every chain that
+    goes through it.
+    """
+    if chain_roots is None:
+        chain_roots = TypedefChainRoots(merged_types)
+    root = merged_types.get(chain_roots.find(new_type['typedefed_type']))
+    return (root is not None and root['type'] == TYPES.TYPEDEF.value and
+            root['name'] == new_type['name'])
+
+
+def choose_one_type(existing_type, new_type, merged, chain_roots=None):
+    """Chooses one representation of data type when they are duplicit.
+
+    chain_roots is TypedefChainRoots of merged, it can be kept between calls.
+    """
     if existing_type['type'] == TYPES.STRUCT.value:    # they should be of the same type
         if not existing_type['members']:   # we want struct with members
             return new_type                # not the one used as e.g. func parameter
@@ -38,7 +81,7 @@ def choose_one_type(existing_type, new_type, merged):
     if (existing_type['type'] == TYPES.TYPEDEF.value and
             new_type['type'] == TYPES.TYPEDEF.value):
         if existing_type['typedefed_type'] == 'unknown':
-            if typedef_loops_with_already_inserted_typedefs(new_type, merged):
+            if typedef_loops_with_already_inserted_typedefs(new_type, merged, chain_roots):
                 return existing_type
             else:
                 return new_type
@@ -46,10 +89,13 @@ def choose_one_type(existing_type, new_type, merged):
     return existing_type  # not typedef or struct - types are same
 
 
-def merge_types(merged, new):
+def merge_types(merged, new, chain_roots=None):
+    if chain_roots is None:
+        chain_roots = TypedefChainRoots(merged)
     for type_hash, t_type in new.items():
         if type_hash in merged:
-            merged[type_hash] = choose_one_type(merged[type_hash], t_type, merged)
+            merged[type_hash] = choose_one_type(
+                merged[type_hash], t_type, merged, chain_roots)
         else:
             merged[type_hash] = t_type
 
@@ -60,9 +106,9 @@ def merge_functions(merged, new):
             merged[func_name] = func
 
 
-def merge_json_file(merged_types, merged_functions, json_file):
+def merge_json_file(merged_types, merged_functions, json_file, chain_roots=None):
     content = load_json_file(json_file)
     types = content['types']
     functions = content['functions']
-    merge_types(merged_types, types)
+    merge_types(merged_types, types, chain_roots)
     merge_functions(merged_functions, functions)
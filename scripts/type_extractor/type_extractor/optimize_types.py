@@ -0,0 +1,43 @@
+"""Optimizes types in JSON in one pass over them.
+
+Keys of types are substituted with natural numbers, references to qualifier
+types with references to the types they qualify and qualifier types are
+removed. Output is the same as from substitute_json_keys_with_natural_numbers()
+followed by remove_qualifier_json_types(), which walk all types twice.
+"""
+
+from .json_types import TYPES
+from .substitute_json_keys import generate_new_keys
+from .substitute_json_keys import substitute_keys_in_functions
+from .substitute_json_keys import substitute_type_keys
+
+
+def optimize_json_types(content):
+    """Optimizes types in content in place."""
+    old_types = content['types']
+    new_keys = generate_new_keys(old_types)
+    ref_keys = dict(new_keys)
+    qualifier = TYPES.QUALIFIER.value
+    for k, t in old_types.items():
+        if t['type'] == qualifier:
+            ref_keys[k] = new_keys[get_qualified_type(t, old_types)]
+
+    substitute_keys_in_functions(content['functions'], ref_keys)
+    new_types = {}
+    for k, t in old_types.items():
+        if t['type'] != qualifier:
+            substitute_type_keys(t, ref_keys)
+            new_types[new_keys[k]] = t
+    content['types'] = new_types
+
+
+def get_qualified_type(qualifier_type, types):
+    """Returns key of the first non qualifier type modified by qualifier_type.
+
+    E.g. for 'const restrict int' it is the key of 'int'.
+    """
+    modified_type = qualifier_type['modified_type']
+    while (modified_type in types and
+            types[modified_type]['type'] == TYPES.QUALIFIER.value):
+        modified_type = types[modified_type]['modified_type']
+    return modified_type
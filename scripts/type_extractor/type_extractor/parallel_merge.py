@@ -0,0 +1,85 @@
+"""Merges json files in parallel worker processes.
+
+Consecutive json files are merged in workers and the partial results are
+merged in pairs, earlier part first, until one result is left. This gives
+the same result as merging files one by one for all types except typedefs:
+whether an unknown typedef is replaced depends on typedefs merged before it
+(typedef loops check). Partial results therefore also keep all typedefs in
+the order they were merged and final typedefs are chosen by merging them
+once more in that order. Other types never influence typedef choices.
+"""
+
+import multiprocessing
+
+from .io import load_json_file
+from .json_types import TYPES
+from .merge_files import TypedefChainRoots
+from .merge_files import merge_functions
+from .merge_files import merge_types
+
+
+def merge_json_files_part(json_files):
+    """Merges json files one by one.
+
+    Returns merged types, functions and list of all typedefs in order.
+    """
+    types = {}
+    functions = {}
+    typedefs = []
+    chain_roots = TypedefChainRoots(types)
+    for json_file in json_files:
+        content = load_json_file(json_file)
+        merge_types(types, content['types'], chain_roots)
+        merge_functions(functions, content['functions'])
+        typedefs.extend(
+            (k, t) for k, t in content['types'].items()
+            if t['type'] == TYPES.TYPEDEF.value
+        )
+    return types, functions, typedefs
+
+
+def merge_parts(parts):
+    """Merges results of two consecutive parts, the first one has priority."""
+    (types, functions, typedefs), (new_types, new_functions, new_typedefs) = parts
+    merge_types(types, new_types)
+    merge_functions(functions, new_functions)
+    typedefs.extend(new_typedefs)
+    return types, functions, typedefs
+
+
+def merge_typedefs(typedefs):
+    """Merges typedefs in the given order."""
+    merged = {}
+    chain_roots = TypedefChainRoots(merged)
+    for type_hash, t_type in typedefs:
+        merge_types(merged, {type_hash: t_type}, chain_roots)
+    return merged
+
+
+def split_to_parts(items, count):
+    """Splits items to count consecutive parts of similar length."""
+    count = max(1, min(count, len(items)))
+    size, rest = divmod(len(items), count)
+    parts = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < rest else 0)
+        parts.append(items[start:end])
+        start = end
+    return parts
+
+
+def merge_json_files_parallel(json_files, jobs):
+    """Merges json files with the same result as merge_json_file called on
+    them one by one. Returns merged types and functions.
+    """
+    with multiprocessing.Pool(jobs) as pool:
+        parts = pool.map(merge_json_files_part, split_to_parts(json_files, jobs))
+        while len(parts) > 1:
+            merged = pool.map(merge_parts, zip(parts[0::2], parts[1::2]))
+            if len(parts) % 2:
+                merged.append(parts[-1])
+            parts = merged
+    types, functions, typedefs = parts[0]
+    types.update(merge_typedefs(typedefs))
+    return types, functions
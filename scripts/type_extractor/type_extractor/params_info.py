@@ -1,7 +1,7 @@
 """Representation of functions' and structs' parameters."""
 
-import re
-
+from .regex_registry import get_formatted_regex
+from .regex_registry import get_regex
 from .utils import object_attr_string_repr
 
 ANNOTATIONS = {
@@ -71,7 +71,7 @@ class Param:
         for annot in self.type.split(' '):
             if annot in ANNOTATIONS:
                 found_annots.append('_opt_' if annot == 'OPTIONAL' else annot)
-                self.type = re.sub(r'\b%s\b' % annot, '', self.type, 1).strip()
+                self.type = get_formatted_regex(r'\b{}\b', annot).sub('', self.type, 1).strip()
         if found_annots:
             self.annotations = ' '.join(found_annots)
             if self.annotations == 'IN OUT' or self.annotations == 'OUT IN':
@@ -82,13 +82,13 @@ class Param:
 
         In function 'parse_func_parameters' they are part of param name
         """
-        array = re.search(r'\[.*\]', self.name)
+        array = get_regex(r'\[.*\]').search(self.name)
         self.type = self.type + ' ' + array.group(0)
-        self.name = re.sub(r'\[.*\]', '', self.name)
+        self.name = get_regex(r'\[.*\]').sub('', self.name)
 
     def parse_param_size(self):
         """Gets size of parameter in bit fields in structs."""
-        size = re.search(r'\d+$', self.type)
+        size = get_regex(r'\d+$').search(self.type)
         if size:
             self.size = size.group(0)
         self.type = self.type[:self.type_text.rfind(':')].strip()
@@ -100,7 +100,7 @@ class Param:
 
         Can occur only in structs/union parsing.
         """
-        vars_type = re.search(r'([^,]+)\s\w+,', self.type_text)
+        vars_type = get_regex(r'([^,]+)\s\w+,').search(self.type_text)
         if vars_type is not None:
             vars_type = vars_type.group(1).strip()
             self.type += ','
@@ -178,8 +178,42 @@ def split_param_to_type_and_name(param):
     return ' '.join(split[:-1]), split[-1]
 
 
+# Characters split_params() looks at.
+PARAMS_DELIMITERS_RE = get_regex(r'[(),]')
+
+
 def split_params(s):
-    """Parameters separated by comma. Returns list of parameters."""
+    """Parameters separated by comma. Returns list of parameters.
+
+    Commas in parentheses do not separate parameters. Only commas and
+    parentheses are visited, parameters are sliced from s.
+    """
+    if '(' not in s and ')' not in s:
+        return [p.strip() for p in s.split(',')]
+    parts = []
+    bracket_level = 0
+    start = 0
+    for m in PARAMS_DELIMITERS_RE.finditer(s):
+        c = m.group()
+        if c == ',':
+            if bracket_level == 0:
+                parts.append(s[start:m.start()].strip())
+                start = m.end()
+        elif c == '(':
+            bracket_level += 1
+        else:
+            bracket_level -= 1
+    # The last parameter is separated by the end of s, unless it is in
+    # unbalanced parentheses.
+    if bracket_level == 0:
+        parts.append(s[start:].strip())
+    return parts
+
+
+def split_params_by_chars(s):
+    """Reference implementation of split_params() going through all
+    characters of s.
+    """
     parts = []
     bracket_level = 0
     current = []
@@ -201,25 +235,28 @@ def parse_function_type(func_type):
     to type and name and returns it as Param object.
     """
     # T (*f)(...)
-    ret_type_and_name = re.search(r'^[\w\s*]+\(\*\s*(\w*)\s*\)\(', func_type)
+    ret_type_and_name = get_regex(r'^[\w\s*]+\(\*\s*(\w*)\s*\)\(').search(func_type)
     if ret_type_and_name:
         fname = ret_type_and_name.group(1)
-        func_type = re.sub(r'^([\w\s*]+\(\*)\s*%s\s*(?=\)\()' % fname, r'\1', func_type, 1)
+        func_type = get_formatted_regex(r'^([\w\s*]+\(\*)\s*{}\s*(?=\)\()', fname).sub(
+            r'\1', func_type, 1)
         return Param(fname, func_type)
 
     # T (call_convention *f)(...)
     # T (call_convention f)(...)
     # T (f)(...)
-    ret_type_and_name = re.search(r'^[\w\s*]+\([\s\w]*?\*?\s*(\w*)\s*\)\(', func_type)
+    ret_type_and_name = get_regex(r'^[\w\s*]+\([\s\w]*?\*?\s*(\w*)\s*\)\(').search(func_type)
     if ret_type_and_name:
         fname = ret_type_and_name.group(1)
-        func_type = re.sub(r'^([\w\s*]+\([\w\s]*\*?)\s*%s\s*(?=\)\()' % fname, r'\1', func_type, 1)
+        func_type = get_formatted_regex(r'^([\w\s*]+\([\w\s]*\*?)\s*{}\s*(?=\)\()', fname).sub(
+            r'\1', func_type, 1)
         return Param(fname, func_type)
 
     # T f(...)
-    ret_type_and_name = re.search(r'^[\w\s*]+\s(\w+)\s*\(', func_type)
+    ret_type_and_name = get_regex(r'^[\w\s*]+\s(\w+)\s*\(').search(func_type)
     if ret_type_and_name:
         fname = ret_type_and_name.group(1)
-        func_type = re.sub(r'^([\w\s*]+)\s%s\s*(?=\()' % fname, r'\1 ', func_type, 1)
+        func_type = get_formatted_regex(r'^([\w\s*]+)\s{}\s*(?=\()', fname).sub(
+            r'\1 ', func_type, 1)
         return Param(fname, func_type)
     return Param('', '')
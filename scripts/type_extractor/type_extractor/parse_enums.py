@@ -3,8 +3,7 @@
 Expect file content without comments and preprocessor definitions.
 """
 
-import re
-
+from .regex_registry import get_regex
 from .utils import object_attr_string_repr
 
 
@@ -77,18 +76,16 @@ class EnumItem:
 
 def get_all_enums(text):
     """Gets all enums from text."""
-    return re.findall(
-        r'(?:\btypedef)?\s*enum\s*(?:[\w]+)?\s*\{[^{}]+\}[\w\s,\*]*;',
-        text
-    )
+    return get_regex(
+        r'(?:\btypedef)?\s*enum\s*(?:[\w]+)?\s*\{[^{}]+\}[\w\s,\*]*;'
+    ).findall(text)
 
 
 def parse_enum(enum_str, hfile):
     """Returns enum object."""
-    found = re.search(
-        r'(\btypedef\b)?\s*enum\s*([\w]+)?(?::\s*\w*)?\s*\{(.+)\}([\w\s,\*]*);',
-        enum_str
-    )
+    found = get_regex(
+        r'(\btypedef\b)?\s*enum\s*([\w]+)?(?::\s*\w*)?\s*\{(.+)\}([\w\s,\*]*);'
+    ).search(enum_str)
     if not found:
         return Enum()
     name = found.group(2)
@@ -107,9 +104,8 @@ def parse_enum(enum_str, hfile):
     value = 0
     for item in enum_item:
         if '=' in item:
-            explicit_value = re.search(
-                r'=\s*([\+\-]?(?:0x[a-fA-F0-9]+|\d+))', item)
-            item = re.sub(r'\s*=.*', '', item)
+            explicit_value = get_regex(r'=\s*([\+\-]?(?:0x[a-fA-F0-9]+|\d+))').search(item)
+            item = get_regex(r'\s*=.*').sub('', item)
             if explicit_value is not None:
                 if 'x' in explicit_value.group(1):
                     value = int(explicit_value.group(1), 16)
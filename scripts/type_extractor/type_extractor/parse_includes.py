@@ -1,7 +1,6 @@
 """Parses header files, extract declarations of functions and struct, union, enum definitions."""
 
 import logging
-import re
 
 from .func_info import FuncInfo
 from .func_info import get_declarations
@@ -13,10 +12,10 @@ from .params_info import parse_func_parameters
 from .params_info import split_params
 from .parse_enums import get_all_enums
 from .parse_enums import parse_enum
-from .parse_structs_unions import get_all_structs
-from .parse_structs_unions import get_all_unions
+from .parse_structs_unions import get_all_structs_and_unions
 from .parse_structs_unions import parse_struct
 from .parse_structs_unions import parse_union
+from .regex_registry import get_regex
 
 
 def get_types_info_from_text(file, content, output):
@@ -24,10 +23,10 @@ def get_types_info_from_text(file, content, output):
     from input text.
     """
     content = use_filters(content)
-    unions_content = content
 
-    structs, content = parse_all_structs(content, file)
-    unions, unions_content = parse_all_unions(unions_content, file)
+    content, file_structs, file_unions = get_all_structs_and_unions(content)
+    structs = parse_all_structs(file_structs, file)
+    unions = parse_all_unions(file_unions, file)
     enums = parse_all_enums(content, file)
     typedefs = parse_typedefs(content)
     content = filter_oneline_typedefs(content)
@@ -38,11 +37,10 @@ def get_types_info_from_text(file, content, output):
     return functions, typedefs, structs, unions, enums
 
 
-def parse_all_structs(content, file):
-    """Gets structs' definitions from headers. Returns Struct objects in
-    dictionary and header content without structs.
+def parse_all_structs(file_structs, file):
+    """Parses structs' definitions from headers. Returns Struct objects in
+    dictionary.
     """
-    content, file_structs = get_all_structs(content)
     structs = {}
     for s in file_structs:
         struct_info = parse_struct(s, file)
@@ -60,15 +58,14 @@ def parse_all_structs(content, file):
                         structs[sname].header_text, structs[sname].members_list))
             else:
                 structs[sname] = struct_info
-    return structs, content
+    return structs
 
 
-def parse_all_unions(content, file):
-    """Get unions' definitions from headers.
+def parse_all_unions(file_unions, file):
+    """Parse unions' definitions from headers.
 
-    Return Union objects in dictionary and header content without unions.
+    Return Union objects in dictionary.
     """
-    content, file_unions = get_all_unions(content)
     unions = {}
     for u in file_unions:
         union_info = parse_union(u, file)
@@ -86,7 +83,7 @@ def parse_all_unions(content, file):
                         unions[uname].header_text, unions[uname].members_list))
             else:
                 unions[uname] = union_info
-    return unions, content
+    return unions
 
 
 def parse_all_functions(content, output, file):
@@ -108,7 +105,7 @@ def parse_all_functions(content, output, file):
                 varargs = True
                 params = params[:params.rfind(',')]
             params_list = parse_func_parameters(params)
-            if varargs and output != 'json':
+            if varargs and output not in ('json', 'bin'):
                 params_list.append(Param('vararg', '...'))
             finfo = FuncInfo(decl, name, file, ret, params_list, varargs, call_conv)
             finfo.delete_underscores_in_param_names()
@@ -135,6 +132,17 @@ def remove_unwanted_functions(functions):
     }
 
 
+T_TYPES_RE = get_regex(r'\b({})\b'.format('|'.join([
+    'LPCTSTR',
+    'PCTSTR',
+    'LPTSTR',
+    'PTSTR',
+    'TBYTE',
+    'PTBYTE',
+    'TCHAR',
+])))
+
+
 def is_wanted(func_info):
     """Do we want to include the given function in our extracted files?"""
     # We do not want to include generic Windows functions whose arguments or
@@ -142,16 +150,7 @@ def is_wanted(func_info):
     # binary files. Instead, their A/W variants are used, depending on whether
     # UNICODE was defined during compilation or not.
     def is_t_type(type):
-        t_types_re = r'\b({})\b'.format('|'.join([
-            'LPCTSTR',
-            'PCTSTR',
-            'LPTSTR',
-            'PTSTR',
-            'TBYTE',
-            'PTBYTE',
-            'TCHAR',
-        ]))
-        return re.search(t_types_re, type) is not None
+        return T_TYPES_RE.search(type) is not None
     if is_t_type(func_info.ret_type):
         return False
     for param in func_info.params:
@@ -161,7 +160,7 @@ def is_wanted(func_info):
     # Some functions look like declarations but are, in fact, just ordinary
     # sentences. We detect this heuristically by searching for declarations
     # that start with an uppercase letter and contain "the".
-    if re.fullmatch(r'[A-Z].*\bthe\b.*', func_info.decl):
+    if get_regex(r'[A-Z].*\bthe\b.*').fullmatch(func_info.decl):
         return False
 
     return True
@@ -183,25 +182,39 @@ def parse_typedefs(text):
 
     Parses them as function parameters - same syntax.
     """
-    typedefs = get_typedefs(text)
-    to_parse = []
-    for t_def in typedefs:
+    return list(iter_parsed_typedefs(text))
+
+
+def iter_parsed_typedefs(text):
+    """Yields parsed typedefs from text one by one, see parse_typedefs()."""
+    for t_def in iter_typedef_declarators(text):
+        if t_def.endswith(')'):
+            t_def = remove_brackets_around_pointer(t_def)
+        yield from parse_func_parameters(t_def)
+
+
+# Type of the first declarator in typedef with more declarators.
+TYPEDEF_TYPE_RE = get_regex(r'^([\w\s]+)?(?=\s+(?:\*|\w+|\(\*))')
+
+
+def iter_typedef_declarators(text):
+    """Yields typedefs from text with one declarator each.
+
+    'int a, *b' gives 'int a' and 'int *b'.
+    """
+    for t_def in get_typedefs(text):
         t_defs = split_params(t_def)
         if len(t_defs) == 0:
             continue
-        to_parse.append(t_defs[0])
+        yield t_defs[0]
         if len(t_defs) > 1:
-            t_type = re.search(r'^([\w\s]+)?(?=\s+(?:\*|\w+|\(\*))', t_defs[0])
+            t_type = TYPEDEF_TYPE_RE.search(t_defs[0])
             t_type = t_type.group(1) if t_type else ''
             for next_type in t_defs[1:]:
-                to_parse.append(t_type + ' ' + next_type)
+                yield t_type + ' ' + next_type
 
-    parsed = []
-    for t_def in to_parse:
-        if t_def.endswith(')'):
-            t_def = remove_brackets_around_pointer(t_def)
-        parsed = parsed + parse_func_parameters(t_def)
-    return parsed
+
+POINTER_IN_BRACKETS_RE = get_regex(r'\((\s*\*\s*\w+)\)(;?)$')
 
 
 def remove_brackets_around_pointer(ptr):
@@ -209,9 +222,12 @@ def remove_brackets_around_pointer(ptr):
     except pointer to function.
     'typedef int (*HANDLER);'
     """
-    return re.sub(r'\((\s*\*\s*\w+)\)(;?)$', r'\1\2', ptr)
+    return POINTER_IN_BRACKETS_RE.sub(r'\1\2', ptr)
+
+
+TYPEDEFS_RE = get_regex(r'typedef\s*([\w\s\*\[\]\(\),.+-/]+?)\s*;')
 
 
 def get_typedefs(text):
     """Gets typedefs from text except struct, union and enum typedefs."""
-    return re.findall('typedef\s*([\w\s\*\[\]\(\),.+-/]+?)\s*;', text)
+    return TYPEDEFS_RE.findall(text)
@@ -3,12 +3,12 @@
 Expects file content without comments and preprocessor definitions.
 """
 
-import re
 
 from .params_info import Param
 from .params_info import parse_one_param
 from .params_info import split_param_to_type_and_name
 from .parse_enums import parse_enum
+from .regex_registry import get_regex
 from .utils import object_attr_string_repr
 
 
@@ -68,7 +68,7 @@ class Union(CompositeType):
 
 
 def get_all_structs(text):
-    "Gets all struct definitions from text."""
+    """Gets all struct definitions from text."""
     return get_all_composite_types(text, 'struct')
 
 
@@ -77,36 +77,138 @@ def get_all_unions(text):
     return get_all_composite_types(text, 'union')
 
 
+def get_all_structs_and_unions(text):
+    """Gets all struct and union definitions from text in one pass.
+
+    Returns text without structs, structs and unions. Unions are searched in
+    the whole text, so unions defined inside structs are found as well.
+    """
+    found = find_composite_types(text, ('struct', 'union'))
+    return found['struct'][0], found['struct'][1], found['union'][1]
+
+
 def get_all_composite_types(text, to_get='struct'):
     """Gets all struct or union definitions from text.
 
     Typedefed contains typedef keyword.
     """
-    types_list = []
-    type_re = r'(?:typedef\s+)?%s[\w\s:]*?\{(?:.*?\}[\w\s\*,]*?;){%d}'
-    x = 1
-    found = re.search(type_re % (to_get, x), text)
-    if found is None:
-        return text, types_list
-    one_type = re.escape(found.group(0))
-    while one_type:
-        while one_type.count('{') != one_type.count('}'):
-            x = x+1
-            found = re.search(type_re % (to_get, x), text)
-            if found is None:
-                return text, types_list
-            if x > 20:
-                one_type = re.escape(found.group(0))
-                break
-            one_type = re.escape(found.group(0))
-        text = re.sub(one_type, ';', text, count=1)
-        if '<' not in found.group(0) and '::' not in found.group(0):
-            types_list.append(found.group(0))
-        x = 1
-        found = re.search(type_re % (to_get, x), text)
-        if found is None:
-            return text, types_list
-        one_type = re.escape(found.group(0))
+    return find_composite_types(text, (to_get,))[to_get]
+
+
+COMPOSITE_TYPE_KEYWORD_RE = get_regex(r'struct|union')
+COMPOSITE_TYPE_HEADER_RE = get_regex(r'(?:struct|union)[\w\s:]*?\{')
+COMPOSITE_TYPE_END_RE = get_regex(r'[\w\s\*,]*;')
+BRACES_RE = get_regex(r'[{}]')
+
+
+def find_composite_types(text, kinds):
+    """Finds definitions of the given kinds ('struct', 'union') in text.
+
+    Each kind is searched independently, as if the text was scanned for it
+    alone: a definition starts with the keyword (optionally preceded by
+    typedef) and ends with the closing bracket of its body followed by the
+    declared names and ';'. Definitions nested in a definition of the same
+    kind are part of it. Searching for a kind stops at the first definition
+    whose end cannot be found. Definitions containing C++ templates or
+    scopes are skipped.
+
+    Returns dictionary mapping every kind to the text without definitions
+    of that kind and the list of found definitions.
+    """
+    braces = BraceIndex(text)
+    ends = {kind: 0 for kind in kinds}
+    found = {kind: [] for kind in kinds}
+    for keyword in COMPOSITE_TYPE_KEYWORD_RE.finditer(text):
+        kind = keyword.group(0)
+        if ends.get(kind, -1) < 0 or keyword.start() < ends[kind]:
+            continue
+        header = COMPOSITE_TYPE_HEADER_RE.match(text, keyword.start())
+        if header is None:
+            continue
+        end = braces.definition_end(header.end() - 1)
+        if end is None:
+            ends[kind] = -1
+            continue
+        start = start_with_typedef(text, keyword.start())
+        found[kind].append((start, end))
+        ends[kind] = end
+
+    result = {}
+    for kind, spans in found.items():
+        pieces = []
+        types_list = []
+        pos = 0
+        for start, end in spans:
+            pieces.append(text[pos:start])
+            pieces.append(';')
+            pos = end
+            one_type = text[start:end]
+            if '<' not in one_type and '::' not in one_type:
+                types_list.append(one_type)
+        pieces.append(text[pos:])
+        result[kind] = ''.join(pieces), types_list
+    return result
+
+
+def start_with_typedef(text, pos):
+    """Moves start of definition at pos before preceding typedef keyword."""
+    start = pos
+    while start > 0 and text[start - 1].isspace():
+        start -= 1
+    if start < pos and text.endswith('typedef', 0, start):
+        return start - len('typedef')
+    return pos
+
+
+class BraceIndex(object):
+    """Positions and nesting of all curly brackets in text."""
+
+    def __init__(self, text):
+        """Scans text and pairs opening and closing brackets."""
+        self.text = text
+        self.positions = []
+        self.depths = []
+        self.closing = {}
+        opened = []
+        depth = 0
+        for brace in BRACES_RE.finditer(text):
+            index = len(self.positions)
+            if brace.group(0) == '{':
+                opened.append(index)
+                depth += 1
+            else:
+                if opened:
+                    self.closing[opened.pop()] = index
+                depth -= 1
+            self.positions.append(brace.start())
+            self.depths.append(depth)
+        self.index_of = {pos: i for i, pos in enumerate(self.positions)}
+
+    def definition_end(self, opening_pos):
+        """Returns end of definition whose body starts at opening_pos.
+
+        Definition ends after the first closing bracket on the level of the
+        opening one that is followed by declared names and ';'.
+        """
+        index = self.index_of[opening_pos]
+        level = self.depths[index] - 1
+        closing = self.closing.get(index)
+        if closing is None:
+            return None
+        end = self.names_end(closing)
+        if end is not None:
+            return end
+        for i in range(closing + 1, len(self.positions)):
+            if self.depths[i] == level and self.text[self.positions[i]] == '}':
+                end = self.names_end(i)
+                if end is not None:
+                    return end
+        return None
+
+    def names_end(self, index):
+        """Returns end of names and ';' after closing bracket at index."""
+        names = COMPOSITE_TYPE_END_RE.match(self.text, self.positions[index] + 1)
+        return names.end() if names is not None else None
 
 
 def parse_struct(struct, hfile):
@@ -123,10 +225,9 @@ def parse_composite_type(type_str, hfile, parsed_type=Struct):
 
     Returns Struct or Union object.
     """
-    names_and_members = re.search(
-        r'^(?:typedef\s+)?(?:struct|union)([\w\s]*?)\{(.*)\}([\w\s\*,]*);',
-        type_str
-    )
+    names_and_members = get_regex(
+        r'^(?:typedef\s+)?(?:struct|union)([\w\s]*?)\{(.*)\}([\w\s\*,]*);'
+    ).search(type_str)
     if names_and_members is None:
         return parsed_type('', '', [], hfile)
     name = names_and_members.group(1).strip()
@@ -151,10 +252,10 @@ def edit_structured_param_type(one_param, members_list, hfile):
     Structs, unions and functions need additional parsing.
     """
     if '{' in one_param.type_text:
-        name = re.search(r'\}([\w\s\*,]+)$', one_param.type_text)
+        name = get_regex(r'\}([\w\s\*,]+)$').search(one_param.type_text)
         if name:
             one_param.name = name.group(1).strip()
-        type_text = re.sub(r'\}[\w\s*,]*$', '};', one_param.type_text)
+        type_text = get_regex(r'\}[\w\s*,]*$').sub('};', one_param.type_text)
         if one_param.type_text.startswith('struct'):
             s = parse_struct(type_text, hfile)
         elif one_param.type_text.startswith('union'):
@@ -167,8 +268,8 @@ def edit_structured_param_type(one_param, members_list, hfile):
         return
     # Members that looks like: 'int __SOCKADDR(su_);' are usually macros
     # It's invalid member, we try to determine correct member's type and name.
-    one_param.type = re.sub(
-        r'^([\w\s\*]*?)\s*\w+\((\w+)[\w\s,\*]*\)', r'\1 \2 ', one_param.type_text).strip()
+    one_param.type = get_regex(r'^([\w\s\*]*?)\s*\w+\((\w+)[\w\s,\*]*\)').sub(
+        r'\1 \2 ', one_param.type_text).strip()
     if one_param.type_text.endswith(')'):
         parse_function_type(one_param)
         return
@@ -193,14 +294,45 @@ def edit_structured_param_type(one_param, members_list, hfile):
 
 def parse_function_type(param):
     parsed_param = None
-    if re.search(r'^[\w\s*]+\([\w\s]*\*\s*\w+\s*\)', param.type_text):
+    if get_regex(r'^[\w\s*]+\([\w\s]*\*\s*\w+\s*\)').search(param.type_text):
         parsed_param = parse_one_param(param.type_text)
     param.name = parsed_param.name if parsed_param else ''
     param.type = parsed_param.type if parsed_param else ''
 
 
+# Characters split_members() looks at.
+MEMBERS_DELIMITERS_RE = get_regex(r'[{};]')
+
+
 def split_members(s):
-    """Struct members are separated by semicolon. Returns list of members."""
+    """Struct members are separated by semicolon. Returns list of members.
+
+    Semicolons in braces do not separate members, text after the last
+    separating semicolon is not a member. Only semicolons and braces are
+    visited, members are sliced from s.
+    """
+    if '{' not in s and '}' not in s:
+        return [m.strip() for m in s.split(';')[:-1]]
+    parts = []
+    bracket_level = 0
+    start = 0
+    for m in MEMBERS_DELIMITERS_RE.finditer(s):
+        c = m.group()
+        if c == ';':
+            if bracket_level == 0:
+                parts.append(s[start:m.start()].strip())
+                start = m.end()
+        elif c == '{':
+            bracket_level += 1
+        else:
+            bracket_level -= 1
+    return parts
+
+
+def split_members_by_chars(s):
+    """Reference implementation of split_members() going through all
+    characters of s.
+    """
     parts = []
     bracket_level = 0
     current = []
@@ -0,0 +1,156 @@
+"""Registry of compiled regular expressions.
+
+Every static pattern is compiled once, the first time it is asked for, and
+stays in the registry. Patterns formatted from names in headers are not
+registered, the re module's bounded cache compiles them. Calls of patterns
+can be counted and timed to find the most expensive ones, formatted patterns
+are counted together under their template.
+"""
+
+import re
+import time
+
+# Methods of compiled patterns that are counted and timed when profiling.
+PROFILED_METHODS = ('search', 'match', 'fullmatch', 'findall', 'finditer', 'sub', 'subn', 'split')
+
+
+class RegexStats(object):
+    """Number of calls of a pattern or a template and their time."""
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+
+    def get_profiled_method(self, method, is_iterator):
+        """Returns method counting its calls and time in self.
+
+        Iterators are consumed at once, so the time of finding all matches
+        is counted.
+        """
+        def profiled_method(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                return iter(list(result)) if is_iterator else result
+            finally:
+                self.calls += 1
+                self.time += time.perf_counter() - start
+        return profiled_method
+
+
+class RegisteredRegex(RegexStats):
+    """Compiled pattern with methods of re.Pattern.
+
+    Without profiling, the methods are those of the compiled pattern, so
+    there is no overhead. With profiling, they count calls and their time.
+    """
+
+    def __init__(self, pattern, flags=0):
+        super().__init__()
+        self.compiled = re.compile(pattern, flags)
+        self.pattern = pattern
+        self.flags = flags
+        self.set_profiling(profiling)
+
+    def set_profiling(self, enabled):
+        for name in PROFILED_METHODS:
+            method = getattr(self.compiled, name)
+            if enabled:
+                method = self.get_profiled_method(method, name == 'finditer')
+            setattr(self, name, method)
+
+
+class ProfiledPattern(object):
+    """Compiled pattern whose calls are counted in stats of its template."""
+
+    def __init__(self, compiled, stats):
+        self.compiled = compiled
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return self.stats.get_profiled_method(
+            getattr(self.compiled, name), name == 'finditer')
+
+
+REGEXES = {}
+# Stats of templates of formatted patterns, only filled when profiling.
+TEMPLATES_STATS = {}
+profiling = False
+
+
+def get_regex(pattern, flags=0):
+    """Returns compiled static pattern from the registry, it is compiled when
+    it is not there. Use get_formatted_regex() for patterns with names.
+    """
+    regex = REGEXES.get((pattern, flags))
+    if regex is None:
+        regex = REGEXES[pattern, flags] = RegisteredRegex(pattern, flags)
+    return regex
+
+
+def get_formatted_regex(template, *args, flags=0):
+    """Returns compiled pattern template.format(*args).
+
+    The pattern is not registered. When profiling, its calls are counted
+    under the template.
+    """
+    compiled = re.compile(template.format(*args), flags)
+    if not profiling:
+        return compiled
+    stats = TEMPLATES_STATS.get((template, flags))
+    if stats is None:
+        stats = TEMPLATES_STATS[template, flags] = RegexStats()
+    return ProfiledPattern(compiled, stats)
+
+
+def set_regex_profiling(enabled):
+    """Enables or disables counting and timing of calls of all patterns."""
+    global profiling
+    profiling = enabled
+    for regex in REGEXES.values():
+        regex.set_profiling(enabled)
+
+
+def reset_regex_profile():
+    for regex in REGEXES.values():
+        regex.calls = 0
+        regex.time = 0.0
+    TEMPLATES_STATS.clear()
+
+
+def get_regex_profile():
+    """Returns {pattern or template: [calls, time]} of patterns called since
+    the last reset.
+    """
+    stats = [(regex.pattern, regex) for regex in REGEXES.values()]
+    stats.extend((template, s) for (template, _), s in TEMPLATES_STATS.items())
+    return merge_regex_profiles(
+        {pattern: [s.calls, s.time]} for pattern, s in stats if s.calls)
+
+
+def merge_regex_profiles(profiles):
+    """Sums calls and times of patterns in profiles, e.g. from more processes."""
+    merged = {}
+    for profile in profiles:
+        for pattern, (calls, total_time) in profile.items():
+            stats = merged.setdefault(pattern, [0, 0.0])
+            stats[0] += calls
+            stats[1] += total_time
+    return merged
+
+
+def format_regex_profile(profile, top=20, width=60):
+    """Returns report of top patterns with the longest time of calls.
+
+    White space in patterns is collapsed and patterns longer than width are
+    shortened, so verbose patterns take one line.
+    """
+    lines = ['{:>10} {:>10} {:>10}  {}'.format('calls', 'time [s]', 'per call', 'pattern')]
+    ordered = sorted(profile.items(), key=lambda item: (-item[1][1], item[0]))
+    for pattern, (calls, total_time) in ordered[:top]:
+        pattern = ' '.join(pattern.split())
+        if len(pattern) > width:
+            pattern = pattern[:width - 3] + '...'
+        lines.append('{:>10} {:>10.3f} {:>8.1f}us  {}'.format(
+            calls, total_time, total_time / calls * 1e6, pattern))
+    return '\n'.join(lines)
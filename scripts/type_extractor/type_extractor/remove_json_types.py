@@ -7,66 +7,84 @@ from .json_types import TYPES
 def remove_unused_json_types(functions, old_types):
     """Removes types that are not used by any function."""
     new_types = {}
-    for _, func in functions.items():
-        add_type_to_new_types(func['ret_type'], old_types, new_types)
-        add_params_to_new_types(func['params'], old_types, new_types)
+    add_types_to_new_types(
+        (k for func in functions.values() for k in get_func_referenced_types(func)),
+        old_types.__getitem__, new_types
+    )
     return new_types
 
 
-def add_params_to_new_types(params, old_types, new_types):
-    for p in params:
-        add_type_to_new_types(p['type'], old_types, new_types)
+def select_functions(functions, names):
+    """Returns functions with the given names."""
+    return {name: functions[name] for name in names if name in functions}
 
 
-def add_type_to_new_types(type_key, old_types, new_types):
-    if type_key in new_types:
-        return
+def add_types_to_new_types(type_keys, get_type, new_types):
+    """Adds types with the given keys and all types they point to to new_types.
 
-    type = old_types[type_key]
-    new_types[type_key] = type
-    type_of_type = type['type']
-    if type_of_type == TYPES.ARRAY.value:
-        add_array_to_new_types(type, old_types, new_types)
-    elif type_of_type == TYPES.FUNCTION.value:
-        add_function_type_to_new_types(type, old_types, new_types)
-    elif type_of_type == TYPES.POINTER.value:
-        add_pointer_to_new_types(type, old_types, new_types)
-    elif type_of_type == TYPES.QUALIFIER.value:
-        add_qualifier_to_new_types(type, old_types, new_types)
-    elif (type_of_type == TYPES.STRUCT.value or
-            type_of_type == TYPES.UNION.value):
-        add_composite_type_members_to_new_types(type, old_types, new_types)
-    elif type_of_type == TYPES.TYPEDEF.value:
-        add_typedef_to_new_types(type, old_types, new_types)
-    # integral_type, floating_point_type, enum, void are terminal,
-    # they do not point to other type
+    get_type returns type for its key. Types already in new_types are not
+    followed again. Types are visited from a worklist, so long chains of types
+    do not hit the recursion limit.
+    """
+    getters = REFERENCED_TYPES_GETTERS
+    to_visit = list(type_keys)
+    while to_visit:
+        type_key = to_visit.pop()
+        if type_key in new_types:
+            continue
+        type = get_type(type_key)
+        new_types[type_key] = type
+        getter = getters.get(type['type'])
+        if getter is not None:
+            to_visit += getter(type)
 
 
-def add_array_to_new_types(type, old_types, new_types):
-    add_type_to_new_types(type['element_type'], old_types, new_types)
+def get_func_referenced_types(func):
+    """Returns keys of types used by function (return and parameter types)."""
+    return [func['ret_type']] + [p['type'] for p in func['params']]
 
 
-def add_function_type_to_new_types(type, old_types, new_types):
-    add_type_to_new_types(type['ret_type'], old_types, new_types)
-    add_params_to_new_types(type['params'], old_types, new_types)
+def get_array_referenced_types(type):
+    return [type['element_type']]
 
 
-def add_pointer_to_new_types(type, old_types, new_types):
-    add_type_to_new_types(type['pointed_type'], old_types, new_types)
+def get_pointer_referenced_types(type):
+    return [type['pointed_type']]
 
 
-def add_qualifier_to_new_types(type, old_types, new_types):
-    add_type_to_new_types(type['modified_type'], old_types, new_types)
+def get_qualifier_referenced_types(type):
+    return [type['modified_type']]
 
 
-def add_composite_type_members_to_new_types(type, old_types, new_types):
-    for m in type['members']:
-        add_type_to_new_types(m['type'], old_types, new_types)
+def get_composite_type_referenced_types(type):
+    return [m['type'] for m in type['members']]
 
 
-def add_typedef_to_new_types(type, old_types, new_types):
+def get_typedef_referenced_types(type):
     if type['typedefed_type'] != 'unknown':
-        add_type_to_new_types(type['typedefed_type'], old_types, new_types)
+        return [type['typedefed_type']]
+    return []
+
+
+# Outgoing edges of types by their kind. integral_type, floating_point_type,
+# enum, void are terminal, they do not point to other type.
+REFERENCED_TYPES_GETTERS = {
+    TYPES.ARRAY.value: get_array_referenced_types,
+    TYPES.FUNCTION.value: get_func_referenced_types,
+    TYPES.POINTER.value: get_pointer_referenced_types,
+    TYPES.QUALIFIER.value: get_qualifier_referenced_types,
+    TYPES.STRUCT.value: get_composite_type_referenced_types,
+    TYPES.UNION.value: get_composite_type_referenced_types,
+    TYPES.TYPEDEF.value: get_typedef_referenced_types,
+}
+
+
+def get_referenced_types(type):
+    """Returns keys of types the type points to, as followed when removing
+    unused types.
+    """
+    getter = REFERENCED_TYPES_GETTERS.get(type['type'])
+    return getter(type) if getter is not None else []
 
 
 def remove_qualifier_json_types(content):
@@ -0,0 +1,91 @@
+"""Scheduling of header files to worker processes.
+
+Files are sent to workers from the most costly one, so that large headers do
+not start last and run alone. Cost of a file is its parsing time from a
+previous run or an estimate based on its size.
+"""
+
+import os
+
+# Every job should get at least this many chunks of work, so that jobs
+# finishing early can take over the rest of the work.
+CHUNKS_PER_JOB = 4
+
+
+def get_jobs_count(jobs=None):
+    """Returns count of worker processes, all CPUs when jobs is not given."""
+    return jobs if jobs else (os.cpu_count() or 1)
+
+
+def get_file_sizes(files):
+    """Returns sizes of files in bytes, 0 for files that cannot be accessed."""
+    sizes = []
+    for f in files:
+        try:
+            sizes.append(os.path.getsize(f))
+        except OSError:
+            sizes.append(0)
+    return sizes
+
+
+def estimate_costs(files, sizes, timings=None):
+    """Returns estimated parsing times of files.
+
+    Time from a previous run is used when known. Other files' times are
+    estimated from their sizes with the average speed of files with known
+    times. Without any known times, sizes themselves are the costs.
+    """
+    timings = timings if timings is not None else {}
+    known_time = 0.0
+    known_size = 0
+    for f, size in zip(files, sizes):
+        if f in timings:
+            known_time += timings[f]
+            known_size += size
+    time_per_byte = known_time / known_size if known_time and known_size else 1
+    return [timings[f] if f in timings else size * time_per_byte
+            for f, size in zip(files, sizes)]
+
+
+def get_chunks(items, costs, jobs, chunksize=None):
+    """Orders items from the most costly one and splits them into chunks.
+
+    With chunksize, all chunks have that many items. Otherwise consecutive
+    items are put together until their cost reaches 1/CHUNKS_PER_JOB of one
+    job's share of work, so costly items are sent alone and small ones in
+    bigger chunks.
+    """
+    ordered = sorted(range(len(items)), key=lambda i: costs[i], reverse=True)
+    if chunksize is not None:
+        return [
+            [items[i] for i in ordered[start:start + chunksize]]
+            for start in range(0, len(ordered), chunksize)
+        ]
+
+    chunk_cost = sum(costs) / (jobs * CHUNKS_PER_JOB)
+    chunks = []
+    chunk = []
+    cost = 0
+    for i in ordered:
+        chunk.append(items[i])
+        cost += costs[i]
+        if cost >= chunk_cost:
+            chunks.append(chunk)
+            chunk = []
+            cost = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def format_timings_summary(timings, wall_time, jobs, count=10):
+    """Returns summary of parsing times with the slowest files."""
+    lines = [
+        'Parsed {} files in {:.2f} s with {} jobs (sum of file times {:.2f} s).'.format(
+            len(timings), wall_time, jobs, sum(timings.values()))
+    ]
+    slowest = sorted(timings.items(), key=lambda t: t[1], reverse=True)[:count]
+    if slowest:
+        lines.append('Slowest files:')
+        lines.extend('{:10.3f} s  {}'.format(t, f) for f, t in slowest)
+    return '\n'.join(lines)
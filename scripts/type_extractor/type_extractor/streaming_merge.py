@@ -0,0 +1,133 @@
+"""Merges json files with memory bounded by the number of unique types.
+
+Only one input file is loaded at a time. In memory, there is an index of
+merged types with just the attributes choose_one_type decides by, keys of
+types they point to and offsets of the chosen types in a temporary spool
+file. The output is written entry by entry from the spool.
+"""
+
+import tempfile
+
+from .io import json_entry_to_str
+from .io import load_json_file
+from .io import print_json_sections
+from .json_types import TYPES
+from .merge_files import TypedefChainRoots
+from .merge_files import choose_one_type
+from .remove_json_types import get_func_referenced_types
+from .remove_json_types import get_referenced_types
+
+
+def get_type_stub(t_type):
+    """Returns the part of type that choose_one_type and typedef loops
+    detection look at.
+    """
+    stub = {'type': t_type['type']}
+    if t_type['type'] in (TYPES.STRUCT.value, TYPES.UNION.value):
+        # Only emptiness of members matters.
+        stub['members'] = [None] if t_type['members'] else []
+    elif t_type['type'] == TYPES.TYPEDEF.value:
+        stub['name'] = t_type['name']
+        stub['typedefed_type'] = t_type['typedefed_type']
+    return stub
+
+
+class Spool(object):
+    """Temporary file with serialized entries of the output."""
+
+    def __init__(self, indent):
+        self.file = tempfile.TemporaryFile()
+        self.indent = indent
+
+    def write(self, key, value):
+        """Serializes entry, returns its offset and length in the spool."""
+        entry = json_entry_to_str(key, value, self.indent, 2).encode('utf-8')
+        self.file.seek(0, 2)
+        offset = self.file.tell()
+        self.file.write(entry)
+        return offset, len(entry)
+
+    def read(self, position):
+        """Returns serialized entry from the given offset and length."""
+        offset, length = position
+        self.file.seek(offset)
+        return self.file.read(length).decode('utf-8')
+
+    def close(self):
+        self.file.close()
+
+
+class StreamingMerger(object):
+    """Merges json files one by one with the same results as merge_types
+    and merge_functions.
+    """
+
+    def __init__(self, indent=4):
+        self.spool = Spool(indent)
+        self.indent = indent
+        self.types = {}
+        self.chain_roots = TypedefChainRoots(self.types)
+        self.type_refs = {}
+        self.type_positions = {}
+        self.func_refs = {}
+        self.func_positions = {}
+
+    def merge_json_file(self, json_file):
+        content = load_json_file(json_file)
+        self.merge_types(content['types'])
+        self.merge_functions(content['functions'])
+
+    def merge_types(self, new):
+        for type_hash, t_type in new.items():
+            if type_hash in self.types:
+                existing = self.types[type_hash]
+                if choose_one_type(existing, t_type, self.types, self.chain_roots) is existing:
+                    continue
+            self.types[type_hash] = get_type_stub(t_type)
+            self.type_refs[type_hash] = tuple(get_referenced_types(t_type))
+            self.type_positions[type_hash] = self.spool.write(type_hash, t_type)
+
+    def merge_functions(self, new):
+        for func_name, func in new.items():
+            if func_name not in self.func_positions:
+                self.func_refs[func_name] = tuple(get_func_referenced_types(func))
+                self.func_positions[func_name] = self.spool.write(func_name, func)
+
+    def get_used_types(self, func_names):
+        """Returns keys of types used by functions, as remove_unused_json_types
+        would keep.
+        """
+        used = set()
+        to_visit = [t for name in func_names for t in self.func_refs[name]]
+        while to_visit:
+            type_key = to_visit.pop()
+            if type_key in used:
+                continue
+            used.add(type_key)
+            # Missing type is an error, as in remove_unused_json_types.
+            to_visit.extend(self.type_refs[type_key])
+        return used
+
+    def print_json_file(self, f_out, keep_unused_types=False, roots=None):
+        """Writes merged functions and types to f_out.
+
+        When names of root functions are given, only these functions are
+        written.
+        """
+        func_names = self.func_positions.keys()
+        if roots is not None:
+            func_names = {name for name in roots if name in self.func_positions}
+        type_keys = self.type_positions.keys()
+        if not keep_unused_types:
+            type_keys = self.get_used_types(func_names)
+        print_json_sections(f_out, [
+            ('functions', self.spooled_entries(func_names, self.func_positions)),
+            ('types', self.spooled_entries(type_keys, self.type_positions)),
+        ], self.indent)
+
+    def spooled_entries(self, keys, positions):
+        for key in sorted(keys):
+            yield self.spool.read(positions[key])
+
+    def close(self):
+        self.spool.close()
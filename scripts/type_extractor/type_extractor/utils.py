@@ -1,7 +1,9 @@
 """Utilities."""
 
+import fnmatch
 import logging
 import os
+import re
 
 
 def get_files_with_suffix_from_all_paths(paths, suffix=''):
@@ -13,19 +15,64 @@ def get_files_with_suffix_from_all_paths(paths, suffix=''):
             yield f
 
 
-def get_files_with_suffix_from_path(path, suffix=''):
+def get_files_with_suffix_from_path(path, suffix='', files_filter=None):
     """Returns path if it's file. Otherwise recursively walks path and returns all
     files with given suffix.
+
+    When files_filter is given, only files it accepts are returned and
+    directories it excludes are not walked.
     """
     if os.path.isfile(path) and path.endswith(suffix):
         yield path
     else:
-        for dir_path, _, file_list in os.walk(path):
+        for dir_path, dir_list, file_list in os.walk(path):
+            rel_dir = os.path.relpath(dir_path, path).replace(os.path.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir + '/'
+            if files_filter is not None:
+                dir_list[:] = [
+                    d for d in dir_list if files_filter.accepts_dir(rel_dir + d)
+                ]
             for fname in sorted(file_list):
-                if fname.endswith(suffix):
+                if not fname.endswith(suffix):
+                    continue
+                if files_filter is None or files_filter.accepts_file(rel_dir + fname):
                     yield os.path.join(dir_path, fname)
 
 
+class FilesFilter(object):
+    """Filter of files found by walking a directory.
+
+    Paths relative to the walked directory use '/' as separator. Regexes may
+    match anywhere in the path, globs (fnmatch, '*' matches '/' too) have to
+    match the whole path. Directories are matched with a trailing '/'.
+    File is accepted when it matches no exclude pattern and at least one
+    include pattern, if there are any. Excluded directories are not walked.
+    """
+
+    def __init__(self, exclude=(), include=(), exclude_globs=(), include_globs=()):
+        self.exclude = [re.compile(pattern) for pattern in exclude]
+        self.include = [re.compile(pattern) for pattern in include]
+        self.exclude_globs = list(exclude_globs)
+        self.include_globs = list(include_globs)
+
+    def matches(self, rel_path, regexes, globs):
+        """Checks if path matches any of regexes or globs."""
+        return (any(regex.search(rel_path) for regex in regexes) or
+                any(fnmatch.fnmatchcase(rel_path, glob) for glob in globs))
+
+    def accepts_dir(self, rel_dir):
+        """Checks if directory should be walked."""
+        return not self.matches(rel_dir + '/', self.exclude, self.exclude_globs)
+
+    def accepts_file(self, rel_path):
+        """Checks if file should be returned."""
+        if self.matches(rel_path, self.exclude, self.exclude_globs):
+            return False
+        if not self.include and not self.include_globs:
+            return True
+        return self.matches(rel_path, self.include, self.include_globs)
+
+
 def setup_logging(enable):
     """Sets up the logging facilities."""
     if enable: